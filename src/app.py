@@ -1,48 +1,146 @@
+# Imported first so the startup timer covers every import after it
+from main.startup import startup, init_subsystems, FIRST_FRAME
+import time
 import pygame
 from main.main_collector import Main
-from main.controller.keyboard_controls import KeyboardController
+from main.controller.input_system import InputSystem
 from main.mainMenu.main_menu import MenuSystem
-from main.constants import MENU, LEVEL_SELECT, PLAYING, FPS
+from main.profiler import profiler
+from main.constants import MENU, LEVEL_SELECT, PLAYING, LOADING, FPS, ENDLESS_LEVEL
 
-pygame.init()
+startup.mark("imports")
 
 
 class App:
     def __init__(self):
+        init_subsystems()
+        startup.mark("subsystems")
         self.running = True
-        self.controller = KeyboardController()
-        self.main = Main()
+        # One input system, fed from the event queue, for the player and the objects
+        self.input = InputSystem()
+        self.main = Main(self.input)
+        startup.mark("game state")
+        # Levels are attached once the first frame is up; the title screen does not list them
         self.menu_system = MenuSystem(self.main.display)
         self.state = MENU
+        self.loading = None
         self.clock = pygame.time.Clock()
     
+    def start(self):
+        """Draw the first menu frame, then read the level index behind it"""
+        self.handle_events()
+        startup.mark(FIRST_FRAME)
+        self.menu_system.levels = self.main.levels
+        startup.mark("level index")
+    
     def run(self):
+        self.start()
         while self.running:
             self.handle_events()
             self.clock.tick(FPS)
+        self.main.preloader.shutdown()
     
     def handle_events(self):
-        for event in pygame.event.get():
+        profiler.begin_frame()
+        if self.state in (MENU, LEVEL_SELECT) and self.menu_system.is_idle():
+            # Nothing on screen can change until input arrives, so sleep instead of spinning
+            events = [pygame.event.wait()] + pygame.event.get()
+            profiler.skip()
+        else:
+            events = pygame.event.get()
+        
+        for event in events:
+            self.input.handle_event(event)
             if event.type == pygame.QUIT:
                 self.running = False
             
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4):
+                self.handle_profiler_key(event.key)
+            
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and self.state == PLAYING:
+                self.save_replay()
+            
             if self.state in (MENU, LEVEL_SELECT):
                 selected_level = self.menu_system.handle_event(event)
-                if selected_level is not None:
-                    self.main.load_level(selected_level)
+                if selected_level == ENDLESS_LEVEL:
+                    self.input.clear()
+                    self.main.load_endless()
                     self.state = PLAYING
+                elif selected_level is not None:
+                    self.start_level(selected_level)
+                elif self.menu_system.state == LEVEL_SELECT and self.menu_system.levels:
+                    # Build the highlighted level while the player is still choosing
+                    self.main.preload(self.menu_system.selected_level)
             
             elif self.state == PLAYING:
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     self.state = MENU
                     self.menu_system.state = MENU
+                    self.menu_system.invalidate()
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_practice_key(event.key)
         
-        self.controller.update()
+        profiler.mark("events")
         
         if self.state in (MENU, LEVEL_SELECT):
             self.menu_system.update()
+            profiler.mark("menu")
+        elif self.state == LOADING:
+            if self.loading.ready:
+                self.finish_loading()
+            else:
+                self.menu_system.draw_loading(self.loading.entry.name, self.loading.fraction)
         elif self.state == PLAYING:
             self.main.update()
+        
+        profiler.end_frame()
+    
+    def start_level(self, level):
+        """Play level now if it was preloaded, otherwise show progress until it is built"""
+        self.loading = self.main.start_level(level)
+        if self.loading.ready:
+            self.finish_loading()
+        else:
+            self.state = LOADING
+    
+    def finish_loading(self):
+        # Presses made on the menu are not jumps
+        self.input.clear()
+        self.main.finish_level(self.loading)
+        self.loading = None
+        self.state = PLAYING
+    
+    def handle_profiler_key(self, key):
+        """F3 toggles the frame profiler overlay, F4 writes its trace to the working directory"""
+        if key == pygame.K_F3:
+            profiler.toggle()
+        elif key == pygame.K_F4 and profiler.trace:
+            stem = time.strftime("profile_%Y%m%d_%H%M%S")
+            for path in (stem + ".csv", stem + ".json"):
+                frames = profiler.dump(path)
+            print(f"Wrote {frames} frames to {stem}.csv and {stem}.json")
+    
+    def save_replay(self):
+        """F5 writes the current run's input recording to the working directory"""
+        path = time.strftime("replay_%Y%m%d_%H%M%S.json")
+        recording = self.main.save_recording(path)
+        if recording is None:
+            print("Nothing recorded (practice mode and endless runs are not recorded)")
+        else:
+            print(f"Wrote {recording.ticks} ticks to {path}")
+    
+    def handle_practice_key(self, key):
+        game_state = self.main.game_state
+        if key == pygame.K_p:
+            game_state.practice_mode = not game_state.practice_mode
+            game_state.checkpoints.clear()
+            self.main.stop_recording()
+        elif key == pygame.K_z and game_state.practice_mode:
+            game_state.save_checkpoint()
+        elif key == pygame.K_x and game_state.practice_mode:
+            game_state.remove_checkpoint()
+        elif key == pygame.K_g:
+            game_state.ghosts.toggle()
 
 
 if __name__ == "__main__":
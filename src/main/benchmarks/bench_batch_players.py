@@ -0,0 +1,96 @@
+"""
+Batch Players Benchmark
+Agent-ticks per second for N players stepped one by one versus as one batch.
+
+    scalar   one HeadlessSimulation per agent, stepped in turn
+    batched  BatchPlayers stepping every agent in one vectorized pass
+
+Agents run a level of pads, orbs, speed and gravity portals under random
+jump input. After each scalar run the batch is replayed with the same input
+and every agent's final state is compared, so the speedup is only reported
+for identical results.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_batch_players
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+from main.simulation.headless import HeadlessSimulation
+from main.simulation.batch_players import BatchPlayers
+
+AGENT_COUNTS = [1, 10, 100, 500]
+TICKS = 600
+JUMP_CHANCE = 0.05
+
+
+def make_level(columns=2000):
+    """Runway with pads, orbs and portals; a wide portal overhead flips rising players back"""
+    level = [{"object": "Block", "x": 0, "y": 10, "width": columns, "height": 1}]
+    for i in range(12, columns - 12, 10):
+        level.append({"object": "JumpPad", "x": i, "y": 9})
+        level.append({"object": "JumpOrb", "x": i + 3, "y": 6})
+        level.append({"object": "SpeedPortal", "x": i + 5, "y": 8, "height": 2,
+                      "speed_multiplier": 1.0 + (i // 10) % 2})
+        level.append({"object": "GravityPortal", "x": i + 7, "y": 8, "height": 2})
+        level.append({"object": "GravityPortal", "x": i + 7, "y": 1, "width": 10})
+        level.append({"object": "Spike", "x": i + 9, "y": -6})
+    return level
+
+
+def run_scalar(level, inputs):
+    sims = [HeadlessSimulation(level) for _ in range(inputs.shape[1])]
+    for sim in sims:
+        sim.reset()
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        for agent, sim in enumerate(sims):
+            if not sim.player.is_dead:
+                sim.step(bool(inputs[tick, agent]))
+    elapsed = time.perf_counter() - start
+    return elapsed, [sim.player.save_state() for sim in sims]
+
+
+def run_batched(level, inputs):
+    template = HeadlessSimulation(level)
+    batch = BatchPlayers(level, template.game_state.floor, template.player, inputs.shape[1])
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        batch.step(inputs[tick])
+    elapsed = time.perf_counter() - start
+    return elapsed, [batch.save_state(agent) for agent in range(batch.count)], batch
+
+
+def main():
+    pygame.init()
+    level = make_level()
+    rng = np.random.default_rng(0)
+
+    print("=" * 72)
+    print("Batch Players Benchmark (%d objects, %d ticks)" % (len(level), TICKS))
+    print("=" * 72)
+    print(f"{'agents':>7} {'scalar k/s':>12} {'batched k/s':>12} {'speedup':>9} {'alive':>7} {'identical':>10}")
+
+    identical = True
+    for count in AGENT_COUNTS:
+        inputs = rng.random((TICKS, count)) < JUMP_CHANCE
+        scalar_time, scalar_states = run_scalar(level, inputs)
+        batch_time, batch_states, batch = run_batched(level, inputs)
+        same = scalar_states == batch_states
+        identical &= same
+        agent_ticks = count * TICKS / 1000
+        print(f"{count:>7} {agent_ticks / scalar_time:>12.1f} {agent_ticks / batch_time:>12.1f} "
+              f"{scalar_time / batch_time:>8.1f}x {int(np.count_nonzero(batch.alive)):>7} {str(same):>10}")
+
+    pygame.quit()
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Collision Batch Benchmark
+Compares per-frame collision cost and allocations on a 5k-object level.
+
+    legacy      the original per-object tests, building player Rects per call
+    per-object  GameObject.on_player_collision called for every object
+    batched     CollisionDetection.check_objects, one inline sweep per object
+
+Each is timed against the spatial index candidates (what the game checks)
+and against every object in the level (the cost of the loop itself). Rects
+are counted by swapping in a counting Rect; transient memory is the
+tracemalloc peak during the check.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_collision_batch
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.simulation.headless import HeadlessSimulation
+from main.objects.game_object import SolidObject, HazardObject, TriggerObject, PortalObject
+
+OBJECTS = 5000
+FRAMES = 300
+REPEATS = 3
+
+
+class CountingRect(pygame.Rect):
+    created = 0
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        CountingRect.created += 1
+
+
+def legacy_check(player, obj, Rect=pygame.Rect):
+    """The collision tests as they were before swept collision"""
+    world_rect = Rect(player.display_x, player.y, player.width, player.height)
+    if isinstance(obj, SolidObject):
+        prev_world_rect = Rect(player.prev_display_x, player.prev_y, player.width, player.height)
+        if world_rect.colliderect(obj.rect):
+            if prev_world_rect.bottom <= obj.rect.top + 5:
+                player.y = obj.rect.top - player.height
+                player.y_vel = 0
+                player.on_ground = True
+                return False
+            return True
+        return False
+    if isinstance(obj, HazardObject):
+        return world_rect.colliderect(obj.rect)
+    if isinstance(obj, (TriggerObject, PortalObject)):
+        world_rect.colliderect(obj.rect)
+    return False
+
+
+def legacy_frame(player, objects, Rect=pygame.Rect):
+    for obj in objects:
+        if legacy_check(player, obj, Rect):
+            return True
+    return False
+
+
+def per_object_frame(player, objects, Rect=None):
+    for obj in objects:
+        if obj.on_player_collision(player):
+            return True
+    return False
+
+
+def batched_frame(player, objects, Rect=None):
+    return player.collision.check_objects(objects)
+
+
+def make_level(count):
+    """Runway of abutting blocks with spikes, pads and portals overhead"""
+    level = []
+    for i in range(count // 2):
+        level.append({"object": "Block", "x": i, "y": 10, "width": 1, "height": 1})
+        kind = ("Spike", "JumpPad", "SpeedPortal")[i % 3]
+        obj = {"object": kind, "x": i, "y": 2, "width": 1, "height": 1}
+        if kind == "SpeedPortal":
+            obj["speed_multiplier"] = 1.0
+        level.append(obj)
+    return level
+
+
+def frames(sim, scan_all):
+    """Yield the objects to check on each of FRAMES ticks, restoring the player after each check"""
+    sim.reset()
+    game_state = sim.game_state
+    player = sim.player
+    for _ in range(FRAMES):
+        sim.step(False)
+        state = player.save_state()
+        yield game_state.objects if scan_all else game_state.spatial_index.near_player(player)
+        player.restore_state(state)
+
+
+def measure(sim, frame_fn, scan_all):
+    """(best us per frame, Rects per frame, transient KB peak) over FRAMES ticks"""
+    player = sim.player
+    best = None
+    for _ in range(REPEATS):
+        elapsed = 0.0
+        for objects in frames(sim, scan_all):
+            start = time.perf_counter()
+            frame_fn(player, objects)
+            elapsed += time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Allocations are measured on a second pass; tracemalloc slows everything down
+    CountingRect.created = 0
+    peak = 0
+    tracemalloc.start()
+    for objects in frames(sim, scan_all):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        frame_fn(player, objects, CountingRect)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return best / FRAMES * 1e6, CountingRect.created / FRAMES, peak / 1024
+
+
+def main():
+    pygame.init()
+    sim = HeadlessSimulation(make_level(OBJECTS))
+
+    print("=" * 68)
+    print("Collision Batch Benchmark (%d objects, %d frames)" % (len(sim.game_state.objects), FRAMES))
+    print("=" * 68)
+    print(f"{'objects checked':<18} {'path':<12} {'us/frame':>10} {'Rects/frame':>12} {'peak KB':>9}")
+    for scan_all, label in ((False, "index candidates"), (True, "all objects")):
+        for name, frame_fn in (("legacy", legacy_frame), ("per-object", per_object_frame),
+                               ("batched", batched_frame)):
+            cost, rects, peak = measure(sim, frame_fn, scan_all)
+            print(f"{label:<18} {name:<12} {cost:>10.1f} {rects:>12.1f} {peak:>9.1f}")
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
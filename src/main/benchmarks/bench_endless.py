@@ -0,0 +1,81 @@
+"""
+Endless Level Benchmark
+Per-frame streaming cost and live memory of endless mode as distance grows.
+
+The camera is scrolled at player speed from a series of start distances;
+each frame advances the chunk window, queries collision candidates and
+draws through the render cache, as GameState does. A finite level covering
+the same distance is built once for comparison.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_endless
+"""
+
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.game_state import GameState
+from main.level_generator import ChunkGenerator, CHUNK_COLUMNS
+from main.objects.object_factory import ObjectFactory
+from main.screenDir.screen_file import Display
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, GRID_SIZE, PLAYER_SPEED
+
+SEED = 7
+DISTANCES = [0, 10 ** 5, 10 ** 6, 10 ** 7]
+FRAMES = 600
+
+
+def scroll(game_state, start):
+    """Scroll FRAMES frames from start; returns us per frame"""
+    endless = game_state.endless
+    player = game_state.player
+    endless.reset()
+    game_state.render_cache.invalidate()
+    elapsed = 0.0
+    for frame in range(FRAMES):
+        player.display_x = start + frame * PLAYER_SPEED
+        begin = time.perf_counter()
+        game_state.camera_x = player.display_x - player.x
+        endless.advance(game_state.camera_x)
+        endless.near_player(player)
+        game_state.render_cache.draw(game_state.display.surface, game_state.camera_x)
+        elapsed += time.perf_counter() - begin
+    return elapsed / FRAMES * 1e6
+
+
+def main():
+    pygame.init()
+    display = Display(SCREEN_WIDTH, SCREEN_HEIGHT, WHITE)
+    game_state = GameState(display)
+    game_state.effects = False
+    game_state.load_endless(SEED)
+
+    print("=" * 66)
+    print("Endless Level Benchmark (seed %d, %d frames per distance)" % (SEED, FRAMES))
+    print("=" * 66)
+    print(f"{'distance px':>12} {'us/frame':>10} {'chunks':>8} {'objects':>8} {'live KB':>10}")
+
+    tracemalloc.start()
+    for distance in DISTANCES:
+        per_frame = scroll(game_state, distance)
+        current, _ = tracemalloc.get_traced_memory()
+        print(f"{distance:>12} {per_frame:>10.1f} {len(game_state.endless.chunks):>8} "
+              f"{len(game_state.endless):>8} {current / 1024:>10.1f}")
+    tracemalloc.stop()
+
+    # What holding the whole distance in memory would cost instead
+    chunks = 10 ** 5 // (CHUNK_COLUMNS * GRID_SIZE) + 1
+    tracemalloc.start()
+    objects = [ObjectFactory.create(obj_data) for obj_data in ChunkGenerator(SEED).level(chunks)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\nFinite level covering {10 ** 5} px: {len(objects)} objects, {current / 1024:.1f} KB "
+          f"(grows linearly with distance)")
+
+
+if __name__ == "__main__":
+    main()
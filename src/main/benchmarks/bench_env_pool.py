@@ -0,0 +1,76 @@
+"""
+Environment Pool Benchmark
+Environment steps per second for the RL environment API.
+
+    GeoEnv    one environment on a HeadlessSimulation
+    EnvPool   N environments as BatchEnv passes, in process and across workers
+
+Agents take random actions on the demo level (episodes end and restart
+constantly, as in training). Worker counts default to the machine's cores.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_env_pool [--workers N]
+"""
+
+import os
+import sys
+import json
+import time
+
+import numpy as np
+from main.simulation.env import GeoEnv, EnvPool
+
+LEVEL_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "demo_level.json")
+POOL_SIZES = [64, 256, 1024, 4096]
+SECONDS = 2.0
+JUMP_CHANCE = 0.05
+
+
+def time_single(level):
+    env = GeoEnv(level)
+    env.reset()
+    rng = np.random.default_rng(0)
+    actions = rng.random(100000) < JUMP_CHANCE
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        for action in actions[:1000]:
+            _, _, terminated, truncated, _ = env.step(action)
+            if terminated or truncated:
+                env.reset()
+        steps += 1000
+    return steps / (time.perf_counter() - start)
+
+
+def time_pool(level, count, workers):
+    rng = np.random.default_rng(0)
+    actions = rng.random((64, count)) < JUMP_CHANCE
+    with EnvPool(level, count, workers) as pool:
+        pool.reset()
+        steps = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < SECONDS:
+            pool.step(actions[steps % len(actions)])
+            steps += 1
+        return steps * count / (time.perf_counter() - start)
+
+
+def main(argv):
+    workers = os.cpu_count() or 1
+    if "--workers" in argv:
+        workers = int(argv[argv.index("--workers") + 1])
+    with open(LEVEL_FILE) as f:
+        level = json.load(f)[0]
+
+    print("=" * 56)
+    print("Environment Pool Benchmark (env steps/sec, %d workers)" % workers)
+    print("=" * 56)
+    print(f"{'GeoEnv':<28} {time_single(level):>12,.0f}")
+    for count in POOL_SIZES:
+        print(f"{'EnvPool %d in process' % count:<28} {time_pool(level, count, 0):>12,.0f}")
+        print(f"{'EnvPool %d, %d workers' % (count, workers):<28} {time_pool(level, count, workers):>12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,80 @@
+"""
+Hot Reload Benchmark
+Cost of picking up a one-object edit to the playing level.
+
+    reparse      json.load of the edited level file (paid by every reload)
+    full reload  prepare_level + install_level, as restarting the level would
+    patch        GameState.patch_level: diff against the loaded level and
+                 rebuild only the edited object
+
+The edit moves one object in the middle of the level, and the render cache
+is warm, as it would be mid-run.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_hot_reload
+"""
+
+import os
+import json
+import time
+import copy
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.game_state import GameState
+from main.screenDir.screen_file import Display
+from main.benchmarks.bench_level_load import make_level
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE
+
+LEVEL_SIZES = [1000, 10000, 19000]
+REPEATS = 5
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    pygame.init()
+    display = Display(SCREEN_WIDTH, SCREEN_HEIGHT, WHITE)
+
+    print("=" * 64)
+    print(f"Hot Reload Benchmark (ms, best of {REPEATS}, one object moved)")
+    print("=" * 64)
+    print(f"{'objects':>8} {'reparse':>9} {'full reload':>12} {'patch':>8} {'speedup':>8}")
+
+    for count in LEVEL_SIZES:
+        level = make_level(count)
+        edits = []
+        for step in range(REPEATS + 1):
+            edited = copy.deepcopy(level)
+            edited[count // 2]["y"] += 1 + step % 2
+            edits.append(edited)
+        text = json.dumps([edits[0]])
+
+        game_state = GameState(display)
+        game_state.load_level_data(level)
+
+        reparse_ms = best_of(lambda: json.loads(text))
+        full_ms = best_of(lambda: game_state.install_level(game_state.prepare_level(edits[0])))
+
+        patch_times = []
+        for edited in edits[1:]:
+            game_state.render_cache.warm(game_state.camera_x, SCREEN_WIDTH)
+            start = time.perf_counter()
+            game_state.patch_level(edited)
+            patch_times.append(time.perf_counter() - start)
+        patch_ms = min(patch_times) * 1000
+        print(f"{count:>8} {reparse_ms:>9.2f} {full_ms:>12.2f} {patch_ms:>8.2f} {full_ms / patch_ms:>7.0f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Input Latency Benchmark
+Press-to-jump latency and dropped presses, polled key state against the event-driven input.
+
+A scripted player runs along the floor and presses jump once per landing,
+a little before or after it, holding for a short tap. Time runs in
+milliseconds and the game drains input every frame at FPS:
+
+    polled    the old input: the key state as sampled at each frame, no buffering
+    event     InputSystem: held, or pressed at any point since the last frame,
+              with JUMP_BUFFER_TICKS of jump buffering
+
+A press is dropped if no jump follows within DROP_AFTER_MS. Latency is from
+the press, or from the landing for a press made in the air, to the frame
+whose tick jumps: the delay the input added on top of the physics.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_input_latency
+"""
+
+import sys
+import random
+
+from main.simulation.headless import HeadlessSimulation
+from main.constants import FPS, JUMP_BUFFER_TICKS
+
+PRESSES = 2000
+FRAME_MS = 1000 / FPS
+DROP_AFTER_MS = 300
+# When the player presses relative to landing, and for how long (ms)
+PRESS_OFFSETS = (-120, 40)
+TAP_LENGTHS = {"short taps": (5, 30), "taps": (30, 100)}
+
+
+def play(event_driven, tap_lengths, seed=0):
+    """(latencies in ms of served presses, dropped presses)"""
+    rng = random.Random(seed)
+    sim = HeadlessSimulation([])
+    sim.player.buffer_ticks = JUMP_BUFFER_TICKS if event_driven else 0
+    sim.reset()
+
+    latencies = []
+    dropped = 0
+    press = release = None
+    next_press = 500.0
+    tick = 0
+    landed = 0.0
+    on_ground = True
+    while len(latencies) + dropped < PRESSES:
+        now = tick * FRAME_MS
+        previous = now - FRAME_MS
+        if press is None and next_press <= now:
+            press = next_press
+            release = press + rng.uniform(*tap_lengths)
+        held = press is not None and press <= now < release
+        tapped = press is not None and previous < press <= now
+        jump = held or (event_driven and tapped)
+
+        sim.step(jump)
+        tick += 1
+        if sim.player.on_ground and not on_ground:
+            landed = now
+        on_ground = sim.player.on_ground
+        if press is None:
+            continue
+        if sim.player.y_vel == sim.player.jump_strength:
+            latencies.append(now - max(press, landed))
+            # Aim the next press at the next landing
+            landing = now + airtime_ms(sim)
+        elif now - press > DROP_AFTER_MS:
+            # By now the player is back on the floor, so press again shortly
+            dropped += 1
+            landing = now
+        else:
+            continue
+        next_press = max(landing + rng.uniform(*PRESS_OFFSETS), release + FRAME_MS, now + 1)
+        press = None
+    return latencies, dropped
+
+
+def airtime_ms(sim):
+    """How long a jump from the floor stays in the air"""
+    player = sim.player
+    return 2 * -player.jump_strength / player.gravity * FRAME_MS
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def main():
+    print("=" * 66)
+    print(f"Input Latency Benchmark ({PRESSES} presses, {FPS} FPS, buffer {JUMP_BUFFER_TICKS} ticks)")
+    print("=" * 66)
+    print(f"{'presses':<12} {'input':<8} {'dropped':>9} {'mean ms':>9} {'p95 ms':>8} {'max ms':>8}")
+    for label, tap_lengths in TAP_LENGTHS.items():
+        for name, event_driven in (("polled", False), ("event", True)):
+            latencies, dropped = play(event_driven, tap_lengths)
+            mean = sum(latencies) / len(latencies) if latencies else 0.0
+            print(f"{label:<12} {name:<8} {dropped / PRESSES:>9.1%} {mean:>9.1f} "
+                  f"{percentile(latencies, 95):>8.1f} {max(latencies, default=0.0):>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Level Index Benchmark
+Level select startup cost with and without the cached level index manifest.
+
+    parse all   json.load every level file, as listing levels would without an index
+    cold index  LevelIndex.load with no manifest (parses and hashes everything once)
+    warm index  LevelIndex.load with an up-to-date manifest (stats each file only)
+
+Also times a full level select redraw as the level count grows, which stays
+flat because only the current page is drawn.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_level_index
+"""
+
+import os
+import json
+import time
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.level_index import LevelIndex, MANIFEST_NAME
+from main.mainMenu.main_menu import MenuSystem
+from main.screenDir.screen_file import Display
+from main.benchmarks.bench_level_load import make_level
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, LEVEL_SELECT
+
+FILE_COUNTS = [10, 50, 200]
+LEVELS_PER_FILE = 5
+OBJECTS_PER_LEVEL = 500
+REDRAWS = 50
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def parse_all(directory):
+    levels = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json") and not name.startswith("."):
+            with open(os.path.join(directory, name)) as f:
+                levels.extend(json.load(f))
+    return levels
+
+
+def redraw_ms(menu):
+    start = time.perf_counter()
+    for _ in range(REDRAWS):
+        menu.invalidate()
+        menu.update()
+    return (time.perf_counter() - start) * 1000 / REDRAWS
+
+
+def main():
+    pygame.init()
+    display = Display(SCREEN_WIDTH, SCREEN_HEIGHT, WHITE)
+    levels = [make_level(OBJECTS_PER_LEVEL) for _ in range(LEVELS_PER_FILE)]
+
+    print("=" * 72)
+    print(f"Level Index Benchmark (ms, {LEVELS_PER_FILE} levels of {OBJECTS_PER_LEVEL} objects per file)")
+    print("=" * 72)
+    print(f"{'levels':>7} {'parse all':>10} {'cold index':>11} {'warm index':>11} {'menu redraw':>12}")
+
+    for file_count in FILE_COUNTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(file_count):
+                with open(os.path.join(tmp, f"pack_{i:03}.json"), "w") as f:
+                    json.dump(levels, f)
+
+            parse_ms, _ = timed(lambda: parse_all(tmp))
+            cold_ms, _ = timed(lambda: LevelIndex(tmp).load())
+            assert os.path.exists(os.path.join(tmp, MANIFEST_NAME))
+            warm_ms, entries = timed(lambda: LevelIndex(tmp).load())
+
+            menu = MenuSystem(display, entries)
+            menu.state = LEVEL_SELECT
+            menu.selected_level = len(entries) - 1
+            print(f"{len(entries):>7} {parse_ms:>10.1f} {cold_ms:>11.1f} {warm_ms:>11.2f} {redraw_ms(menu):>12.2f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
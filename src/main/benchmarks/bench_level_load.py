@@ -0,0 +1,90 @@
+"""
+Level Load Benchmark
+Compares loading a level from a JSON file against a compiled level pack.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_level_load
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+from main.game_state import GameState
+from main.controller.scripted_controls import ScriptedController
+from main.level_pack import LevelPack, compile_json_pack, PACK_EXTENSION
+
+LEVELS_PER_PACK = 20
+LEVEL_SIZES = [100, 1000, 10000]
+REPEATS = 5
+
+OBJECT_CYCLE = ["Block", "Block", "Spike", "JumpPad", "Block", "JumpOrb", "GravityPortal", "SpeedPortal"]
+
+
+def make_level(count):
+    level = []
+    for i in range(count):
+        obj = {"object": OBJECT_CYCLE[i % len(OBJECT_CYCLE)], "x": i, "y": 6 + i % 5, "width": 1, "height": 1}
+        if obj["object"] == "SpeedPortal":
+            obj["speed_multiplier"] = 1.5
+        level.append(obj)
+    return level
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    last = LEVELS_PER_PACK - 1
+
+    print("=" * 72)
+    print(f"Level Load Benchmark (ms, best of {REPEATS}, loading level {last + 1} of {LEVELS_PER_PACK})")
+    print("=" * 72)
+    print(f"{'objects':>8} {'json parse':>11} {'pack open+read':>15} "
+          f"{'json load_level':>16} {'pack load_level':>16}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in LEVEL_SIZES:
+            json_path = os.path.join(tmp, f"pack_{count}.json")
+            pack_path = os.path.join(tmp, f"pack_{count}" + PACK_EXTENSION)
+            with open(json_path, "w") as f:
+                json.dump([make_level(count) for _ in range(LEVELS_PER_PACK)], f)
+            compile_json_pack(json_path, pack_path)
+            game_state = GameState(None, ScriptedController())
+
+            def json_parse():
+                with open(json_path) as f:
+                    json.load(f)[last]
+
+            def pack_read():
+                with LevelPack(pack_path) as pack:
+                    pack.level(last)
+
+            def load(path):
+                game_state.json_file = path
+                game_state.load_level(last)
+
+            json_ms = best_of(json_parse)
+            pack_ms = best_of(pack_read)
+            json_load_ms = best_of(lambda: load(json_path))
+            pack_load_ms = best_of(lambda: load(pack_path))
+            print(f"{count:>8} {json_ms:>11.2f} {pack_ms:>15.2f} {json_load_ms:>16.2f} {pack_load_ms:>16.2f}")
+
+            # Drop the GameState so its mapped pack is closed before cleanup
+            del game_state
+            print(f"{'':>8} file size: json {os.path.getsize(json_path) // 1024} KB, "
+                  f"pack {os.path.getsize(pack_path) // 1024} KB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Level Memory Benchmark
+Measures memory per object and load time for large generated levels.
+
+    dict objects   GameObjects as they were before __slots__ (instance __dict__)
+    slotted        the current GameObject classes
+    + index        slotted objects plus the SpatialIndex GameState keeps for them
+    level store    columnar LevelStore (its own index included); only objects
+                   with state or behaviour are built
+
+Run from the src directory:
+    python -m main.benchmarks.bench_level_memory
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+
+import pygame
+import main.game_state as game_state_module
+from main.game_state import GameState
+from main.controller.scripted_controls import ScriptedController
+from main.objects.object_factory import ObjectFactory
+from main.objects.level_store import LevelStore
+from main.objects.spatial_index import SpatialIndex
+from main.level_pack import compile_json_pack, PACK_EXTENSION
+from main.constants import GRID_SIZE
+
+LEVEL_SIZES = [10000, 100000]
+REPEATS = 3
+
+# Mostly static geometry, as generated levels are
+OBJECT_CYCLE = ["Block"] * 12 + ["Spike"] * 6 + ["JumpPad", "JumpOrb", "GravityPortal", "SpeedPortal"]
+
+
+class DictGameObject:
+    """GameObject fields without __slots__, as every object used to be stored"""
+    def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.width_cells = width_cells
+        self.height_cells = height_cells
+        self.rect = pygame.Rect(grid_x * GRID_SIZE, grid_y * GRID_SIZE,
+                                width_cells * GRID_SIZE, height_cells * GRID_SIZE)
+        self.colour = (255, 255, 255)
+
+
+def make_level(count):
+    level = []
+    for i in range(count):
+        obj = {"object": OBJECT_CYCLE[i % len(OBJECT_CYCLE)], "x": i, "y": 2 + i % 7, "width": 1, "height": 1}
+        if obj["object"] == "SpeedPortal":
+            obj["speed_multiplier"] = 1.5
+        level.append(obj)
+    return level
+
+
+def traced_bytes(build):
+    """Bytes still allocated by what build() returns"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    pygame.init()
+
+    print("=" * 72)
+    print("Level Memory Benchmark")
+    print("=" * 72)
+    print(f"{'objects':>8} {'dict objects':>14} {'slotted':>10} {'+ index':>10} {'level store':>12}   (bytes per object)")
+    for count in LEVEL_SIZES:
+        level = make_level(count)
+        dict_bytes = traced_bytes(lambda: [DictGameObject(o["x"], o["y"]) for o in level])
+        slot_bytes = traced_bytes(lambda: [ObjectFactory.create(o) for o in level])
+        index_bytes = traced_bytes(lambda: SpatialIndex([ObjectFactory.create(o) for o in level]))
+        store_bytes = traced_bytes(lambda: LevelStore.from_level_data(level))
+        print(f"{count:>8} {dict_bytes / count:>14.1f} {slot_bytes / count:>10.1f} "
+              f"{index_bytes / count:>10.1f} {store_bytes / count:>12.1f}")
+
+    print()
+    print(f"Load time (ms, best of {REPEATS}, GameState.load_level)")
+    print(f"{'objects':>8} {'json eager':>11} {'json store':>11} {'pack eager':>11} {'pack store':>11}")
+    threshold = game_state_module.LAZY_LEVEL_OBJECTS
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in LEVEL_SIZES:
+            json_path = os.path.join(tmp, f"level_{count}.json")
+            pack_path = os.path.join(tmp, f"level_{count}" + PACK_EXTENSION)
+            with open(json_path, "w") as f:
+                json.dump([make_level(count)], f)
+            compile_json_pack(json_path, pack_path)
+            game_state = GameState(None, ScriptedController())
+
+            def load(path, lazy):
+                game_state_module.LAZY_LEVEL_OBJECTS = 0 if lazy else count + 1
+                game_state.json_file = path
+                game_state.load_level(0)
+
+            row = [best_of(lambda: load(path, lazy))
+                   for path in (json_path, pack_path) for lazy in (False, True)]
+            game_state_module.LAZY_LEVEL_OBJECTS = threshold
+            print(f"{count:>8} " + " ".join(f"{ms:>11.1f}" for ms in row))
+            del game_state
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Particle Benchmark
+Compares the array-backed ParticleSystem against the original list-of-objects version.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_particles
+"""
+
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.objects.particle import ParticleSystem, PARTICLE_LIFETIME
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, RED
+
+BURST_SIZES = [20, 1000, 10000, 20000]
+
+
+class LegacyParticle:
+    """Original per-object particle, kept here as the comparison baseline"""
+    def __init__(self, x, y, color):
+        self.x = x
+        self.y = y
+        self.vx = random.uniform(-3, 3)
+        self.vy = random.uniform(-5, -1)
+        self.color = color
+        self.lifetime = 30
+        self.size = random.randint(2, 5)
+
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+        self.vy += 0.2
+        self.lifetime -= 1
+
+    def draw(self, surface, camera_x):
+        if self.lifetime > 0:
+            pygame.draw.circle(surface, self.color, (int(self.x - camera_x), int(self.y)), self.size)
+
+    def is_alive(self):
+        return self.lifetime > 0
+
+
+class LegacyParticleSystem:
+    def __init__(self):
+        self.particles = []
+
+    def emit(self, x, y, color, count=10):
+        for _ in range(count):
+            self.particles.append(LegacyParticle(x, y, color))
+
+    def update(self):
+        for particle in self.particles[:]:
+            particle.update()
+            if not particle.is_alive():
+                self.particles.remove(particle)
+
+    def draw(self, surface, camera_x):
+        for particle in self.particles:
+            particle.draw(surface, camera_x)
+
+
+def run_burst(system, surface, count):
+    """Emit one burst and run it until every particle has died; returns (mean, worst) frame ms"""
+    frames = []
+    for frame in range(PARTICLE_LIFETIME):
+        start = time.perf_counter()
+        if frame == 0:
+            system.emit(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, RED, count)
+        system.update()
+        system.draw(surface, 0)
+        frames.append(time.perf_counter() - start)
+    return sum(frames) / len(frames) * 1000, max(frames) * 1000
+
+
+def main():
+    pygame.init()
+    surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print("=" * 60)
+    print("Particle Benchmark (frame ms over one burst, mean / worst)")
+    print("=" * 60)
+    print(f"{'burst':>8} {'legacy':>18} {'array':>18} {'speedup':>8}")
+
+    for count in BURST_SIZES:
+        legacy_mean, legacy_worst = run_burst(LegacyParticleSystem(), surface, count)
+        # The game warms its pool when a level starts
+        particles = ParticleSystem(capacity=count)
+        particles.warm((RED,))
+        array_mean, array_worst = run_burst(particles, surface, count)
+        print(f"{count:>8} {legacy_mean:>8.2f} / {legacy_worst:>7.2f} "
+              f"{array_mean:>8.2f} / {array_worst:>7.2f} {legacy_mean / array_mean:>7.1f}x")
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
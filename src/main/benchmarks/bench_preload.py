@@ -0,0 +1,79 @@
+"""
+Level Preload Benchmark
+How long choosing a level blocks the main thread, with and without preloading.
+
+    sync        Main.load_level: read, build and install on the main thread
+    preloaded   the level was prepared in the background while highlighted;
+                only install_level and the replay recorder run on selection
+
+While a level prepares in the background the main thread keeps drawing the
+loading screen; the worst of those frames is reported too.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_preload
+"""
+
+import os
+import json
+import time
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.main_collector import Main
+from main.mainMenu.main_menu import MenuSystem
+from main.level_index import LevelIndex
+from main.benchmarks.bench_level_load import make_level
+
+LEVEL_SIZES = [1000, 5000, 15000]
+REPEATS = 3
+
+
+def time_sync(main, level):
+    start = time.perf_counter()
+    main.load_level(level)
+    return (time.perf_counter() - start) * 1000
+
+
+def time_preloaded(main, menu, level):
+    """(selection stall ms, worst loading frame ms while preparing)"""
+    worst = 0.0
+    job = main.preloader.request(main.levels[level])
+    while not job.ready:
+        start = time.perf_counter()
+        menu.draw_loading(job.entry.name, job.fraction)
+        worst = max(worst, time.perf_counter() - start)
+    start = time.perf_counter()
+    main.finish_level(main.start_level(level))
+    return (time.perf_counter() - start) * 1000, worst * 1000
+
+
+def main():
+    pygame.init()
+    game = Main()
+    menu = MenuSystem(game.display)
+
+    print("=" * 64)
+    print(f"Level Preload Benchmark (ms, best of {REPEATS})")
+    print("=" * 64)
+    print(f"{'objects':>8} {'sync stall':>12} {'preloaded stall':>16} {'worst loading frame':>20}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in LEVEL_SIZES:
+            directory = os.path.join(tmp, str(count))
+            os.mkdir(directory)
+            with open(os.path.join(directory, "levels.json"), "w") as f:
+                json.dump([make_level(count)], f)
+            game.levels = LevelIndex(directory).load()
+
+            sync = min(time_sync(game, 0) for _ in range(REPEATS))
+            preloaded = min(time_preloaded(game, menu, 0) for _ in range(REPEATS))
+            print(f"{count:>8} {sync:>12.1f} {preloaded[0]:>16.1f} {preloaded[1]:>20.1f}")
+
+    game.preloader.shutdown()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Render Cache Benchmark
+Compares drawing every visible object against blitting pre-rendered chunks,
+across chunk widths and cache sizes.
+
+Run from the src directory:
+    python -m main.benchmarks.bench_render_cache
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.objects.object_factory import ObjectFactory
+from main.objects.spatial_index import SpatialIndex
+from main.screenDir.render_cache import ChunkRenderCache
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, PLAYER_SPEED
+
+LEVEL_COLUMNS = 2000
+FRAMES = 600
+CHUNK_WIDTHS = [200, 400, 800]
+CACHE_SIZES = [2, 4, 8]
+
+
+def make_objects():
+    """Dense level: a floor strip, stacked blocks and spikes in every column"""
+    objects = []
+    for x in range(LEVEL_COLUMNS):
+        objects.append(ObjectFactory.create({"object": "Block", "x": x, "y": 10, "width": 1, "height": 1}))
+        for y in range(4, 9, 2):
+            objects.append(ObjectFactory.create({"object": "Block", "x": x, "y": y, "width": 1, "height": 1}))
+        objects.append(ObjectFactory.create({"object": "Spike", "x": x, "y": 9, "width": 1, "height": 1}))
+        if x % 10 == 0:
+            objects.append(ObjectFactory.create({"object": "JumpPad", "x": x, "y": 3, "width": 1, "height": 1}))
+    return objects
+
+
+def run(surface, draw_frame):
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        surface.fill(WHITE)
+        draw_frame(frame * PLAYER_SPEED)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    pygame.init()
+    surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    objects = make_objects()
+    index = SpatialIndex(objects)
+
+    def direct(camera_x):
+        for obj in index.visible(camera_x, SCREEN_WIDTH):
+            if obj.is_visible(camera_x, SCREEN_WIDTH):
+                obj.draw(surface, camera_x)
+
+    print("=" * 72)
+    print(f"Render Cache Benchmark ({len(objects)} objects, {FRAMES} frames, ms per frame)")
+    print("=" * 72)
+    print(f"direct draw: {run(surface, direct):.3f}")
+    print(f"{'chunk':>6} {'cache':>6} {'ms':>8} {'hits':>7} {'misses':>7} {'evict':>6}")
+
+    for chunk_width in CHUNK_WIDTHS:
+        for cache_size in CACHE_SIZES:
+            cache = ChunkRenderCache(objects, SCREEN_HEIGHT, chunk_width, cache_size)
+            ms = run(surface, lambda camera_x: cache.draw(surface, camera_x))
+            stats = cache.stats
+            print(f"{chunk_width:>6} {cache_size:>6} {ms:>8.3f} {stats['hits']:>7} "
+                  f"{stats['misses']:>7} {stats['evictions']:>6}")
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
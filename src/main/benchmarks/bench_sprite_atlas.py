@@ -0,0 +1,97 @@
+"""
+Sprite Atlas Benchmark
+One pygame.draw call per object against atlas sprites in one blits batch.
+
+    chunk render    rendering every chunk of a dense level, as on a cache miss
+    dynamic frame   drawing a screenful of objects that update every frame
+                    (these skip the chunk cache and are drawn each frame)
+
+Run from the src directory:
+    python -m main.benchmarks.bench_sprite_atlas
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.objects.object_types import Block
+from main.benchmarks.bench_render_cache import make_objects
+from main.screenDir.render_cache import ChunkRenderCache
+from main.screenDir.sprite_atlas import SpriteAtlas
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, GRID_SIZE
+
+REPEATS = 5
+FRAMES = 600
+DYNAMIC_COLUMNS = SCREEN_WIDTH // GRID_SIZE * 2
+
+
+class MovingBlock(Block):
+    """A block with a per-frame update, so the render cache draws it every frame"""
+    __slots__ = ()
+
+    def update(self):
+        pass
+
+
+class DirectAtlas(SpriteAtlas):
+    """The old drawing: every object draws its own rect"""
+    def draw(self, surface, objects, camera_x, batch=None):
+        if batch:
+            surface.blits(batch, doreturn=False)
+        for obj in objects:
+            obj.draw(surface, camera_x)
+        return len(objects)
+
+
+def chunk_render_ms(objects, atlas):
+    cache = ChunkRenderCache(objects, SCREEN_HEIGHT, atlas=atlas)
+    chunks = range(int(max(obj.rect.right for obj in objects) // cache.chunk_width) + 1)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for index in chunks:
+            cache._render_chunk(index)
+        best = min(best, (time.perf_counter() - start) * 1000 / len(chunks))
+    return best
+
+
+def dynamic_frame_ms(surface, objects, atlas):
+    cache = ChunkRenderCache(objects, SCREEN_HEIGHT, atlas=atlas)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for frame in range(FRAMES):
+            surface.fill(WHITE)
+            cache.draw(surface, frame % GRID_SIZE)
+        best = min(best, (time.perf_counter() - start) * 1000 / FRAMES)
+    return best
+
+
+def main():
+    pygame.init()
+    surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    level = make_objects()
+    dynamic = [MovingBlock(x // 2, y, 1, 1) for x in range(DYNAMIC_COLUMNS) for y in range(12)]
+
+    print("=" * 60)
+    print(f"Sprite Atlas Benchmark (best of {REPEATS}, ms)")
+    print("=" * 60)
+    print(f"{'case':<34} {'draw':>8} {'atlas':>8} {'speedup':>8}")
+    cases = [
+        (f"chunk render ({len(level)} objects)", lambda atlas: chunk_render_ms(level, atlas)),
+        (f"dynamic frame ({len(dynamic)} objects)", lambda atlas: dynamic_frame_ms(surface, dynamic, atlas)),
+    ]
+    for label, case in cases:
+        direct = case(DirectAtlas())
+        atlas = case(SpriteAtlas())
+        print(f"{label:<34} {direct:>8.3f} {atlas:>8.3f} {direct / atlas:>7.1f}x")
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Level Validator Benchmark
+Throughput and peak memory of the level validator on large level files.
+
+    json.load   peak memory of parsing the file whole, for comparison
+    stream      validate_file's peak memory and objects per second
+    pool        validate_paths over several copies of the file across workers
+
+Run from the src directory:
+    python -m main.benchmarks.bench_validator [--workers N]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import tracemalloc
+
+from main.level_validator import validate_file, validate_paths
+from main.benchmarks.bench_level_load import make_level
+
+LEVELS_PER_FILE = [5, 20]
+OBJECTS_PER_LEVEL = 10000
+POOL_FILES = 8
+
+
+def peak_kb(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak // 1024
+
+
+def main(argv):
+    workers = os.cpu_count() or 1
+    if "--workers" in argv:
+        workers = int(argv[argv.index("--workers") + 1])
+
+    print("=" * 72)
+    print(f"Level Validator Benchmark ({OBJECTS_PER_LEVEL} objects per level, {workers} workers)")
+    print("=" * 72)
+    print(f"{'levels':>7} {'file MB':>8} {'json.load KB':>13} {'stream KB':>10} {'objects/s':>11} {'pool obj/s':>11}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for level_count in LEVELS_PER_FILE:
+            path = os.path.join(tmp, f"levels_{level_count}.json")
+            with open(path, "w") as f:
+                json.dump([make_level(OBJECTS_PER_LEVEL) for _ in range(level_count)], f)
+
+            def load():
+                with open(path) as f:
+                    json.load(f)
+
+            load_kb = peak_kb(load)
+            stream_kb = peak_kb(lambda: validate_file(path))
+
+            start = time.perf_counter()
+            report = validate_file(path)
+            rate = report.objects / (time.perf_counter() - start)
+
+            pool_dir = os.path.join(tmp, f"pool_{level_count}")
+            os.mkdir(pool_dir)
+            for i in range(POOL_FILES):
+                shutil.copy(path, os.path.join(pool_dir, f"copy_{i}.json"))
+            start = time.perf_counter()
+            reports = validate_paths([pool_dir], workers)
+            pool_rate = sum(r.objects for r in reports) / (time.perf_counter() - start)
+
+            print(f"{level_count:>7} {os.path.getsize(path) / 1e6:>8.1f} {load_kb:>13,} {stream_kb:>10,} "
+                  f"{rate:>11,.0f} {pool_rate:>11,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,280 @@
+"""
+Benchmark Suite
+Fixed scenarios on synthetic levels, with stored baselines and a regression gate.
+
+    load/<size>       GameState.load_level_data on a synthetic level
+    tick/<size>       one headless GameState.update, jumping on a fixed rhythm
+    collision/10k     CollisionDetection.check_objects against the index candidates
+    particles/burst   a 2000-particle burst updated and drawn until it dies out
+    draw/<size>       GameState.draw to the dummy SDL display, camera sweeping the level
+
+Every scenario reports milliseconds (per tick or frame where it loops). Each
+repeat averages enough runs to fill MIN_REPEAT_SECONDS, and the median repeat
+is kept. compare flags a scenario only when it is slower than its baseline by
+more than threshold and by more than MIN_DELTA_MS, so the ~10us tick scenarios
+don't fail on jitter alone.
+
+Baselines are machine-specific, so none is committed: record one on the machine
+that runs compare. baseline --filter updates only the matching scenarios.
+
+Usage (from the src directory):
+    python -m main.benchmarks.suite run [--filter text] [--repeats N] [--output results.json]
+    python -m main.benchmarks.suite baseline [--filter text] [--repeats N]
+    python -m main.benchmarks.suite compare [results.json] [--baseline path] [--threshold 0.25] [--min-delta MS]
+
+compare runs the suite itself when no results file is given, and exits
+non-zero if any scenario regressed.
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main.game_state import GameState
+from main.simulation.headless import HeadlessSimulation
+from main.objects.particle import ParticleSystem
+from main.screenDir.screen_file import Display
+from main.benchmarks.synthetic import SIZES, synthetic_level
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, RED, PLAYER_SPEED
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.25
+# A slowdown must also be at least this many ms to count; micro scenarios jitter by more than 25%
+MIN_DELTA_MS = 0.005
+# Each repeat averages as many runs as fit in this long, so short scenarios are not one noisy sample
+MIN_REPEAT_SECONDS = 0.1
+
+TICKS = 1000
+FRAMES = 120
+BURST = 2000
+# Jump every JUMP_EVERY ticks; runs that end are restarted, so every repeat plays the same ticks
+JUMP_EVERY = 17
+
+_levels = {}
+
+
+def _level(size):
+    if size not in _levels:
+        _levels[size] = synthetic_level(SIZES[size])
+    return _levels[size]
+
+
+def _load(size):
+    level = _level(size)
+    game_state = GameState(None)
+
+    def run():
+        start = time.perf_counter()
+        game_state.load_level_data(level)
+        return (time.perf_counter() - start) * 1000
+    return run
+
+
+def _tick(size):
+    sim = HeadlessSimulation(_level(size))
+
+    def run():
+        sim.reset()
+        elapsed = 0.0
+        for tick in range(TICKS):
+            start = time.perf_counter()
+            over = sim.step(tick % JUMP_EVERY == 0)
+            elapsed += time.perf_counter() - start
+            if over:
+                sim.reset()
+        return elapsed * 1000 / TICKS
+    return run
+
+
+def _collision(size):
+    sim = HeadlessSimulation(_level(size))
+    player = sim.player
+    spatial_index = sim.game_state.spatial_index
+
+    def run():
+        sim.reset()
+        elapsed = 0.0
+        for tick in range(TICKS):
+            if sim.step(tick % JUMP_EVERY == 0):
+                sim.reset()
+            # Restore the player after the check so the run itself is unchanged
+            state = player.save_state()
+            nearby = spatial_index.near_player(player)
+            start = time.perf_counter()
+            player.collision.check_objects(nearby)
+            elapsed += time.perf_counter() - start
+            player.restore_state(state)
+        return elapsed * 1000 / TICKS
+    return run
+
+
+def _particles():
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    particles = ParticleSystem(seed=0)
+
+    def run():
+        particles.clear()
+        particles.reseed(0)
+        frames = 0
+        start = time.perf_counter()
+        particles.emit(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, RED, BURST)
+        while len(particles):
+            particles.update()
+            particles.draw(surface, 0)
+            frames += 1
+        return (time.perf_counter() - start) * 1000 / frames
+    return run
+
+
+def _draw(size):
+    display = Display(SCREEN_WIDTH, SCREEN_HEIGHT, WHITE)
+    game_state = GameState(display)
+    game_state.load_level_data(_level(size))
+    player = game_state.player
+
+    def run():
+        game_state.reset_level()
+        game_state.render_cache.invalidate()
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            player.display_x += PLAYER_SPEED
+            game_state.camera_x = player.display_x - player.x
+            game_state.draw()
+        return (time.perf_counter() - start) * 1000 / FRAMES
+    return run
+
+
+SCENARIOS = [
+    ("load/1k", lambda: _load("1k")),
+    ("load/10k", lambda: _load("10k")),
+    ("load/100k", lambda: _load("100k")),
+    ("tick/1k", lambda: _tick("1k")),
+    ("tick/10k", lambda: _tick("10k")),
+    ("tick/100k", lambda: _tick("100k")),
+    ("collision/10k", lambda: _collision("10k")),
+    ("particles/burst", _particles),
+    ("draw/1k", lambda: _draw("1k")),
+    ("draw/10k", lambda: _draw("10k")),
+    ("draw/100k", lambda: _draw("100k")),
+]
+
+
+def _sample(run):
+    # As timeit does, keep collector pauses out of the numbers
+    gc.collect()
+    gc.disable()
+    try:
+        samples = []
+        start = time.perf_counter()
+        while not samples or time.perf_counter() - start < MIN_REPEAT_SECONDS:
+            samples.append(run())
+    finally:
+        gc.enable()
+    return sum(samples) / len(samples)
+
+
+def run_suite(filter_text=None, repeats=DEFAULT_REPEATS):
+    """{scenario: median ms} for every scenario whose name contains filter_text"""
+    pygame.init()
+    results = {}
+    for name, setup in SCENARIOS:
+        if filter_text and filter_text not in name:
+            continue
+        run = setup()
+        # One untimed pass warms caches that a running game would already have warm
+        run()
+        results[name] = statistics.median(_sample(run) for _ in range(repeats))
+        print(f"{name:<18} {results[name]:>10.4f} ms")
+    pygame.quit()
+    return results
+
+
+def _metadata():
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def save_results(path, results):
+    with open(path, "w") as f:
+        json.dump({"metadata": _metadata(), "results": results}, f, indent=4)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, min_delta=MIN_DELTA_MS):
+    """Print each scenario against its baseline; returns the names that regressed"""
+    regressions = []
+    print(f"{'scenario':<18} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, ms in results.items():
+        if name not in baseline:
+            print(f"{name:<18} {'-':>10} {ms:>10.4f} {'new':>8}")
+            continue
+        change = ms / baseline[name] - 1
+        flag = ""
+        if change > threshold and ms - baseline[name] > min_delta:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<18} {baseline[name]:>10.4f} {ms:>10.4f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m main.benchmarks.suite",
+                                     description="Run the benchmark scenarios and gate on a baseline.")
+    parser.add_argument("command", choices=["run", "baseline", "compare"])
+    parser.add_argument("results", nargs="?", metavar="results.json", help="compare these results instead of running")
+    parser.add_argument("--filter", dest="filter_text", help="only scenarios whose name contains this")
+    parser.add_argument("--repeats", type=int, metavar="N", default=DEFAULT_REPEATS)
+    parser.add_argument("--output", help="where run saves its results")
+    parser.add_argument("--baseline", dest="baseline_path", default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta", type=float, default=MIN_DELTA_MS, metavar="MS")
+    args = parser.parse_args(argv[1:])
+
+    if args.command == "run":
+        results = run_suite(args.filter_text, args.repeats)
+        if args.output:
+            save_results(args.output, results)
+        return 0
+
+    if args.command == "baseline":
+        # A filtered run only replaces its own scenarios
+        results = load_results(args.baseline_path) if os.path.exists(args.baseline_path) else {}
+        results.update(run_suite(args.filter_text, args.repeats))
+        save_results(args.baseline_path, results)
+        print(f"Baseline written to {args.baseline_path}")
+        return 0
+
+    if not os.path.exists(args.baseline_path):
+        print(f"No baseline at {args.baseline_path}; record one with: python -m main.benchmarks.suite baseline")
+        return 1
+    baseline = load_results(args.baseline_path)
+    results = load_results(args.results) if args.results else run_suite(args.filter_text, args.repeats)
+    print()
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    if regressions:
+        print(f"\n{len(regressions)} scenarios slower than baseline by more than {args.threshold:.0%} "
+              f"and {args.min_delta} ms: " + ", ".join(regressions))
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} and {args.min_delta} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,89 @@
+"""
+Synthetic Levels
+Seeded generator for benchmark levels of any size, in the ObjectFactory JSON schema.
+
+Levels are built from segments laid left to right: a stretch of ground blocks,
+then one feature on or above it (spikes, a platform, a pad, an orb, a speed
+or a pair of gravity portals), in roughly the mix of hand-made levels. The
+same seed and count always give the same level, so benchmark runs compare
+like with like. Generated levels pass the level validator cleanly.
+
+Usage (from the src directory):
+    python -m main.benchmarks.synthetic <objects> <output.json> [--levels N] [--seed N]
+"""
+
+import sys
+import json
+import argparse
+import random
+
+SIZES = {"1k": 1000, "10k": 10000, "100k": 100000}
+GROUND_ROW = 10
+
+
+def _segment(rng, column):
+    """Objects for one segment starting at column, and the column after it"""
+    ground = rng.randint(3, 8)
+    objects = [{"object": "Block", "x": column, "y": GROUND_ROW, "width": ground, "height": 1}]
+    feature = rng.random()
+    at = column + rng.randrange(1, ground)
+    if feature < 0.35:
+        for i in range(rng.randint(1, 3)):
+            if at + i < column + ground:
+                objects.append({"object": "Spike", "x": at + i, "y": GROUND_ROW - 1, "width": 1, "height": 1})
+    elif feature < 0.6:
+        width = min(rng.randint(2, 4), column + ground - at)
+        objects.append({"object": "Block", "x": at, "y": rng.randint(6, 8), "width": width, "height": 1})
+    elif feature < 0.72:
+        objects.append({"object": "JumpPad", "x": at, "y": GROUND_ROW - 1, "width": 1, "height": 1})
+    elif feature < 0.84:
+        objects.append({"object": "JumpOrb", "x": at, "y": rng.randint(5, 7), "width": 1, "height": 1})
+    elif feature < 0.93:
+        objects.append({"object": "SpeedPortal", "x": at, "y": GROUND_ROW - 2, "width": 1, "height": 2,
+                        "speed_multiplier": rng.choice([0.8, 1.0, 1.5, 2.0])})
+    else:
+        # The pair is kept inside the segment so it never meets the next one's portals
+        ground = max(ground, at - column + 5)
+        objects[0]["width"] = ground
+        objects.append({"object": "GravityPortal", "x": at, "y": GROUND_ROW - 2, "width": 1, "height": 2})
+        objects.append({"object": "GravityPortal", "x": at + 4, "y": 1, "width": 1, "height": 2})
+    return objects, column + ground
+
+
+def synthetic_level(count, seed=0):
+    """A level of exactly count objects"""
+    rng = random.Random(seed)
+    level = []
+    column = 0
+    while len(level) < count:
+        objects, column = _segment(rng, column)
+        level.extend(objects)
+    return level[:count]
+
+
+def _object_count(text):
+    if text in SIZES:
+        return SIZES[text]
+    if not text.isdigit():
+        raise argparse.ArgumentTypeError(f"expected a count or one of {', '.join(SIZES)}, not {text!r}")
+    return int(text)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m main.benchmarks.synthetic",
+                                     description="Write seeded synthetic levels to a JSON level file.")
+    parser.add_argument("objects", type=_object_count, help="objects per level: a count or one of " + ", ".join(SIZES))
+    parser.add_argument("output", metavar="output.json")
+    parser.add_argument("--levels", type=int, metavar="N", default=1)
+    parser.add_argument("--seed", type=int, metavar="N", default=0)
+    args = parser.parse_args(argv[1:])
+
+    data = [synthetic_level(args.objects, args.seed + i) for i in range(args.levels)]
+    with open(args.output, "w") as f:
+        json.dump(data, f)
+    print(f"Wrote {len(data)} levels of {args.objects} objects to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -3,6 +3,7 @@ MENU = 0
 LEVEL_SELECT = 1
 PLAYING = 2
 GAME_OVER = 3
+LOADING = 4
 
 # Display Settings
 SCREEN_WIDTH = 800
@@ -12,6 +13,30 @@ FPS = 60
 # Grid System
 GRID_SIZE = 50
 
+# Rendering
+RENDER_CHUNK_WIDTH = 400
+RENDER_CACHE_CHUNKS = 8
+# Larger objects (e.g. a level-long floor block) draw as rects rather than keep a sprite
+SPRITE_MAX_PIXELS = SCREEN_WIDTH * SCREEN_HEIGHT
+
+# Level Loading
+# Levels with at least this many objects keep static geometry in a columnar LevelStore
+LAZY_LEVEL_OBJECTS = 20000
+# Objects built between progress reports while a level loads
+PROGRESS_INTERVAL = 500
+# Levels prepared ahead on the level select screen
+PRELOAD_LIMIT = 2
+# Menu selection that starts the generated endless mode instead of a level
+ENDLESS_LEVEL = -1
+# Rows shown per page of the level select screen
+LEVELS_PER_PAGE = 5
+# Frames between checks of the level file for edits while playing
+HOT_RELOAD_INTERVAL = 30
+
+# Startup
+# Most the app may take from its first import to the first menu frame
+STARTUP_BUDGET_MS = 1000
+
 # Physics
 GRAVITY = 0.35
 JUMP_STRENGTH = -10
@@ -22,6 +47,19 @@ PLAYER_HEIGHT = 50
 PLAYER_SPEED = 5
 PLAYER_COLOR = (255, 0, 0)
 
+# Input
+# Ticks a jump press keeps counting after it is made, so a press just before landing still jumps
+JUMP_BUFFER_TICKS = 6
+# Ticks after leaving the ground (without jumping) in which a jump still works
+COYOTE_TICKS = 4
+# Recent input-to-simulation latencies kept by the input system
+INPUT_LATENCY_SAMPLES = 600
+
+# Ghosts
+# Earlier attempts kept for replay as ghosts, and their opacity (0-255)
+GHOST_LIMIT = 200
+GHOST_ALPHA = 70
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
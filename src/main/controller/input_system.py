@@ -0,0 +1,65 @@
+import time
+from collections import deque
+
+import pygame
+from main.profiler import profiler
+from main.constants import INPUT_LATENCY_SAMPLES
+
+JUMP_KEYS = (pygame.K_SPACE,)
+
+
+class InputSystem:
+    """Jump input fed from the pygame event queue, shared by the player and the objects
+
+    handle_event() latches press and release edges with the time each was taken
+    off the queue, so a tap that starts and ends between two ticks still counts.
+    update() turns them into the tick's jump bit: held now, or pressed at any
+    point since the previous tick. Buffering and coyote time work on that bit in
+    Player, so replays and headless runs see the same input as the live game.
+    """
+    def __init__(self, keys=JUMP_KEYS):
+        self.keys = keys
+        self.held = set()
+        self.jump = False
+        # Time of the press not yet acted on, for the latency samples
+        self._pending = None
+        self._press_time = None
+        self.latency = deque(maxlen=INPUT_LATENCY_SAMPLES)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key in self.keys:
+            if not self.held and self._pending is None:
+                self._pending = time.perf_counter()
+            self.held.add(event.key)
+        elif event.type == pygame.KEYUP and event.key in self.keys:
+            self.held.discard(event.key)
+
+    def clear(self):
+        """Forget presses made elsewhere (e.g. on the menu) before a run starts"""
+        self._pending = None
+        self._press_time = None
+        self.jump = False
+
+    def update(self):
+        """Latch this tick's jump bit; call once per simulation tick"""
+        self.jump = bool(self.held) or self._pending is not None
+        if self._pending is not None:
+            self._press_time = self._pending
+            self._pending = None
+
+    def is_pressed(self, key):
+        return key == pygame.K_SPACE and self.jump
+
+    def jump_used(self):
+        """A jump or orb acted on the latest press; record how long it waited"""
+        if self._press_time is None:
+            return
+        ms = (time.perf_counter() - self._press_time) * 1000
+        self._press_time = None
+        self.latency.append(ms)
+        profiler.record("input", ms)
+
+    def jump_expired(self):
+        """The latest press was released and its buffer ran out unused; don't time it"""
+        self._press_time = None
+
@@ -0,0 +1,22 @@
+import pygame
+
+
+class ScriptedController:
+    """Controller fed by code instead of the keyboard, for headless runs"""
+    def __init__(self):
+        self.jump_held = False
+    
+    def update(self):
+        pass
+    
+    def set_jump(self, held):
+        self.jump_held = held
+    
+    def is_pressed(self, key):
+        return key == pygame.K_SPACE and self.jump_held
+    
+    def jump_used(self):
+        pass
+    
+    def jump_expired(self):
+        pass
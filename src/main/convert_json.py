@@ -1,6 +1,13 @@
+import os
 import json
 import sys
 
+# Allow running as a plain script (python src/main/convert_json.py) as well as with -m
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main.level_pack import compile_json_pack, PACK_EXTENSION
+
 def convert_json_to_new_format(input_file, output_file):
     """
     Convert old JSON format to new GameObject format.
@@ -32,12 +39,41 @@ def convert_json_to_new_format(input_file, output_file):
     except Exception as e:
         print(f"Error: {e}")
 
+def compile_json(input_file, output_file):
+    """
+    Compile a JSON level file into a binary level pack.
+    Packs load through mmap and only decode the level being played.
+    """
+    try:
+        levels, objects = compile_json_pack(input_file, output_file)
+        
+        print(f"Successfully compiled {input_file} to {output_file}")
+        print(f"Compiled {objects} objects across {levels} levels")
+        
+    except FileNotFoundError:
+        print(f"Error: File {input_file} not found")
+    except json.JSONDecodeError:
+        print(f"Error: Invalid JSON in {input_file}")
+    except Exception as e:
+        print(f"Error: {e}")
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python convert_json.py <input_file> [output_file]")
+        print("       python convert_json.py compile <input_file> [output_file]")
         print("Example: python convert_json.py objects.json objects_new.json")
+        print("Example: python convert_json.py compile objects.json objects" + PACK_EXTENSION)
         sys.exit(1)
     
+    if sys.argv[1] == "compile":
+        if len(sys.argv) < 3:
+            print("Usage: python convert_json.py compile <input_file> [output_file]")
+            sys.exit(1)
+        input_file = sys.argv[2]
+        output_file = sys.argv[3] if len(sys.argv) > 3 else os.path.splitext(input_file)[0] + PACK_EXTENSION
+        compile_json(input_file, output_file)
+        sys.exit(0)
+    
     input_file = sys.argv[1]
     output_file = sys.argv[2] if len(sys.argv) > 2 else input_file.replace('.json', '_converted.json')
     
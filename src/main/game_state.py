@@ -1,46 +1,310 @@
+import os
+import bisect
 import pygame
 import json
+from collections import namedtuple
 from main.playerDir.player_file import Player
+from main.playerDir.ghosts import GhostRuns
 from main.screenDir.screen_file import Display
+from main.screenDir.render_cache import ChunkRenderCache
 from main.objects.floor_terrain import FloorTerrain
 from main.objects.object_factory import ObjectFactory
 from main.objects.particle import ParticleSystem
+from main.objects.spatial_index import SpatialIndex
+from main.objects.level_store import LevelStore
+from main.level_generator import EndlessLevel
+from main.level_pack import LevelPack, PACK_EXTENSION
+from main.hot_reload import diff_levels
+from main.profiler import profiler
 from main.constants import *
 
+# Smallest gap between load-order positions before patch_level renumbers the level
+MIN_ORDER_STEP = 1e-6
+
+DEFAULT_LEVEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo_level.json")
+
+# Everything prepare_level builds, ready for install_level
+PreparedLevel = namedtuple("PreparedLevel", [
+    "level_data", "objects", "spatial_index", "level_end", "stateful_objects", "render_cache"
+])
+
 
 class GameState:
-    def __init__(self, display):
+    def __init__(self, display, controller=None):
         self.display = display
-        self.player = Player(50, 300, PLAYER_WIDTH, PLAYER_HEIGHT)
+        self.player = Player(50, 300, PLAYER_WIDTH, PLAYER_HEIGHT, controller)
         self.floor = FloorTerrain(0, 550, 1000, 50, BLACK)
         self.objects = []
+        self.stateful_objects = []
+        self.spatial_index = SpatialIndex()
+        self.render_cache = None
         self.particle_system = ParticleSystem()
+        self.ghosts = GhostRuns()
+        self.effects = True
         self.camera_x = 0
         self.current_level = 0
         self.death_timer = 0
         self.score = 0
+        self.level_end = 0
+        self.level_data = []
+        self.endless = None
+        self._pack = None
         
-        self.json_file = r"C:\Users\noahf\Desktop\Development\Python\geoGame\src\main\demo_level.json"
+        # Restart snapshots: initial object states plus the objects touched since
+        self.practice_mode = False
+        self.checkpoints = []
+        self._initial_player = self.player.save_state()
+        self._initial_states = {}
+        self._touched = set()
+        
+        self.json_file = DEFAULT_LEVEL_FILE
+    
+    def read_level(self, level, path=None):
+        """Level data for level from path or json_file (object dicts or a LevelStore); empty if unreadable"""
+        path = path or self.json_file
+        level_data = []
+        try:
+            if path.endswith(PACK_EXTENSION):
+                pack = self._open_pack(path)
+                if level < len(pack):
+                    if pack.object_count(level) >= LAZY_LEVEL_OBJECTS:
+                        level_data = pack.store(level)
+                    else:
+                        level_data = pack.level(level)
+            else:
+                with open(path) as f:
+                    data = json.load(f)
+                    if level < len(data):
+                        level_data = data[level]
+        except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+            print(f"Error loading level: {e}")
+        return level_data
     
     def load_level(self, level):
-        self.objects.clear()
+        self.load_level_data(self.read_level(level), level)
+    
+    def _open_pack(self, path):
+        """Compiled packs stay mapped so switching levels only decodes that level"""
+        if self._pack is None or self._pack.path != path:
+            if self._pack is not None:
+                self._pack.close()
+            self._pack = LevelPack(path)
+        return self._pack
+    
+    def load_level_data(self, level_data, level=0):
+        """Build a level from already-parsed object data (object dicts or a LevelStore)"""
+        self.install_level(self.prepare_level(level_data), level)
+    
+    def prepare_level(self, level_data, progress=None):
+        """Build a level's objects, indexes and render cache without touching the running game
+        
+        Safe to run on a background thread: nothing here draws, and the render
+        cache's sprites and first chunks are left for install_level.
+        progress(done, total), if given, is called as objects are built.
+        """
+        store = level_data if isinstance(level_data, LevelStore) else None
+        if store is None and len(level_data) >= LAZY_LEVEL_OBJECTS:
+            store = LevelStore.from_level_data(level_data)
+        
+        if store is not None:
+            # Only objects with state or behaviour are built; the store indexes the rest
+            objects = list(store.eager)
+            spatial_index = store
+            level_end = store.level_end
+        else:
+            objects = []
+            total = len(level_data)
+            for obj_data in level_data:
+                objects.append(ObjectFactory.create(obj_data))
+                if progress is not None and len(objects) % PROGRESS_INTERVAL == 0:
+                    progress(len(objects), total)
+            spatial_index = SpatialIndex(objects)
+            level_end = max((obj.rect.right for obj in objects), default=0)
+        
+        render_cache = None
+        if self.display is not None:
+            if store is not None:
+                render_cache = ChunkRenderCache(objects + store.prototypes(), self.display.height,
+                                                static_index=store, atlas=self.display.sprites,
+                                                defer_sprites=True)
+            else:
+                render_cache = ChunkRenderCache(objects, self.display.height, atlas=self.display.sprites,
+                                                defer_sprites=True)
+        
+        stateful_objects = [obj for obj in objects if obj.save_state() is not None]
+        if progress is not None:
+            progress(len(level_data), len(level_data))
+        return PreparedLevel(level_data, objects, spatial_index, level_end, stateful_objects, render_cache)
+    
+    def install_level(self, prepared, level=0):
+        """Make a level built by prepare_level the current one"""
         self.player.reset()
         self.camera_x = 0
         self.death_timer = 0
         self.current_level = level
+        self.level_data = prepared.level_data
+        self.endless = None
         
-        try:
-            with open(self.json_file) as f:
-                data = json.load(f)
-                if level < len(data):
-                    for obj_data in data[level]:
-                        obj = ObjectFactory.create(obj_data)
-                        self.objects.append(obj)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading level: {e}")
+        self.objects = prepared.objects
+        self.spatial_index = prepared.spatial_index
+        self.level_end = prepared.level_end
+        self.stateful_objects = prepared.stateful_objects
+        if self.display is not None:
+            self.render_cache = prepared.render_cache
+            # The atlas is the display's, shared with whatever is drawing now, so
+            # sprites and the first chunks are only rendered here on the main thread
+            self.render_cache.preload_sprites()
+            self.render_cache.warm(0, self.display.width)
+            # Level start is already a pause; the first death or jump burst shouldn't be
+            self.particle_system.warm((RED, WHITE))
+        
+        self._initial_player = self.player.save_state()
+        self._initial_states = {obj: obj.save_state() for obj in self.stateful_objects}
+        self._touched = set()
+        self.checkpoints = []
+        self.ghosts.load(prepared.level_data, self.floor, self.player)
+    
+    def patch_level(self, level_data):
+        """Swap in an edited copy of the current level without restarting the run; returns the LevelDiff"""
+        diff = diff_levels(self.level_data, level_data)
+        if not isinstance(self.spatial_index, SpatialIndex) or len(level_data) >= LAZY_LEVEL_OBJECTS:
+            # Store-backed levels are rebuilt whole; the player still keeps its place
+            player_state, camera_x = self.player.save_state(), self.camera_x
+            self.install_level(self.prepare_level(level_data), self.current_level)
+            self.player.restore_state(player_state)
+            self.camera_x = camera_x
+            return diff
+        
+        objects = self.objects
+        removed = [objects[i] for i in diff.removed] + [objects[i] for i, _ in diff.changed]
+        created = {j: ObjectFactory.create(level_data[j]) for j in diff.added}
+        created.update((j, ObjectFactory.create(level_data[j])) for _, j in diff.changed)
+        middle = [created[j] if j in created else objects[diff.kept[j]] for j in range(diff.start, diff.new_end)]
+        self.objects = objects[:diff.start] + middle + objects[diff.old_end:]
+        self.level_data = level_data
+        positions = self._patch_positions(objects, diff, middle)
+        
+        removed_stateful = set()
+        created_stateful = []
+        for obj in removed:
+            self.spatial_index.remove(obj)
+            if self.render_cache is not None:
+                self.render_cache.remove(obj)
+            if obj in self._initial_states:
+                del self._initial_states[obj]
+                removed_stateful.add(obj)
+            self._touched.discard(obj)
+            for _, object_states in self.checkpoints:
+                object_states.pop(obj, None)
+        for obj in created.values():
+            self.spatial_index.insert(obj)
+            if self.render_cache is not None:
+                self.render_cache.add(obj)
+            state = obj.save_state()
+            if state is not None:
+                self._initial_states[obj] = state
+                created_stateful.append(obj)
+        
+        self.spatial_index.reorder(positions)
+        if self.render_cache is not None:
+            self.render_cache.reorder(positions)
+        # stateful_objects stays in level order too, as save_state() depends on it
+        order = self.spatial_index.order
+        if removed_stateful:
+            self.stateful_objects = [obj for obj in self.stateful_objects if obj not in removed_stateful]
+        if diff.reordered:
+            self.stateful_objects = sorted(self._initial_states, key=lambda obj: order[id(obj)])
+        else:
+            for obj in created_stateful:
+                bisect.insort(self.stateful_objects, obj, key=lambda other: order[id(other)])
+        
+        if any(obj.rect.right >= self.level_end for obj in removed):
+            self.level_end = max((obj.rect.right for obj in self.objects), default=0)
+        else:
+            self.level_end = max([self.level_end] + [obj.rect.right for obj in created.values()])
+        
+        # Recorded attempts were played on the old layout
+        self.ghosts.load(level_data, self.floor, self.player)
+        return diff
+    
+    def _patch_positions(self, old_objects, diff, middle):
+        """Load-order positions for a patch: the edited middle is spread between its unchanged neighbours"""
+        order = self.spatial_index.order
+        low = order[id(old_objects[diff.start - 1])] if diff.start else -1
+        if diff.old_end < len(old_objects):
+            high = order[id(old_objects[diff.old_end])]
+        else:
+            high = low + len(middle) + 1
+        step = (high - low) / (len(middle) + 1)
+        if step < MIN_ORDER_STEP:
+            # Repeated edits in one spot used up the gap; renumber everything
+            return {id(obj): i for i, obj in enumerate(self.objects)}
+        return {id(obj): low + step * (k + 1) for k, obj in enumerate(middle)}
+    
+    def load_endless(self, seed):
+        """Start an endless run; chunks are generated from seed ahead of the camera"""
+        self.load_level_data([])
+        self.endless = EndlessLevel(seed)
+        self.spatial_index = self.endless
+        self.level_end = float("inf")
+        # Ghosts replay against fixed geometry, which a streamed level doesn't have
+        self.ghosts.load(None, self.floor, self.player)
+        if self.display is not None:
+            self.render_cache = ChunkRenderCache(self.endless.prototypes(), self.display.height,
+                                                 static_index=self.endless, dynamic_index=self.endless,
+                                                 atlas=self.display.sprites)
+    
+    def save_state(self):
+        """Capture the run state of the loaded level (player, triggers, timers)"""
+        return (
+            self.player.save_state(),
+            tuple(obj.save_state() for obj in self.stateful_objects),
+            self.camera_x, self.death_timer, self.score
+        )
+    
+    def restore_state(self, state):
+        player_state, object_states, self.camera_x, self.death_timer, self.score = state
+        self.player.restore_state(player_state)
+        for obj, obj_state in zip(self.stateful_objects, object_states):
+            obj.restore_state(obj_state)
+        self._touched = set(self.stateful_objects)
+    
+    def save_checkpoint(self):
+        """Practice-mode checkpoint; only objects touched so far are recorded"""
+        self.checkpoints.append((
+            self.player.save_state(),
+            {obj: obj.save_state() for obj in self._touched}
+        ))
+    
+    def remove_checkpoint(self):
+        if self.checkpoints:
+            self.checkpoints.pop()
+    
+    def _restore_run(self, player_state, object_states):
+        # Objects never touched still hold their initial state, so only
+        # the touched ones and the checkpoint's own entries need writing
+        for obj in self._touched:
+            if obj not in object_states:
+                obj.restore_state(self._initial_states[obj])
+        for obj, obj_state in object_states.items():
+            obj.restore_state(obj_state)
+        self._touched = set(object_states)
+        if self.endless is not None:
+            # Streamed chunks aren't snapshotted; regenerate them from the seed instead
+            self.endless.reset()
+        
+        self.player.restore_state(player_state)
+        self.camera_x = self.player.display_x - self.player.x
+        self.death_timer = 0
     
     def reset_level(self):
-        self.load_level(self.current_level)
+        """Restart from the last checkpoint in practice mode, otherwise from the level start"""
+        if self.practice_mode and self.checkpoints:
+            self._restore_run(*self.checkpoints[-1])
+            self.ghosts.discard()
+        else:
+            self._restore_run(self._initial_player, {})
+            self.ghosts.restart()
     
     def update(self):
         if self.death_timer > 0:
@@ -48,23 +312,39 @@ class GameState:
             if self.death_timer == 0:
                 self.reset_level()
             self.particle_system.update()
+            profiler.mark("particles")
             return
         
-        # Update all objects (for animated/moving objects)
-        for obj in self.objects:
+        # Update animated/moving objects (static ones have no-op update)
+        for obj in self.spatial_index.dynamic:
             obj.update()
+        profiler.mark("objects")
         
         self.camera_x = self.player.display_x - self.player.x
+        if self.endless is not None:
+            self.endless.advance(self.camera_x)
+        
+        nearby = self.spatial_index.near_player(self.player)
+        result = self.player.update(self.floor, nearby, self.camera_x)
         
-        result = self.player.update(self.floor, self.objects, self.camera_x)
+        # Anything the player was tested against may have changed state
+        for obj in nearby:
+            if obj in self._initial_states:
+                self._touched.add(obj)
+        profiler.mark("player")
+        
+        if self.ghosts.enabled:
+            self.ghosts.update(self.player)
+            profiler.mark("ghosts")
         
         # Handle death
         if isinstance(result, tuple):
             x, y = result
-            self.particle_system.emit(x, y, RED, 20)
+            if self.effects:
+                self.particle_system.emit(x, y, RED, 20)
             self.death_timer = 60
         # Handle jump
-        elif result:
+        elif result and self.effects:
             self.particle_system.emit(
                 self.player.x + self.player.width // 2,
                 self.player.y + self.player.height,
@@ -72,6 +352,7 @@ class GameState:
             )
         
         self.particle_system.update()
+        profiler.mark("particles")
         self.score = int(self.player.display_x / 10)
     
     def draw(self):
@@ -79,16 +360,22 @@ class GameState:
         
         self.floor.draw(self.display.surface)
         
-        for obj in self.objects:
-            if obj.is_visible(self.camera_x, self.display.width):
-                obj.draw(self.display.surface, self.camera_x)
+        if self.render_cache is not None:
+            self.render_cache.draw(self.display.surface, self.camera_x)
         
+        self.ghosts.draw(self.display.surface, self.camera_x, self.player)
         self.player.draw(self.display.surface)
         self.particle_system.draw(self.display.surface, self.camera_x)
         
         # Draw score
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f"Score: {self.score}", True, BLACK)
+        label = f"Score: {self.score}"
+        if self.practice_mode:
+            label += f"  Practice ({len(self.checkpoints)} checkpoints)"
+        score_text = self.display.text_cache.render(label, 36, BLACK)
         self.display.surface.blit(score_text, (10, 10))
         
+        profiler.draw_overlay(self.display.surface, self.display.text_cache)
+        profiler.mark("draw")
+        
         self.display.update()
+        profiler.mark("flip")
@@ -0,0 +1,160 @@
+"""
+Hot Reload
+Watches the loaded level file and patches edits into the running level.
+
+diff_levels matches the loaded level's objects against the edited level data
+by identity: type, position, size and parameter. The unchanged runs at both
+ends are skipped with plain dict comparisons, so only the edited middle is
+matched by key. GameState.patch_level then builds, indexes and draws just the
+added, removed and changed objects, and the player keeps running where they are.
+"""
+
+import os
+import json
+
+from main.level_pack import PACK_EXTENSION
+from main.objects.level_store import PARAM_FIELDS
+from main.constants import HOT_RELOAD_INTERVAL
+
+SCAN_BLOCK = 256
+
+
+def object_key(obj_data):
+    """What makes two object dicts the same object, with the factory's defaults filled in"""
+    name = obj_data.get("object", "Block")
+    param_field = PARAM_FIELDS.get(name)
+    return (name, obj_data.get("x", 0), obj_data.get("y", 0), obj_data.get("width", 1),
+            obj_data.get("height", 1), obj_data.get(param_field) if param_field else None)
+
+
+class LevelDiff:
+    """How an edited level differs from the loaded one, by index into each
+
+    Objects before start and from old_end / new_end on are unchanged. In
+    between, kept maps new indices to the old object they reuse, changed pairs
+    (old, new) for objects edited in place, and the rest are added or removed.
+    """
+    def __init__(self, start, old_end, new_end, kept, added, removed, changed):
+        self.start = start
+        self.old_end = old_end
+        self.new_end = new_end
+        self.kept = kept
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    @property
+    def empty(self):
+        return self.start == self.old_end == self.new_end
+
+    @property
+    def reordered(self):
+        """True if any reused objects swapped places"""
+        kept = list(self.kept.values())
+        return any(a > b for a, b in zip(kept, kept[1:]))
+
+    def __repr__(self):
+        return f"<LevelDiff +{len(self.added)} -{len(self.removed)} ~{len(self.changed)}>"
+
+
+def diff_levels(old_data, new_data):
+    """LevelDiff from the loaded level's object dicts to the edited ones"""
+    # Unchanged runs are skipped a block at a time, comparing list slices in C
+    start = 0
+    shared = min(len(old_data), len(new_data))
+    while start + SCAN_BLOCK <= shared and old_data[start:start + SCAN_BLOCK] == new_data[start:start + SCAN_BLOCK]:
+        start += SCAN_BLOCK
+    while start < shared and old_data[start] == new_data[start]:
+        start += 1
+    old_end, new_end = len(old_data), len(new_data)
+    while (min(old_end, new_end) - SCAN_BLOCK >= start and
+           old_data[old_end - SCAN_BLOCK:old_end] == new_data[new_end - SCAN_BLOCK:new_end]):
+        old_end -= SCAN_BLOCK
+        new_end -= SCAN_BLOCK
+    while old_end > start and new_end > start and old_data[old_end - 1] == new_data[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    unmatched = {}
+    for i in range(start, old_end):
+        unmatched.setdefault(object_key(old_data[i]), []).append(i)
+    kept = {}
+    added = []
+    for j in range(start, new_end):
+        candidates = unmatched.get(object_key(new_data[j]))
+        if candidates:
+            kept[j] = candidates.pop(0)
+        else:
+            added.append(j)
+    removed = sorted(i for indices in unmatched.values() for i in indices)
+
+    # An added and a removed object of the same type in the same cell were edited in place
+    by_cell = {}
+    for i in removed:
+        by_cell.setdefault(object_key(old_data[i])[:3], []).append(i)
+    changed = []
+    for j in added:
+        candidates = by_cell.get(object_key(new_data[j])[:3])
+        if candidates:
+            changed.append((candidates.pop(0), j))
+    if changed:
+        changed_old = {i for i, _ in changed}
+        changed_new = {j for _, j in changed}
+        removed = [i for i in removed if i not in changed_old]
+        added = [j for j in added if j not in changed_new]
+    return LevelDiff(start, old_end, new_end, kept, added, removed, changed)
+
+
+class LevelWatcher:
+    """Polls the loaded level's JSON file and hands back the level whenever the file changes"""
+    def __init__(self, interval=HOT_RELOAD_INTERVAL):
+        self.interval = interval
+        self.path = None
+        self.level = 0
+        self._stamp = None
+        self._frames = 0
+
+    def watch(self, path, level):
+        """Follow path from now on (compiled packs and None are not watched)"""
+        self.path = path if path is not None and not path.endswith(PACK_EXTENSION) else None
+        self.level = level
+        self._stamp = self._stat()
+        self._frames = 0
+
+    def _stat(self):
+        if self.path is None:
+            return None
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self):
+        """The edited level data if the file changed since the last poll, else None"""
+        if self.path is None:
+            return None
+        self._frames += 1
+        if self._frames < self.interval:
+            return None
+        self._frames = 0
+
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return None
+        self._stamp = stamp
+        try:
+            with open(self.path) as f:
+                levels = json.load(f)
+        except (OSError, ValueError) as e:
+            # Often a save caught half-written; the next save is picked up again
+            print(f"Hot reload skipped: {e}")
+            return None
+        if not isinstance(levels, list) or self.level >= len(levels) or not isinstance(levels[self.level], list):
+            print(f"Hot reload skipped: {self.path} has no level {self.level}")
+            return None
+        level_data = levels[self.level]
+        if not all(isinstance(obj_data, dict) for obj_data in level_data):
+            print(f"Hot reload skipped: level {self.level} has entries that are not objects")
+            return None
+        return level_data
@@ -0,0 +1,246 @@
+"""
+Procedural Level Generator
+Endless levels built chunk by chunk from a seed.
+
+Each chunk is a fixed run of grid columns filled with obstacle templates
+(spikes, platforms, stairs, jump pads, orbs, speed sections). The templates
+are sized from the physics constants so every obstacle can be cleared from
+a standing jump, and each one is followed by enough flat ground to land, so
+a chunk starts and ends with the player running on the floor at base speed.
+A chunk depends only on (seed, index), so chunks can be dropped once they
+scroll away and rebuilt identically if the player comes back.
+
+Usage (from the src directory):
+    python -m main.level_generator [--seed N] [--chunks N] [--out level.json] [--verify]
+"""
+
+import sys
+import json
+import random
+
+from main.objects.object_factory import ObjectFactory
+from main.objects.spatial_index import SpatialIndex
+from main.constants import GRID_SIZE, GRAVITY, JUMP_STRENGTH, PLAYER_SPEED, SCREEN_WIDTH
+
+CHUNK_COLUMNS = 24
+# Row of one-cell objects resting on the floor (the floor top is at 550px)
+GROUND_ROW = 10
+# Chunks kept alive behind the camera and generated ahead of the screen
+CHUNKS_BEHIND = 1
+CHUNKS_AHEAD = 1
+START_COLUMNS = 8
+PAD_POWER = -15
+
+
+def jump_arc(velocity, gravity=GRAVITY):
+    """(ticks in the air, apex height in px) of a jump from flat ground, stepped like Player"""
+    ticks = 0
+    height = 0.0
+    apex = 0.0
+    while True:
+        velocity += gravity
+        height -= velocity
+        ticks += 1
+        apex = max(apex, height)
+        if height <= 0:
+            return ticks, apex
+
+
+def _columns(ticks, speed=PLAYER_SPEED):
+    return int(ticks * speed // GRID_SIZE)
+
+
+# One column of the player's own width and one of timing slack come off every reach
+JUMP_TICKS, JUMP_APEX = jump_arc(JUMP_STRENGTH)
+JUMP_COLUMNS = _columns(JUMP_TICKS) - 2
+# Leave a few px of clearance over the top of the highest step
+STEP_ROWS = max(1, int((JUMP_APEX - 10) // GRID_SIZE))
+PAD_TICKS, _ = jump_arc(PAD_POWER)
+PAD_COLUMNS = _columns(PAD_TICKS) - 2
+# Ground after an obstacle before the next one may start
+LANDING_COLUMNS = _columns(JUMP_TICKS) + 1
+
+
+def _obj(name, x, y, width=1, height=1, **params):
+    obj_data = {"object": name, "x": x, "y": y, "width": width, "height": height}
+    obj_data.update(params)
+    return obj_data
+
+
+def _spikes(rng, x):
+    count = rng.randint(1, JUMP_COLUMNS)
+    return [_obj("Spike", x, GROUND_ROW, count)], count
+
+
+def _platform(rng, x):
+    length = rng.randint(2, 5)
+    objects = [_obj("Block", x, GROUND_ROW, length)]
+    if rng.random() < 0.5:
+        # A spike at the far end: jump off the platform to clear it
+        objects.append(_obj("Spike", x + length, GROUND_ROW))
+        length += 1
+    return objects, length
+
+
+def _stairs(rng, x):
+    rows = min(STEP_ROWS, 2)
+    objects = [_obj("Block", x, GROUND_ROW, 2)]
+    for step in range(1, rows):
+        objects.append(_obj("Block", x + 2 * step, GROUND_ROW - step, 2, step + 1))
+    return objects, 2 * rows
+
+
+def _jump_pad(rng, x):
+    count = rng.randint(JUMP_COLUMNS + 1, PAD_COLUMNS - 1)
+    return [_obj("JumpPad", x, GROUND_ROW), _obj("Spike", x + 1, GROUND_ROW, count)], count + 1
+
+
+def _orb(rng, x):
+    # The orb, at the top of a normal jump, gives the extra air for a run too long for one
+    count = rng.randint(JUMP_COLUMNS + 1, JUMP_COLUMNS + 2)
+    return [_obj("JumpOrb", x + count // 2, GROUND_ROW - 3), _obj("Spike", x, GROUND_ROW, count)], count
+
+
+def _speed_run(rng, x):
+    length = rng.randint(6, 10)
+    return [
+        _obj("SpeedPortal", x, GROUND_ROW - 1, 1, 2, speed_multiplier=2.0),
+        _obj("SpeedPortal", x + length, GROUND_ROW - 1, 1, 2, speed_multiplier=1.0),
+    ], length + 1
+
+
+TEMPLATES = [
+    (_spikes, 4),
+    (_platform, 3),
+    (_stairs, 2),
+    (_jump_pad, 2),
+    (_orb, 1),
+    (_speed_run, 1),
+]
+
+
+class ChunkGenerator:
+    """Deterministic chunks of object dicts for one seed"""
+    def __init__(self, seed):
+        self.seed = seed
+        self._templates = [template for template, _ in TEMPLATES]
+        self._weights = [weight for _, weight in TEMPLATES]
+
+    def chunk(self, index):
+        """Object dicts for chunk index; the same (seed, index) always gives the same chunk"""
+        rng = random.Random(self.seed * 1000003 + index)
+        start = index * CHUNK_COLUMNS
+        end = start + CHUNK_COLUMNS
+        x = start + (START_COLUMNS if index == 0 else 0)
+
+        objects = []
+        while True:
+            template = rng.choices(self._templates, self._weights)[0]
+            placed, width = template(rng, x)
+            if x + width + LANDING_COLUMNS > end:
+                break
+            objects.extend(placed)
+            x += width + LANDING_COLUMNS + rng.randint(0, 2)
+        return objects
+
+    def level(self, chunks):
+        """The first chunks concatenated into a finite level"""
+        return [obj_data for index in range(chunks) for obj_data in self.chunk(index)]
+
+
+class EndlessLevel:
+    """Streams generated chunks around the camera; stands in for SpatialIndex in GameState"""
+    def __init__(self, seed):
+        self.generator = ChunkGenerator(seed)
+        self.chunks = {}
+        self.dynamic = []
+
+    def reset(self):
+        self.chunks.clear()
+        self.dynamic = []
+
+    def _chunk(self, index):
+        chunk = self.chunks.get(index)
+        if chunk is None:
+            objects = [ObjectFactory.create(obj_data) for obj_data in self.generator.chunk(index)]
+            chunk = self.chunks[index] = SpatialIndex(objects)
+            self._refresh_dynamic()
+        return chunk
+
+    def _refresh_dynamic(self):
+        self.dynamic = [obj for index in sorted(self.chunks) for obj in self.chunks[index].dynamic]
+
+    def advance(self, camera_x, screen_width=SCREEN_WIDTH):
+        """Generate the chunks the camera is about to reach and drop the ones behind it"""
+        chunk_px = CHUNK_COLUMNS * GRID_SIZE
+        first = max(0, int(camera_x // chunk_px) - CHUNKS_BEHIND)
+        last = int((camera_x + screen_width) // chunk_px) + CHUNKS_AHEAD
+        stale = [index for index in self.chunks if index < first or index > last]
+        for index in stale:
+            del self.chunks[index]
+        if stale:
+            self._refresh_dynamic()
+        for index in range(first, last + 1):
+            self._chunk(index)
+
+    def prototypes(self):
+        """One object of each static type the generator places (for colours and the like)"""
+        return [ObjectFactory.create({"object": name}) for name in ("Block", "Spike")]
+
+    def query(self, x_min, x_max):
+        """Objects whose columns overlap [x_min, x_max], chunk by chunk in load order"""
+        first = int(x_min // GRID_SIZE)
+        last = int(x_max // GRID_SIZE)
+        # An object's right edge can sit in the first column of the next chunk
+        found = []
+        for index in range(max(0, (first - 1) // CHUNK_COLUMNS), last // CHUNK_COLUMNS + 1):
+            found.extend(self._chunk(index).query(x_min, x_max))
+        return found
+
+    def near_player(self, player, margin=GRID_SIZE):
+        """Collision candidates for the player's next step"""
+        return self.query(
+            player.display_x - margin,
+            player.display_x + player.speed + player.width + margin
+        )
+
+    def visible(self, camera_x, screen_width):
+        return self.query(camera_x, camera_x + screen_width)
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self.chunks.values())
+
+
+def main(argv):
+    # The game imports this module for endless mode, so argparse stays off its startup path
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m main.level_generator",
+                                     description="Generate a level from seeded chunks.")
+    parser.add_argument("--seed", type=int, metavar="N", default=0)
+    parser.add_argument("--chunks", type=int, metavar="N", default=10)
+    parser.add_argument("--out", help="write the level to this JSON file")
+    parser.add_argument("--verify", action="store_true", help="check the level can be completed")
+    args = parser.parse_args(argv[1:])
+    seed, chunks = args.seed, args.chunks
+
+    level = ChunkGenerator(seed).level(chunks)
+    print(f"Seed {seed}: {chunks} chunks, {len(level)} objects")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump([level], f, indent=2)
+        print(f"Wrote {args.out}")
+
+    if args.verify:
+        from main.simulation.solver import LevelSolver
+        max_ticks = chunks * CHUNK_COLUMNS * GRID_SIZE // PLAYER_SPEED * 2
+        result = LevelSolver(level, max_ticks=max_ticks).search()
+        if not result.completed:
+            print("[FAIL] no solution found")
+            return 1
+        print(f"[OK] beatable in {result.ticks} ticks with {len(result.jumps)} jumps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,169 @@
+"""
+Level Index
+Cached manifest of every level in a levels directory, for the level select screen.
+
+Every JSON level file and compiled pack in the directory is summarised once:
+each level's name, length in grid columns, object counts by type and content
+hash. The summaries are cached in MANIFEST_NAME next to the level files.
+On later starts a file whose size and mtime are unchanged is not opened at
+all; a file that was touched but whose bytes hash the same keeps its
+summaries, and only files whose content changed are parsed again.
+
+Usage (from the src directory):
+    python -m main.level_index [levels_dir]
+"""
+
+import os
+import sys
+import json
+import hashlib
+from collections import namedtuple
+
+from main.level_pack import LevelPack, PACK_EXTENSION, level_hash
+from main.objects.level_store import grid_cells
+
+LEVELS_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_NAME = ".level_index.json"
+MANIFEST_VERSION = 2
+
+LevelEntry = namedtuple("LevelEntry", ["path", "index", "name", "length", "objects", "counts", "hash"])
+
+
+def is_level_file(name):
+    # Hidden files (the manifest among them) are never levels
+    return not name.startswith(".") and (name.endswith(".json") or name.endswith(PACK_EXTENSION))
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def summarize(level_data):
+    """(length in grid columns, object count, {type: count}) for a list of object dicts"""
+    length = 0
+    counts = {}
+    for i, obj_data in enumerate(level_data):
+        if not isinstance(obj_data, dict):
+            raise ValueError(f"object {i} is not an object dict")
+        name = obj_data.get("object", "Block")
+        counts[name] = counts.get(name, 0) + 1
+        # Positions and sizes must be whole cells, as large levels and packs store them
+        x, _, width, _ = grid_cells(obj_data, i)
+        length = max(length, x + width)
+    return length, len(level_data), counts
+
+
+def _read_file_levels(path):
+    """Every level in a level file; raises ValueError if it is not one"""
+    if path.endswith(PACK_EXTENSION):
+        with LevelPack(path) as pack:
+            return [pack.level(i) for i in range(len(pack))]
+    with open(path) as f:
+        levels = json.load(f)
+    if not isinstance(levels, list) or not all(isinstance(level, list) for level in levels):
+        raise ValueError("not a list of levels")
+    return levels
+
+
+def level_name(file_name, index):
+    stem = os.path.splitext(file_name)[0].replace("_", " ").title()
+    return f"{stem} {index + 1}"
+
+
+class LevelIndex:
+    def __init__(self, directory=LEVELS_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        # File name -> {"mtime_ns", "size", "hash", "levels": [summary dicts]}
+        self.files = {}
+        self.entries = []
+
+    def load(self):
+        """Bring the manifest up to date with the directory; returns the LevelEntry list"""
+        cached = self._read_manifest()
+        files = {}
+        changed = False
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if is_level_file(name))
+        except FileNotFoundError as e:
+            print(f"Error indexing levels: {e}")
+            names = []
+
+        for name in names:
+            path = os.path.join(self.directory, name)
+            stat = os.stat(path)
+            record = cached.get(name)
+            if record is not None and record["mtime_ns"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+                files[name] = record
+                continue
+
+            changed = True
+            digest = file_hash(path)
+            if record is None or record["hash"] != digest:
+                try:
+                    levels = self._summarize_file(name, path)
+                except (json.JSONDecodeError, ValueError, TypeError, UnicodeDecodeError) as e:
+                    # Cached with no levels, so it is not read again until it changes
+                    print(f"Skipping {name}: {e}")
+                    levels = []
+                record = {"hash": digest, "levels": levels}
+            record["mtime_ns"] = stat.st_mtime_ns
+            record["size"] = stat.st_size
+            files[name] = record
+
+        self.files = files
+        if changed or files.keys() != cached.keys():
+            self._write_manifest()
+        self.entries = [
+            LevelEntry(os.path.join(self.directory, name), i, level["name"], level["length"],
+                       level["objects"], level["counts"], level["hash"])
+            for name, record in files.items()
+            for i, level in enumerate(record["levels"])
+        ]
+        return self.entries
+
+    def _summarize_file(self, name, path):
+        summaries = []
+        for i, level_data in enumerate(_read_file_levels(path)):
+            length, objects, counts = summarize(level_data)
+            summaries.append({"name": level_name(name, i), "length": length, "objects": objects,
+                              "counts": counts, "hash": level_hash(level_data)})
+        return summaries
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("files", {})
+
+    def _write_manifest(self):
+        # Written beside and then swapped in, so a crash never leaves half a manifest
+        temp_path = self.manifest_path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({"version": MANIFEST_VERSION, "files": self.files}, f)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"Could not write level index: {e}")
+
+
+def main(argv):
+    directory = argv[1] if len(argv) > 1 else LEVELS_DIR
+    entries = LevelIndex(directory).load()
+    for number, entry in enumerate(entries, 1):
+        counts = ", ".join(f"{name} {count}" for name, count in sorted(entry.counts.items()))
+        print(f"{number:>4}  {entry.name:<24} {entry.length:>6} cols {entry.objects:>7} objects  {counts}")
+    print(f"{len(entries)} levels in {directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
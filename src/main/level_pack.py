@@ -0,0 +1,164 @@
+"""
+Compiled Level Packs
+Binary form of the JSON level files, read lazily through mmap.
+
+Layout (little-endian):
+    header      magic "GEOP", version u16, type count u16, level count u32
+    type table  per type: name length u8, UTF-8 name
+    level table per level: byte offset u64, object count u32
+    records     per object: type id u16, x i32, y i32, width i32, height i32, param f64
+
+Opening a pack reads only the header and tables; level(n) decodes just that
+level's records and returns the same dicts ObjectFactory.create accepts, or
+store(n) reads them straight into a columnar LevelStore.
+"""
+
+import os
+import json
+import math
+import hashlib
+import mmap
+import struct
+
+import numpy as np
+from main.objects.level_store import LevelStore, RECORD_DTYPE, PARAM_FIELDS, grid_cells
+
+PACK_EXTENSION = ".geopack"
+MAGIC = b"GEOP"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHI")
+LEVEL_ENTRY = struct.Struct("<QI")
+RECORD = struct.Struct("<Hiiiid")
+
+_NO_PARAM = float("nan")
+
+
+def compile_levels(levels):
+    """Encode a list of levels (lists of object dicts) into pack bytes"""
+    type_ids = {}
+    bodies = []
+    for level_number, level in enumerate(levels):
+        body = bytearray()
+        for i, obj_data in enumerate(level):
+            name = obj_data.get("object", "Block")
+            type_id = type_ids.setdefault(name, len(type_ids))
+            param_field = PARAM_FIELDS.get(name)
+            param = obj_data.get(param_field, _NO_PARAM) if param_field else _NO_PARAM
+            try:
+                cells = grid_cells(obj_data, i)
+            except ValueError as e:
+                raise ValueError(f"level {level_number}, {e}") from None
+            body += RECORD.pack(type_id, *cells, param)
+        bodies.append(bytes(body))
+
+    type_table = bytearray()
+    for name in type_ids:
+        encoded = name.encode("utf-8")
+        type_table += struct.pack("<B", len(encoded)) + encoded
+
+    offset = HEADER.size + len(type_table) + LEVEL_ENTRY.size * len(bodies)
+    level_table = bytearray()
+    for body in bodies:
+        level_table += LEVEL_ENTRY.pack(offset, len(body) // RECORD.size)
+        offset += len(body)
+
+    header = HEADER.pack(MAGIC, VERSION, len(type_ids), len(bodies))
+    return header + bytes(type_table) + bytes(level_table) + b"".join(bodies)
+
+
+def compile_json_pack(input_file, output_file):
+    """Compile a JSON level file into a binary pack; returns (levels, objects)"""
+    with open(input_file) as f:
+        levels = json.load(f)
+    with open(output_file, "wb") as f:
+        f.write(compile_levels(levels))
+    return len(levels), sum(len(level) for level in levels)
+
+
+def level_hash(level_data):
+    """Content hash of a level, so replays and the level index notice edited levels"""
+    canonical = json.dumps(list(level_data), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def read_levels(path):
+    """All levels from either a JSON level file or a compiled pack"""
+    if path.endswith(PACK_EXTENSION):
+        with LevelPack(path) as pack:
+            return [pack.level(i) for i in range(len(pack))]
+    with open(path) as f:
+        return json.load(f)
+
+
+class LevelPack:
+    """Read-only view of a compiled pack; levels are decoded on demand"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is not a version {VERSION} level pack")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, type_count, level_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} level pack")
+
+        try:
+            self._read_tables(type_count, level_count)
+        except (struct.error, IndexError, UnicodeDecodeError):
+            self.close()
+            raise ValueError(f"{path} is truncated or corrupt") from None
+
+    def _read_tables(self, type_count, level_count):
+        pos = HEADER.size
+        self.type_names = []
+        for _ in range(type_count):
+            length = self._map[pos]
+            if pos + 1 + length > len(self._map):
+                raise IndexError(pos)
+            self.type_names.append(self._map[pos + 1:pos + 1 + length].decode("utf-8"))
+            pos += 1 + length
+
+        self.levels = [LEVEL_ENTRY.unpack_from(self._map, pos + i * LEVEL_ENTRY.size)
+                       for i in range(level_count)]
+        for offset, count in self.levels:
+            if offset + count * RECORD.size > len(self._map):
+                raise IndexError(offset)
+
+    def __len__(self):
+        return len(self.levels)
+
+    def object_count(self, level):
+        return self.levels[level][1]
+
+    def level(self, level):
+        """Decode one level into object dicts"""
+        offset, count = self.levels[level]
+        records = self._map[offset:offset + count * RECORD.size]
+        names = self.type_names
+        objects = []
+        for type_id, x, y, width, height, param in RECORD.iter_unpack(records):
+            name = names[type_id]
+            obj_data = {"object": name, "x": x, "y": y, "width": width, "height": height}
+            if not math.isnan(param):
+                obj_data[PARAM_FIELDS[name]] = param
+            objects.append(obj_data)
+        return objects
+
+    def store(self, level):
+        """Load one level as a LevelStore without building per-object dicts"""
+        offset, count = self.levels[level]
+        # Copy the records out so no array keeps the map open
+        records = np.frombuffer(self._map[offset:offset + count * RECORD.size], dtype=RECORD_DTYPE)
+        return LevelStore(records, self.type_names)
+    
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,94 @@
+"""
+Level Preloader
+Reads and builds levels on a background thread while the level select screen is up.
+
+The highlighted level is parsed and prepared (objects, indexes, render cache)
+by GameState.prepare_level on one worker thread, so choosing it only has to
+install the result. Anything that draws, the level's sprites and first render
+chunks, waits for install_level on the main thread, since the sprite atlas is
+shared with the screen being drawn. A prepared level holds live objects, so it is
+handed out once; choosing the same level again prepares it afresh.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from main.level_pack import level_hash
+from main.constants import PRELOAD_LIMIT
+
+
+class LoadJob:
+    """One level (a LevelEntry from the level index) being prepared in the background"""
+    def __init__(self, entry):
+        self.entry = entry
+        self.path = entry.path
+        self.level = entry.index
+        self.done = 0
+        self.total = 0
+        self.level_hash = None
+        self.future = None
+
+    def report(self, done, total):
+        self.done = done
+        self.total = total
+
+    @property
+    def ready(self):
+        return self.future.done()
+
+    @property
+    def fraction(self):
+        """Share of the level's objects built so far, 0.0 to 1.0"""
+        if self.ready:
+            return 1.0
+        return self.done / self.total if self.total else 0.0
+
+    def result(self):
+        """The PreparedLevel, waiting for it if need be"""
+        return self.future.result()
+
+
+class LevelPreloader:
+    def __init__(self, game_state, limit=PRELOAD_LIMIT):
+        self.game_state = game_state
+        self.limit = limit
+        self.jobs = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-preload")
+
+    def _prepare(self, job):
+        level_data = self.game_state.read_level(job.level, job.path)
+        prepared = self.game_state.prepare_level(level_data, job.report)
+        # Hashing a large level for its replay takes as long as a frame or more
+        job.level_hash = level_hash(level_data)
+        return prepared
+
+    def request(self, entry):
+        """Start preparing entry's level unless it is already queued or ready; returns its job"""
+        key = (entry.path, entry.index)
+        job = self.jobs.get(key)
+        if job is not None:
+            self.jobs.move_to_end(key)
+            return job
+
+        job = self.jobs[key] = LoadJob(entry)
+        job.future = self._executor.submit(self._prepare, job)
+        while len(self.jobs) > self.limit:
+            # Scrolling past a level drops its job; one already running just finishes unused
+            _, stale = self.jobs.popitem(last=False)
+            stale.future.cancel()
+        return job
+
+    def take(self, entry):
+        """The job for entry's level, removed from the preloader so its objects are used only once"""
+        job = self.request(entry)
+        del self.jobs[(entry.path, entry.index)]
+        return job
+
+    def clear(self):
+        for job in self.jobs.values():
+            job.future.cancel()
+        self.jobs.clear()
+
+    def shutdown(self):
+        self.clear()
+        self._executor.shutdown(wait=False)
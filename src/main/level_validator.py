@@ -0,0 +1,338 @@
+"""
+Level Validator
+Lints level files and packs without loading them whole.
+
+JSON level files are read with a streaming parser that holds one object at a
+time, so memory stays bounded by the largest level's rects rather than by the
+file. Compiled packs are read a level at a time through mmap. Checks:
+
+    schema          objects that are not dicts, unknown types or fields, bad values
+    duplicate       two identical objects in the same place
+    overlap         two objects of the same type overlapping
+    spike-in-block  a spike overlapping a block, where it can never be seen or hit
+    unreachable     objects behind the start or inside the floor; with --reach,
+                    levels the solver cannot get through and how far it got
+
+Files are checked in parallel across a process pool.
+
+Usage (from the src directory):
+    python -m main.level_validator <file_or_dir> [...] [--workers N] [--reach] [--strict] [--json]
+
+Exits non-zero on any error (and with --strict, any warning).
+"""
+
+import os
+import sys
+import argparse
+import json
+import math
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from main.objects.object_factory import ObjectFactory
+from main.objects.level_store import PARAM_FIELDS
+from main.level_pack import LevelPack, PACK_EXTENSION
+from main.level_index import is_level_file
+from main.constants import GRID_SIZE
+
+ERROR = "error"
+WARNING = "warning"
+
+KNOWN_FIELDS = {"object", "x", "y", "width", "height"} | set(PARAM_FIELDS.values())
+# The player starts one column in and only moves right; the floor top is row 11 (y=550)
+START_COLUMN = 1
+FLOOR_ROW = 11
+# Columns per bucket when looking for overlapping objects
+BUCKET_COLUMNS = 8
+READ_SIZE = 1 << 16
+
+Issue = namedtuple("Issue", ["path", "level", "index", "severity", "code", "message"])
+FileReport = namedtuple("FileReport", ["path", "levels", "objects", "issues"])
+
+
+class _Reader:
+    """Character source over a file that keeps only the unread part in memory"""
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or "" at the end of the file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, chars):
+        char = self.peek()
+        if char == "" or char not in chars:
+            raise ValueError(f"expected one of {chars!r} but found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next JSON value, reading more of the file until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof or not self._fill():
+                    raise
+                continue
+            # A number may continue into the next chunk
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _stream_json(path):
+    with open(path) as f:
+        reader = _Reader(f)
+        reader.expect("[")
+        if reader.peek() == "]":
+            return
+        level = 0
+        while True:
+            reader.expect("[")
+            yield level, None
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield level, reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+            level += 1
+            if reader.expect(",]") == "]":
+                return
+
+
+def _stream_pack(path):
+    with LevelPack(path) as pack:
+        for level in range(len(pack)):
+            yield level, None
+            for obj_data in pack.level(level):
+                yield level, obj_data
+
+
+def stream_objects(path):
+    """(level, None) as each level opens, then (level, obj_data) for each of its objects"""
+    if path.endswith(PACK_EXTENSION):
+        return _stream_pack(path)
+    return _stream_json(path)
+
+
+def _whole(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return math.isfinite(value) and value == int(value)
+
+
+def _check_object(obj_data, issue):
+    """Schema checks for one object; returns its (type, x, y, width, height, param) or None"""
+    if not isinstance(obj_data, dict):
+        issue(ERROR, "schema", f"expected an object, found {type(obj_data).__name__}")
+        return None
+
+    name = obj_data.get("object")
+    if name is None:
+        issue(WARNING, "schema", "no \"object\" type; it loads as a Block")
+        name = "Block"
+    elif name not in ObjectFactory.OBJECT_MAP:
+        issue(ERROR, "schema", f"unknown object type {name!r}; it would load as a Block")
+        name = "Block"
+
+    for key in obj_data:
+        if key not in KNOWN_FIELDS:
+            issue(WARNING, "schema", f"unknown field {key!r}")
+
+    values = []
+    for key, default in (("x", 0), ("y", 0), ("width", 1), ("height", 1)):
+        value = obj_data.get(key, default)
+        if not _whole(value):
+            issue(ERROR, "schema", f"{key}={value!r} is not a whole grid cell")
+            return None
+        if key in ("width", "height") and value <= 0:
+            issue(ERROR, "schema", f"{key}={value!r} must be positive")
+            return None
+        values.append(int(value))
+
+    param = None
+    param_field = PARAM_FIELDS.get(name)
+    if param_field in obj_data:
+        param = obj_data[param_field]
+        if isinstance(param, bool) or not isinstance(param, (int, float)) or not param > 0 or math.isinf(param):
+            issue(ERROR, "schema", f"{param_field}={param!r} must be a positive number")
+            return None
+    return (name, *values, param)
+
+
+class _LevelChecker:
+    """Accumulates one level's objects and checks how they sit against each other"""
+    def __init__(self, report, level):
+        self.report = report
+        self.level = level
+        self.objects = []
+        self.buckets = {}
+        self.seen = {}
+
+    def add(self, index, obj):
+        name, x, y, width, height, _ = obj
+        issue = lambda severity, code, message: self.report(self.level, index, severity, code, message)
+
+        first = self.seen.setdefault(obj, index)
+        if first != index:
+            issue(WARNING, "duplicate", f"{name} at ({x}, {y}) duplicates object {first}")
+            return
+
+        if x + width <= START_COLUMN:
+            issue(WARNING, "unreachable", f"{name} at ({x}, {y}) is behind the start")
+        elif y >= FLOOR_ROW:
+            issue(WARNING, "unreachable", f"{name} at ({x}, {y}) is inside the floor")
+
+        first_bucket = x // BUCKET_COLUMNS
+        for bucket in range(first_bucket, (x + width - 1) // BUCKET_COLUMNS + 1):
+            for other_index in self.buckets.get(bucket, ()):
+                other = self.objects[other_index][1]
+                # Report each pair only in the first bucket both share
+                if max(first_bucket, other[1] // BUCKET_COLUMNS) == bucket and self._overlaps(obj, other):
+                    self._pair(issue, obj, other, self.objects[other_index][0])
+            self.buckets.setdefault(bucket, []).append(len(self.objects))
+        self.objects.append((index, obj))
+
+    @staticmethod
+    def _overlaps(a, b):
+        return a[1] < b[1] + b[3] and b[1] < a[1] + a[3] and a[2] < b[2] + b[4] and b[2] < a[2] + a[4]
+
+    @staticmethod
+    def _pair(issue, obj, other, other_index):
+        names = {obj[0], other[0]}
+        if names == {"Spike", "Block"}:
+            issue(ERROR, "spike-in-block", f"{obj[0]} at ({obj[1]}, {obj[2]}) and {other[0]} (object {other_index}) "
+                                           "overlap, putting the spike inside a block")
+        elif obj[0] == other[0]:
+            issue(WARNING, "overlap", f"{obj[0]} at ({obj[1]}, {obj[2]}) overlaps object {other_index}")
+
+
+def _check_reach(level, level_data, report):
+    # The solver pulls in pygame through the headless simulation, so it is only imported when asked for
+    from main.simulation.solver import LevelSolver
+    solver = LevelSolver(level_data)
+    if not solver.search().completed:
+        column = solver.furthest // GRID_SIZE
+        report(level, None, ERROR, "unreachable",
+               f"no jump sequence completes the level; nothing past column {column} is reached")
+
+
+def validate_file(path, reach=False):
+    """FileReport for one level file or pack"""
+    issues = []
+    levels = objects = 0
+
+    def report(level, index, severity, code, message):
+        issues.append(Issue(path, level, index, severity, code, message))
+
+    def finish(checker, level_data):
+        if checker is not None and reach and checker.objects:
+            _check_reach(checker.level, level_data, report)
+
+    checker = None
+    level_data = []
+    index = 0
+    try:
+        for level, obj_data in stream_objects(path):
+            if obj_data is None:
+                finish(checker, level_data)
+                checker = _LevelChecker(report, level)
+                level_data = []
+                index = 0
+                levels += 1
+                continue
+            issue = lambda severity, code, message: report(level, index, severity, code, message)
+            obj = _check_object(obj_data, issue)
+            if obj is not None:
+                checker.add(index, obj)
+                if reach:
+                    level_data.append(obj_data)
+            index += 1
+            objects += 1
+        finish(checker, level_data)
+    except (ValueError, UnicodeDecodeError, OSError) as e:
+        report(None, None, ERROR, "parse", str(e))
+    return FileReport(path, levels, objects, issues)
+
+
+def _expand_paths(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if is_level_file(name))
+        else:
+            files.append(path)
+    return files
+
+
+def validate_paths(paths, workers=None, reach=False):
+    """FileReports for every file (directories are expanded), checked across a process pool"""
+    files = _expand_paths(paths)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) == 1:
+        return [validate_file(path, reach) for path in files]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(validate_file, files, [reach] * len(files)))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m main.level_validator",
+                                     description="Check level files for structural problems.")
+    parser.add_argument("paths", nargs="+", metavar="file_or_dir")
+    parser.add_argument("--workers", type=int, metavar="N")
+    parser.add_argument("--reach", action="store_true", help="also check each level can be completed")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv[1:])
+
+    reports = validate_paths(args.paths, args.workers, args.reach)
+    issues = [issue for r in reports for issue in r.issues]
+    errors = sum(issue.severity == ERROR for issue in issues)
+    warnings = len(issues) - errors
+
+    if args.json:
+        print(json.dumps({
+            "files": [{"path": r.path, "levels": r.levels, "objects": r.objects,
+                       "issues": [issue._asdict() for issue in r.issues]} for r in reports],
+            "errors": errors,
+            "warnings": warnings,
+        }, indent=4))
+    else:
+        for issue in issues:
+            where = issue.path
+            if issue.level is not None:
+                where += f" level {issue.level}"
+            if issue.index is not None:
+                where += f" object {issue.index}"
+            print(f"{where}: {issue.severity}: [{issue.code}] {issue.message}")
+        levels = sum(r.levels for r in reports)
+        objects = sum(r.objects for r in reports)
+        print(f"\n{len(reports)} files, {levels} levels, {objects} objects: {errors} errors, {warnings} warnings")
+
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -1,75 +1,158 @@
 import pygame
 from main.constants import *
 
+LEVEL_SELECT_BG = (30, 20, 50)
+
 
 class MenuSystem:
-    def __init__(self, display):
+    def __init__(self, display, levels=()):
         self.display = display
+        # LevelEntry per selectable level, from the level index
+        self.levels = levels
         self.selected_level = 0
-        self.max_levels = 4
         self.state = MENU
+        # (state, selected_level) currently on screen; None forces a full redraw
+        self._drawn = None
+    
+    def invalidate(self):
+        """Force a full redraw, e.g. after another screen has drawn over the menu"""
+        self._drawn = None
+    
+    @property
+    def max_levels(self):
+        return len(self.levels)
+    
+    @property
+    def page(self):
+        return self.selected_level // LEVELS_PER_PAGE
+    
+    @property
+    def page_count(self):
+        return max(1, -(-self.max_levels // LEVELS_PER_PAGE))
+    
+    def is_idle(self):
+        """True when the screen already shows the current menu state"""
+        return self._drawn == (self.state, self.selected_level)
         
     def handle_event(self, event):
+        if event.type == pygame.VIDEOEXPOSE:
+            self.invalidate()
+        
         if self.state == MENU:
             if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
                 self.state = LEVEL_SELECT
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_e:
+                return ENDLESS_LEVEL
         
         elif self.state == LEVEL_SELECT:
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
+                if event.key == pygame.K_ESCAPE:
+                    self.state = MENU
+                elif not self.levels:
+                    pass
+                elif event.key == pygame.K_UP:
                     self.selected_level = (self.selected_level - 1) % self.max_levels
                 elif event.key == pygame.K_DOWN:
                     self.selected_level = (self.selected_level + 1) % self.max_levels
+                elif event.key in (pygame.K_LEFT, pygame.K_PAGEUP):
+                    self.selected_level = max(self.selected_level - LEVELS_PER_PAGE, 0)
+                elif event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN):
+                    self.selected_level = min(self.selected_level + LEVELS_PER_PAGE, self.max_levels - 1)
                 elif event.key == pygame.K_RETURN:
                     return self.selected_level
-                elif event.key == pygame.K_ESCAPE:
-                    self.state = MENU
         return None
     
     def update(self):
-        if self.state == MENU:
+        if self.is_idle():
+            return
+        
+        if (self._drawn is not None and self._drawn[0] == self.state == LEVEL_SELECT
+                and self._drawn[1] // LEVELS_PER_PAGE == self.page):
+            # Only the highlight moved within the page: repaint the old and new rows
+            rects = [self._draw_level_row(self._drawn[1]), self._draw_level_row(self.selected_level)]
+            pygame.display.update(rects)
+        elif self.state == MENU:
             self._draw_main_menu()
         elif self.state == LEVEL_SELECT:
             self._draw_level_select()
         
+        self._drawn = (self.state, self.selected_level)
+        
     def _draw_main_menu(self):
         self.display.surface.fill(DARK_BLUE)
+        text = self.display.text_cache
         
-        title_font = pygame.font.Font(None, 80)
-        subtitle_font = pygame.font.Font(None, 40)
-        
-        title = title_font.render("GEO GAME", True, BLUE)
-        subtitle = subtitle_font.render("Press ENTER to Start", True, WHITE)
+        title = text.render("GEO GAME", 80, BLUE)
+        subtitle = text.render("Press ENTER to Start", 40, WHITE)
+        endless = text.render("Press E for Endless Mode", 30, GRAY)
         
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 200))
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, 350))
+        endless_rect = endless.get_rect(center=(SCREEN_WIDTH // 2, 410))
         
         self.display.surface.blit(title, title_rect)
         self.display.surface.blit(subtitle, subtitle_rect)
+        self.display.surface.blit(endless, endless_rect)
         
         pygame.display.flip()
     
     def _draw_level_select(self):
-        self.display.surface.fill((30, 20, 50))
-        
-        title_font = pygame.font.Font(None, 60)
-        level_font = pygame.font.Font(None, 40)
+        self.display.surface.fill(LEVEL_SELECT_BG)
+        text = self.display.text_cache
         
-        title = title_font.render("SELECT LEVEL", True, PURPLE)
+        title = text.render("SELECT LEVEL", 60, PURPLE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 80))
         self.display.surface.blit(title, title_rect)
         
-        for i in range(self.max_levels):
-            color = (255, 200, 100) if i == self.selected_level else GRAY
-            level_text = level_font.render(f"Level {i + 1}", True, color)
-            level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, 200 + i * 60))
-            
-            if i == self.selected_level:
-                pygame.draw.rect(self.display.surface, (80, 50, 120), level_rect.inflate(20, 10), 3, 5)
-            
-            self.display.surface.blit(level_text, level_rect)
-        
-        hint = pygame.font.Font(None, 30).render("UP/DOWN: Navigate | ENTER: Select | ESC: Back", True, (100, 100, 100))
+        # Only the current page is drawn, so long level lists cost no more per frame
+        first = self.page * LEVELS_PER_PAGE
+        for i in range(first, min(first + LEVELS_PER_PAGE, self.max_levels)):
+            self._draw_level_row(i)
+        
+        if not self.levels:
+            empty = text.render("No levels found", 40, GRAY)
+            self.display.surface.blit(empty, empty.get_rect(center=(SCREEN_WIDTH // 2, 250)))
+        elif self.page_count > 1:
+            page = text.render(f"Page {self.page + 1}/{self.page_count}", 26, GRAY)
+            self.display.surface.blit(page, page.get_rect(center=(SCREEN_WIDTH // 2, 480)))
+        
+        hint = text.render("UP/DOWN: Navigate | LEFT/RIGHT: Page | ENTER: Select | ESC: Back", 26, (100, 100, 100))
         self.display.surface.blit(hint, hint.get_rect(center=(SCREEN_WIDTH // 2, 520)))
         
         pygame.display.flip()
+    
+    def draw_loading(self, name, fraction):
+        """Progress screen shown while a level that wasn't preloaded in time finishes building"""
+        self.display.surface.fill(LEVEL_SELECT_BG)
+        label = self.display.text_cache.render(f"Loading {name}...", 50, WHITE)
+        self.display.surface.blit(label, label.get_rect(center=(SCREEN_WIDTH // 2, 250)))
+        
+        bar = pygame.Rect(0, 0, 400, 30)
+        bar.center = (SCREEN_WIDTH // 2, 330)
+        filled = bar.copy()
+        filled.width = int(bar.width * fraction)
+        pygame.draw.rect(self.display.surface, PURPLE, filled)
+        pygame.draw.rect(self.display.surface, WHITE, bar, 2)
+        
+        pygame.display.flip()
+        self._drawn = None
+    
+    def _draw_level_row(self, i):
+        """Draw one level entry over its own background band; returns the band rect"""
+        entry = self.levels[i]
+        center_y = 170 + (i % LEVELS_PER_PAGE) * 60
+        band = pygame.Rect(0, center_y - 30, SCREEN_WIDTH, 60)
+        self.display.surface.fill(LEVEL_SELECT_BG, band)
+        
+        color = (255, 200, 100) if i == self.selected_level else GRAY
+        level_text = self.display.text_cache.render(entry.name, 36, color)
+        level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, center_y - 7))
+        detail = self.display.text_cache.render(f"{entry.length} columns | {entry.objects} objects", 22, GRAY)
+        detail_rect = detail.get_rect(center=(SCREEN_WIDTH // 2, center_y + 17))
+        
+        if i == self.selected_level:
+            pygame.draw.rect(self.display.surface, (80, 50, 120), level_rect.union(detail_rect).inflate(20, 6), 3, 5)
+        
+        self.display.surface.blit(level_text, level_rect)
+        self.display.surface.blit(detail, detail_rect)
+        return band
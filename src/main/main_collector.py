@@ -1,16 +1,90 @@
+import os
+import time
+import random
 from main.game_state import GameState
 from main.screenDir.screen_file import Display
+from main.simulation.replay import ReplayRecorder
+from main.level_preloader import LevelPreloader
+from main.level_index import LevelIndex
+from main.hot_reload import LevelWatcher
 from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE
 
 
 class Main:
-    def __init__(self):
+    def __init__(self, controller=None):
         self.display = Display(SCREEN_WIDTH, SCREEN_HEIGHT, WHITE)
-        self.game_state = GameState(self.display)
+        self.game_state = GameState(self.display, controller)
+        self.recorder = None
+        self.preloader = LevelPreloader(self.game_state)
+        self._levels = None
+        # Edits saved to the playing level's file are patched in while it runs
+        self.watcher = LevelWatcher()
+    
+    @property
+    def levels(self):
+        """Every level in the levels directory, from the cached manifest, read on first use"""
+        if self._levels is None:
+            self._levels = LevelIndex().load()
+        return self._levels
+    
+    @levels.setter
+    def levels(self, levels):
+        """Use another level index (e.g. one built from a different directory)"""
+        self._levels = levels
+    
+    def preload(self, level):
+        """Start building level in the background (e.g. while it is highlighted)"""
+        self.preloader.request(self.levels[level])
+    
+    def start_level(self, level):
+        """The LoadJob for level; already ready if it was preloaded"""
+        return self.preloader.take(self.levels[level])
+    
+    def finish_level(self, job):
+        self.game_state.json_file = job.path
+        self.game_state.install_level(job.result(), job.level)
+        self.watcher.watch(job.path, job.level)
+        # Every run is recorded from the level start so it can be saved as a replay
+        seed = random.getrandbits(32)
+        self.recorder = ReplayRecorder(self.game_state, self.game_state.json_file, job.level, seed,
+                                       job.level_hash)
     
     def load_level(self, level):
-        self.game_state.load_level(level)
+        self.finish_level(self.start_level(level))
+    
+    def load_endless(self):
+        # Endless runs are generated rather than loaded, so they are not recorded
+        self.game_state.load_endless(random.getrandbits(32))
+        self.watcher.watch(None, 0)
+        self.recorder = None
+    
+    def stop_recording(self):
+        """Practice checkpoints are not part of the input stream, so they end the recording"""
+        self.recorder = None
+    
+    def save_recording(self, path):
+        if self.recorder is None:
+            return None
+        recording = self.recorder.finish()
+        recording.save(path)
+        return recording
+    
+    def reload_level(self, level_data):
+        """Patch an edited copy of the playing level in place"""
+        start = time.perf_counter()
+        diff = self.game_state.patch_level(level_data)
+        elapsed = (time.perf_counter() - start) * 1000
+        # The recording and any prepared copies of this file describe the old layout
+        self.recorder = None
+        self.preloader.clear()
+        print(f"Reloaded {os.path.basename(self.watcher.path)}: {len(diff.added)} added, "
+              f"{len(diff.removed)} removed, {len(diff.changed)} changed in {elapsed:.1f} ms")
     
     def update(self):
+        level_data = self.watcher.poll()
+        if level_data is not None:
+            self.reload_level(level_data)
         self.game_state.update()
+        if self.recorder is not None:
+            self.recorder.record_tick()
         self.game_state.draw()
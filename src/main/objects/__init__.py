@@ -1,11 +1,31 @@
-from main.objects.game_object import GameObject, SolidObject, HazardObject, TriggerObject, PortalObject
-from main.objects.object_types import Block, Spike, JumpPad, JumpOrb, GravityPortal, SpeedPortal
-from main.objects.object_factory import ObjectFactory
-from main.objects.floor_terrain import FloorTerrain
-from main.objects.particle import ParticleSystem
-
-__all__ = [
-    'GameObject', 'SolidObject', 'HazardObject', 'TriggerObject', 'PortalObject',
-    'Block', 'Spike', 'JumpPad', 'JumpOrb', 'GravityPortal', 'SpeedPortal',
-    'ObjectFactory', 'FloorTerrain', 'ParticleSystem'
-]
+# Exports load on first access, so importing one object module does not import them all
+import importlib
+
+_EXPORTS = {
+    'GameObject': 'main.objects.game_object',
+    'SolidObject': 'main.objects.game_object',
+    'HazardObject': 'main.objects.game_object',
+    'TriggerObject': 'main.objects.game_object',
+    'PortalObject': 'main.objects.game_object',
+    'Block': 'main.objects.object_types',
+    'Spike': 'main.objects.object_types',
+    'JumpPad': 'main.objects.object_types',
+    'JumpOrb': 'main.objects.object_types',
+    'GravityPortal': 'main.objects.object_types',
+    'SpeedPortal': 'main.objects.object_types',
+    'ObjectFactory': 'main.objects.object_factory',
+    'FloorTerrain': 'main.objects.floor_terrain',
+    'ParticleSystem': 'main.objects.particle',
+    'SpatialIndex': 'main.objects.spatial_index',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,93 @@
+"""
+Swept Collision
+Continuous AABB tests along the player's motion for the current tick.
+
+The player moves from (prev_display_x, prev_y) to (display_x, y) each tick.
+Testing only the end position lets fast players skip thin objects or clip
+corners, so collisions are found from the time of impact along that motion
+instead; t = 0 is the previous position and t = 1 the current one.
+
+The motion is captured once per tick in the player's PlayerMotion and shared
+by every object test, so no per-object rects are built.
+"""
+
+# How far below a block's top the player's bottom may be and still land on it
+LANDING_TOLERANCE = 5
+
+
+class PlayerMotion:
+    """The player's world box at the start of the tick and its displacement over it"""
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.dx = 0.0
+        self.dy = 0.0
+        self.width = 0
+        self.height = 0
+    
+    def update(self, player):
+        """Capture the tick's motion in place; called once the player has moved"""
+        self.x = player.prev_display_x
+        self.y = player.prev_y
+        self.dx = player.display_x - self.x
+        self.dy = player.y - self.y
+        self.width = player.width
+        self.height = player.height
+
+
+def sweep(motion, rect):
+    """(entry, exit) times in [0, 1] while the moving box overlaps rect, or None"""
+    # Each axis overlaps while low - size < position < high; intersect the two time spans
+    t_entry = 0.0
+    t_exit = 1.0
+
+    start = motion.x
+    delta = motion.dx
+    low = rect.left - motion.width - start
+    high = rect.right - start
+    if delta == 0:
+        if not low < 0 < high:
+            return None
+    else:
+        near = low / delta
+        far = high / delta
+        if near > far:
+            near, far = far, near
+        if near > t_entry:
+            t_entry = near
+        if far < t_exit:
+            t_exit = far
+        if t_entry >= t_exit:
+            return None
+
+    start = motion.y
+    delta = motion.dy
+    low = rect.top - motion.height - start
+    high = rect.bottom - start
+    if delta == 0:
+        if not low < 0 < high:
+            return None
+    else:
+        near = low / delta
+        far = high / delta
+        if near > far:
+            near, far = far, near
+        if near > t_entry:
+            t_entry = near
+        if far < t_exit:
+            t_exit = far
+        if t_entry >= t_exit:
+            return None
+    return t_entry, t_exit
+
+
+def bottom_on_arrival(motion, rect):
+    """The moving box's bottom edge at the moment it first overlaps rect horizontally"""
+    x0 = motion.x
+    dx = motion.dx
+    t = 0.0
+    if dx > 0 and x0 + motion.width <= rect.left:
+        t = (rect.left - motion.width - x0) / dx
+    elif dx < 0 and x0 >= rect.right:
+        t = (rect.right - x0) / dx
+    return motion.y + motion.dy * t + motion.height
@@ -1,9 +1,15 @@
 import pygame
+from main.objects.collision import sweep, bottom_on_arrival, LANDING_TOLERANCE
 from main.constants import GRID_SIZE
 
 
 class GameObject:
     """Base class for all game objects"""
+    # Slots keep large levels small; subclasses declare only the fields they add
+    __slots__ = ("grid_x", "grid_y", "width_cells", "height_cells", "rect", "colour")
+    # Set on classes whose on_no_contact() must run every tick the player is clear
+    tracks_contact = False
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         self.grid_x = grid_x
         self.grid_y = grid_y
@@ -23,6 +29,12 @@ class GameObject:
         draw_rect.x -= camera_x
         pygame.draw.rect(surface, self.colour, draw_rect)
     
+    def render_sprite(self):
+        """This object's look as a Surface, rendered once per type, size and colour by SpriteAtlas"""
+        sprite = pygame.Surface(self.rect.size)
+        sprite.fill(self.colour)
+        return sprite
+    
     def is_visible(self, camera_x, screen_width):
         return (self.rect.x - camera_x < screen_width and 
                 self.rect.x - camera_x + self.rect.width > 0)
@@ -31,62 +43,87 @@ class GameObject:
         pass
     
     def on_player_collision(self, player):
-        """Called when player collides with this object"""
+        """Called for each nearby object every tick; returns True if the player dies"""
+        if sweep(player.motion, self.rect) is None:
+            if self.tracks_contact:
+                self.on_no_contact()
+            return False
+        return self.on_player_contact(player)
+    
+    def on_player_contact(self, player):
+        """Called when this tick's motion touches the object; returns True to kill the player"""
+        return False
+    
+    def on_no_contact(self):
+        """Called on ticks the player is nearby but not touching (tracks_contact classes only)"""
+        pass
+    
+    def save_state(self):
+        """Return mutable run state, or None if the object has none"""
+        return None
+    
+    def restore_state(self, state):
+        """Restore state previously returned by save_state"""
         pass
 
 
 class SolidObject(GameObject):
     """Base class for solid platforms and blocks"""
+    __slots__ = ()
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
     
-    def on_player_collision(self, player):
+    def on_player_contact(self, player):
         """Handle collision with player"""
-        world_rect = pygame.Rect(player.display_x, player.y, player.width, player.height)
-        prev_world_rect = pygame.Rect(player.prev_display_x, player.prev_y, player.width, player.height)
-        
-        if world_rect.colliderect(self.rect):
-            # Landing on top
-            if prev_world_rect.bottom <= self.rect.top + 5:
-                player.y = self.rect.top - player.height
-                player.y_vel = 0
-                player.on_ground = True
-                return False
-            # Hit from side or bottom - kill player
-            else:
-                return True
-        return False
+        # Landing on top: judged where the player was when it reached the block,
+        # so a fast player is not mistaken for a side hit
+        if bottom_on_arrival(player.motion, self.rect) <= self.rect.top + LANDING_TOLERANCE:
+            player.y = self.rect.top - player.height
+            player.y_vel = 0
+            player.on_ground = True
+            return False
+        # Hit from side or bottom - kill player
+        return True
 
 
 class HazardObject(GameObject):
     """Base class for hazards that kill the player"""
+    __slots__ = ()
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
     
-    def on_player_collision(self, player):
-        """Kill player on contact"""
-        world_rect = pygame.Rect(player.display_x, player.y, player.width, player.height)
-        if world_rect.colliderect(self.rect):
-            return True
-        return False
+    def on_player_contact(self, player):
+        """Kill player on contact anywhere along this tick's motion"""
+        return True
 
 
 class TriggerObject(GameObject):
     """Base class for objects that trigger effects when touched"""
+    __slots__ = ("triggered",)
+    tracks_contact = True
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
         self.triggered = False
     
-    def on_player_collision(self, player):
+    def on_player_contact(self, player):
         """Trigger effect when player touches"""
-        world_rect = pygame.Rect(player.display_x, player.y, player.width, player.height)
-        if world_rect.colliderect(self.rect) and not self.triggered:
+        if not self.triggered:
             self.apply_effect(player)
             self.triggered = True
-        elif not world_rect.colliderect(self.rect):
-            self.triggered = False
         return False
     
+    def on_no_contact(self):
+        self.triggered = False
+    
+    def save_state(self):
+        return self.triggered
+    
+    def restore_state(self, state):
+        self.triggered = state
+    
     def apply_effect(self, player):
         """Override in subclass"""
         pass
@@ -94,20 +131,29 @@ class TriggerObject(GameObject):
 
 class PortalObject(GameObject):
     """Base class for portals that modify player state"""
+    __slots__ = ("activated",)
+    tracks_contact = True
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
         self.activated = False
     
-    def on_player_collision(self, player):
+    def on_player_contact(self, player):
         """Apply portal effect once"""
-        world_rect = pygame.Rect(player.display_x, player.y, player.width, player.height)
-        if world_rect.colliderect(self.rect) and not self.activated:
+        if not self.activated:
             self.apply_effect(player)
             self.activated = True
-        elif not world_rect.colliderect(self.rect):
-            self.activated = False
         return False
     
+    def on_no_contact(self):
+        self.activated = False
+    
+    def save_state(self):
+        return self.activated
+    
+    def restore_state(self, state):
+        self.activated = state
+    
     def apply_effect(self, player):
         """Override in subclass"""
         pass
@@ -0,0 +1,186 @@
+"""
+Columnar Level Store
+Level objects kept as NumPy columns (type/x/y/width/height/param), with
+GameObjects built only when something asks for them.
+
+Static, stateless objects (plain blocks and spikes) stay as array rows and
+are materialised on demand by range queries, through a bounded cache; since
+they hold no run state, an evicted object can simply be rebuilt. Everything
+else is materialised up front so its state survives. The store answers the
+same queries as SpatialIndex, so it can stand in for it in GameState.
+"""
+
+import math
+
+import numpy as np
+from main.objects.game_object import GameObject
+from main.objects.object_factory import ObjectFactory
+from main.objects.spatial_index import SpatialIndex
+from main.constants import GRID_SIZE
+
+MATERIALISED_LIMIT = 4096
+
+# Matches level_pack.RECORD so pack records can be read straight into columns
+RECORD_DTYPE = np.dtype([
+    ("type", "<u2"), ("x", "<i4"), ("y", "<i4"),
+    ("width", "<i4"), ("height", "<i4"), ("param", "<f8"),
+])
+
+# Per-type optional parameter stored in the param column (and a pack record's param slot)
+PARAM_FIELDS = {
+    "SpeedPortal": "speed_multiplier",
+}
+
+GRID_FIELDS = (("x", 0), ("y", 0), ("width", 1), ("height", 1))
+
+
+def _grid_cell(value, key, index):
+    if type(value) is not int:
+        if type(value) is not float or not value.is_integer():
+            raise ValueError(f"object {index}: {key}={value!r} is not a whole grid cell")
+        value = int(value)
+    return value
+
+
+def grid_cells(obj_data, index):
+    """An object dict's x, y, width and height as ints; ValueError naming object index unless whole cells"""
+    return [_grid_cell(obj_data.get(key, default), key, index) for key, default in GRID_FIELDS]
+
+
+def _grid_column(values, key):
+    # Checking the types in one pass keeps the usual all-int column off the per-value path
+    if set(map(type, values)) <= {int}:
+        return values
+    return [_grid_cell(value, key, i) for i, value in enumerate(values)]
+
+
+def is_lazy_class(cls):
+    """Objects of cls can live as array rows: default drawing, no updates, no run state"""
+    return (cls.draw is GameObject.draw and cls.update is GameObject.update and
+            cls.save_state is GameObject.save_state and not cls.tracks_contact)
+
+
+class LevelStore:
+    def __init__(self, records, type_names, max_materialised=MATERIALISED_LIMIT):
+        """records is a structured array of RECORD_DTYPE rows, in load order"""
+        self.type_names = list(type_names)
+        self.kind = np.ascontiguousarray(records["type"])
+        self.x = np.ascontiguousarray(records["x"])
+        self.y = np.ascontiguousarray(records["y"])
+        self.width = np.ascontiguousarray(records["width"])
+        self.height = np.ascontiguousarray(records["height"])
+        self.param = np.ascontiguousarray(records["param"])
+        self.max_materialised = max_materialised
+        self.materialised = {}
+
+        classes = [ObjectFactory.OBJECT_MAP.get(name) for name in self.type_names]
+        lazy_types = np.array([cls is not None and is_lazy_class(cls) for cls in classes], dtype=bool)
+        lazy = lazy_types[self.kind] if len(self.kind) else np.zeros(0, dtype=bool)
+
+        # Lazy rows sorted by x so a column range is two binary searches
+        self.lazy_rows = np.flatnonzero(lazy)
+        by_x = np.argsort(self.x[self.lazy_rows], kind="stable")
+        self.lazy_rows = self.lazy_rows[by_x]
+        self.lazy_x = self.x[self.lazy_rows]
+        self.lazy_end = self.lazy_x + self.width[self.lazy_rows]
+        self.max_width = int(self.width[self.lazy_rows].max()) if len(self.lazy_rows) else 0
+
+        # Everything else is built now and indexed like any loaded level
+        eager_rows = np.flatnonzero(~lazy).tolist()
+        self.eager = [self._build(row) for row in eager_rows]
+        self.eager_rows = {id(obj): row for obj, row in zip(self.eager, eager_rows)}
+        self.eager_index = SpatialIndex(self.eager)
+        self.dynamic = self.eager_index.dynamic
+
+        self.level_end = int((self.x + self.width).max()) * GRID_SIZE if len(self.x) else 0
+
+    @classmethod
+    def from_level_data(cls, level_data, max_materialised=MATERIALISED_LIMIT):
+        """Build a store from the object dicts of a JSON level
+
+        Raises ValueError, naming the object, for a position or size that is not whole grid cells.
+        """
+        type_ids = {}
+        kinds = []
+        params = []
+        columns = {key: [] for key, _ in GRID_FIELDS}
+        xs, ys, widths, heights = columns.values()
+        for obj_data in level_data:
+            name = obj_data.get("object", "Block")
+            param_field = PARAM_FIELDS.get(name)
+            kinds.append(type_ids.setdefault(name, len(type_ids)))
+            xs.append(obj_data.get("x", 0))
+            ys.append(obj_data.get("y", 0))
+            widths.append(obj_data.get("width", 1))
+            heights.append(obj_data.get("height", 1))
+            params.append(obj_data.get(param_field, math.nan) if param_field else math.nan)
+
+        records = np.zeros(len(kinds), dtype=RECORD_DTYPE)
+        records["type"] = kinds
+        for key, values in columns.items():
+            records[key] = _grid_column(values, key)
+        records["param"] = params
+        return cls(records, type_ids, max_materialised)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def object_data(self, row):
+        """The object dict for a row, as a JSON level would hold it"""
+        name = self.type_names[self.kind[row]]
+        obj_data = {"object": name, "x": int(self.x[row]), "y": int(self.y[row]),
+                    "width": int(self.width[row]), "height": int(self.height[row])}
+        param = float(self.param[row])
+        if not math.isnan(param):
+            obj_data[PARAM_FIELDS[name]] = param
+        return obj_data
+
+    def __iter__(self):
+        return (self.object_data(row) for row in range(len(self)))
+
+    def _build(self, row):
+        return ObjectFactory.create(self.object_data(row))
+
+    def materialise(self, row):
+        """The GameObject for a lazy row, building (and caching) it if needed"""
+        obj = self.materialised.get(row)
+        if obj is None:
+            if len(self.materialised) >= self.max_materialised:
+                # Drop the oldest half; lazy objects hold no state, so they can be rebuilt
+                for stale in list(self.materialised)[:self.max_materialised // 2]:
+                    del self.materialised[stale]
+            obj = self.materialised[row] = self._build(row)
+        return obj
+
+    def prototypes(self):
+        """One freshly built object per lazy type (for colours and the like)"""
+        rows = {}
+        for row in self.lazy_rows.tolist():
+            rows.setdefault(int(self.kind[row]), row)
+        return [self._build(row) for row in rows.values()]
+
+    def query(self, x_min, x_max):
+        """Objects whose columns overlap [x_min, x_max], in load order (as SpatialIndex.query)"""
+        first = int(x_min // GRID_SIZE)
+        last = int(x_max // GRID_SIZE)
+        # An object spans columns x .. x + width (its right edge lands in the last one)
+        lo = np.searchsorted(self.lazy_x, first - self.max_width, side="left")
+        hi = np.searchsorted(self.lazy_x, last, side="right")
+        candidates = self.lazy_rows[lo:hi][self.lazy_end[lo:hi] >= first]
+
+        found = [(row, self.materialise(row)) for row in candidates.tolist()]
+        eager_rows = self.eager_rows
+        found.extend((eager_rows[id(obj)], obj) for obj in self.eager_index.query(x_min, x_max))
+        if len(found) > 1:
+            found.sort(key=lambda item: item[0])
+        return [obj for _, obj in found]
+
+    def near_player(self, player, margin=GRID_SIZE):
+        """Collision candidates for the player's next step"""
+        return self.query(
+            player.display_x - margin,
+            player.display_x + player.speed + player.width + margin
+        )
+
+    def visible(self, camera_x, screen_width):
+        return self.query(camera_x, camera_x + screen_width)
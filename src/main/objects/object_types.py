@@ -1,10 +1,11 @@
-import pygame
 from main.objects.game_object import SolidObject, HazardObject, TriggerObject, PortalObject
 from main.constants import GREEN, RED, PURPLE, BLUE, GRAY
 
 
 class Block(SolidObject):
     """Standard platform block"""
+    __slots__ = ()
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
         self.colour = GREEN
@@ -12,6 +13,8 @@ class Block(SolidObject):
 
 class Spike(HazardObject):
     """Spike that kills player on contact"""
+    __slots__ = ()
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
         self.colour = RED
@@ -19,6 +22,8 @@ class Spike(HazardObject):
 
 class JumpPad(TriggerObject):
     """Pad that launches player upward"""
+    __slots__ = ("jump_power",)
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
         self.colour = PURPLE
@@ -30,18 +35,29 @@ class JumpPad(TriggerObject):
 
 class JumpOrb(TriggerObject):
     """Orb that gives player a jump when clicked"""
+    __slots__ = ("jump_power",)
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
         self.colour = (255, 255, 0)
         self.jump_power = -12
     
+    def on_player_contact(self, player):
+        """Fire once per touch, on whichever tick of it jump is wanted (held or buffered)"""
+        if not self.triggered and player.wants_jump():
+            self.apply_effect(player)
+            player.use_jump()
+            self.triggered = True
+        return False
+    
     def apply_effect(self, player):
-        if player.controller.is_pressed(pygame.K_SPACE):
-            player.y_vel = self.jump_power
+        player.y_vel = self.jump_power
 
 
 class GravityPortal(PortalObject):
     """Portal that flips gravity"""
+    __slots__ = ()
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
         self.colour = BLUE
@@ -53,6 +69,8 @@ class GravityPortal(PortalObject):
 
 class SpeedPortal(PortalObject):
     """Portal that changes player speed"""
+    __slots__ = ("speed_multiplier",)
+    
     def __init__(self, grid_x, grid_y, width_cells=1, height_cells=1, speed_multiplier=2.0):
         super().__init__(grid_x, grid_y, width_cells, height_cells)
         self.colour = (255, 165, 0)
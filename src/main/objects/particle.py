@@ -1,47 +1,165 @@
 import pygame
-import random
-
-
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-3, 3)
-        self.vy = random.uniform(-5, -1)
-        self.color = color
-        self.lifetime = 30
-        self.size = random.randint(2, 5)
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.2
-        self.lifetime -= 1
-    
-    def draw(self, surface, camera_x):
-        if self.lifetime > 0:
-            alpha = int(255 * (self.lifetime / 30))
-            color_with_alpha = (*self.color[:3], alpha)
-            pygame.draw.circle(surface, self.color, (int(self.x - camera_x), int(self.y)), self.size)
-    
-    def is_alive(self):
-        return self.lifetime > 0
+import numpy as np
+
+PARTICLE_LIFETIME = 30
+PARTICLE_GRAVITY = 0.2
+PARTICLE_SIZES = (2, 3, 4, 5)
+DEFAULT_CAPACITY = 20000
+# Pools this small are drawn with a plain loop rather than array ops
+SMALL_POOL = 64
+
+_SIZE_TABLE = np.array(PARTICLE_SIZES, dtype=np.int32)
 
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-    
+    """Fixed-capacity particle pool stored as parallel NumPy arrays"""
+    # Set once any pool has run warm(); numpy's first-call costs are paid once per process
+    _warmed = False
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self._seed = seed
+        self._rng = None
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int16)
+        # Index into _stamp_table: colour slot * len(PARTICLE_SIZES) + size slot
+        self.stamp = np.zeros(capacity, dtype=np.int32)
+
+        self._colours = {}
+        self._stamp_table = np.empty(0, dtype=object)
+        # RGB of each colour slot, so state_bytes() can hash colours rather than slot numbers
+        self._palette = np.zeros((0, 3), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def rng(self):
+        # Made on first emit: numpy.random is a noticeable import at startup
+        if self._rng is None:
+            self._rng = np.random.default_rng(self._seed)
+        return self._rng
+
+    def reseed(self, seed):
+        """Restart the random stream so emissions can be reproduced"""
+        self._rng = np.random.default_rng(seed)
+
+    def warm(self, colours=()):
+        """Make the random generator and colour stamps now, so the first emit doesn't stall a frame"""
+        self.rng
+        for colour in colours:
+            self._colour_slot(colour)
+        if ParticleSystem._warmed:
+            return
+        # numpy is slow on its first calls; a throwaway pool takes that without touching this one's stream
+        scratch = ParticleSystem(capacity=1, seed=0)
+        scratch.emit(0, 0, colours[0] if colours else (255, 255, 255), 1)
+        surface = pygame.Surface((1, 1))
+        while len(scratch):
+            scratch.update()
+            scratch.draw(surface, 0)
+        ParticleSystem._warmed = True
+
+    def clear(self):
+        self.count = 0
+
+    def state_bytes(self):
+        """Raw bytes of every live particle, for determinism hashing"""
+        n = self.count
+        # Slot numbers depend on which colours were made first (warm() or the first emit), so
+        # each particle's colour and size are hashed instead
+        stamp = self.stamp[:n]
+        colours = self._palette[stamp // len(PARTICLE_SIZES)]
+        sizes = _SIZE_TABLE[stamp % len(PARTICLE_SIZES)]
+        return b"".join(arr.tobytes() for arr in (self.x[:n], self.y[:n], self.vx[:n], self.vy[:n],
+                                                  self.lifetime[:n], colours, sizes))
+
     def emit(self, x, y, color, count=10):
-        for _ in range(count):
-            self.particles.append(Particle(x, y, color))
-    
+        """Spawn up to count particles at (x, y); extras are dropped when the pool is full"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = self.rng.uniform(-3, 3, count)
+        self.vy[start:end] = self.rng.uniform(-5, -1, count)
+        self.lifetime[start:end] = PARTICLE_LIFETIME
+        sizes = self.rng.integers(0, len(PARTICLE_SIZES), count)
+        self.stamp[start:end] = self._colour_slot(color) * len(PARTICLE_SIZES) + sizes
+        self.count = end
+
     def update(self):
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.is_alive():
-                self.particles.remove(particle)
-    
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += PARTICLE_GRAVITY
+        self.lifetime[:n] -= 1
+
+        alive = self.lifetime[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live < n:
+            # Pack survivors to the front so the live range stays contiguous
+            for arr in (self.x, self.y, self.vx, self.vy, self.lifetime, self.stamp):
+                arr[:live] = arr[:n][alive]
+            self.count = live
+
     def draw(self, surface, camera_x):
-        for particle in self.particles:
-            particle.draw(surface, camera_x)
+        n = self.count
+        if n == 0:
+            return
+        radius = PARTICLE_SIZES[-1]
+        xs = (self.x[:n] - camera_x).astype(np.int32)
+        ys = self.y[:n].astype(np.int32)
+        if n <= SMALL_POOL:
+            # A handful of particles (a death burst) is cheaper to cull in a plain loop than in array ops
+            right = surface.get_width() + radius
+            bottom = surface.get_height() + radius
+            table = self._stamp_table
+            sizes = len(PARTICLE_SIZES)
+            batch = []
+            for x, y, slot in zip(xs.tolist(), ys.tolist(), self.stamp[:n].tolist()):
+                if -radius < x < right and -radius < y < bottom:
+                    size = PARTICLE_SIZES[slot % sizes]
+                    batch.append((table[slot], (x - size, y - size)))
+            surface.blits(batch, doreturn=False)
+            return
+        on_screen = ((xs > -radius) & (xs < surface.get_width() + radius) &
+                     (ys > -radius) & (ys < surface.get_height() + radius))
+
+        slots = self.stamp[:n][on_screen]
+        stamps = self._stamp_table[slots]
+        sizes = _SIZE_TABLE[slots % len(PARTICLE_SIZES)]
+        positions = zip((xs[on_screen] - sizes).tolist(), (ys[on_screen] - sizes).tolist())
+        surface.blits(zip(stamps, positions), doreturn=False)
+
+    def _colour_slot(self, color):
+        colour = tuple(color[:3])
+        slot = self._colours.get(colour)
+        if slot is None:
+            slot = len(self._colours)
+            self._colours[colour] = slot
+            stamps = np.empty(len(PARTICLE_SIZES), dtype=object)
+            for i, size in enumerate(PARTICLE_SIZES):
+                stamps[i] = _circle_stamp(colour, size)
+            self._stamp_table = np.concatenate((self._stamp_table, stamps))
+            self._palette = np.vstack((self._palette, np.array([colour], dtype=np.uint8)))
+        return slot
+
+
+def _circle_stamp(colour, radius):
+    """Pre-rendered circle matching pygame.draw.circle(surface, colour, centre, radius)"""
+    key = (0, 0, 0) if colour != (0, 0, 0) else (255, 0, 255)
+    stamp = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+    stamp.fill(key)
+    pygame.draw.circle(stamp, colour, (radius, radius), radius)
+    stamp.set_colorkey(key)
+    return stamp
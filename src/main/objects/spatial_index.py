@@ -0,0 +1,77 @@
+from main.constants import GRID_SIZE
+from main.objects.game_object import GameObject
+
+
+class SpatialIndex:
+    """Buckets level objects by GRID_SIZE column so range queries skip far objects
+
+    Objects that override update() may move, so they are kept out of the
+    buckets in a dynamic list that every query returns.
+    """
+    def __init__(self, objects=()):
+        self.columns = {}
+        self.order = {}
+        self.dynamic = []
+        for obj in objects:
+            self.insert(obj)
+
+    def insert(self, obj):
+        """Add an object to every column its rect spans (or to the dynamic list if it can move)"""
+        self.order[id(obj)] = len(self.order)
+        # Only objects that override update() need a per-frame tick
+        if type(obj).update is not GameObject.update:
+            self.dynamic.append(obj)
+            return
+        for col in self._columns_for(obj.rect.left, obj.rect.right):
+            self.columns.setdefault(col, []).append(obj)
+
+    def remove(self, obj):
+        """Take an object back out (a static one must still have the rect it was inserted with)"""
+        del self.order[id(obj)]
+        if type(obj).update is not GameObject.update:
+            self.dynamic.remove(obj)
+            return
+        for col in self._columns_for(obj.rect.left, obj.rect.right):
+            column = self.columns[col]
+            column.remove(obj)
+            if not column:
+                del self.columns[col]
+
+    def reorder(self, positions):
+        """Move objects in the load order, from {id(obj): position}; ids not indexed here are ignored"""
+        order = self.order
+        for key, position in positions.items():
+            if key in order:
+                order[key] = position
+
+    def query(self, x_min, x_max):
+        """Return objects whose columns overlap [x_min, x_max], plus every dynamic object, in load order"""
+        found = {}
+        for col in self._columns_for(x_min, x_max):
+            for obj in self.columns.get(col, ()):
+                found[id(obj)] = obj
+        for obj in self.dynamic:
+            found[id(obj)] = obj
+        if len(found) < 2:
+            return list(found.values())
+        order = self.order
+        return sorted(found.values(), key=lambda obj: order[id(obj)])
+
+    def near_player(self, player, margin=GRID_SIZE):
+        """Collision candidates for the player's next step"""
+        return self.query(
+            player.display_x - margin,
+            player.display_x + player.speed + player.width + margin
+        )
+
+    def visible(self, camera_x, screen_width):
+        """Objects in the columns covered by the camera window"""
+        return self.query(camera_x, camera_x + screen_width)
+
+    @staticmethod
+    def _columns_for(x_min, x_max):
+        return range(int(x_min // GRID_SIZE), int(x_max // GRID_SIZE) + 1)
+
+    def __len__(self):
+        return len(self.order)
+
@@ -0,0 +1,98 @@
+"""
+Ghost Runs
+Earlier attempts at the current level replayed next to the live player.
+
+While enabled, the live player's jump input is kept for each attempt. On every
+restart from the level start, all kept attempts are replayed together in one
+BatchPlayers pass and drawn as translucent players.
+"""
+
+from collections import deque
+
+import numpy as np
+import pygame
+from main.simulation.batch_players import BatchPlayers
+from main.constants import GHOST_LIMIT, GHOST_ALPHA, PLAYER_COLOR
+
+
+class GhostRuns:
+    def __init__(self, limit=GHOST_LIMIT):
+        self.enabled = False
+        self.attempts = deque(maxlen=limit)
+        # Input of the live attempt, or None when it did not start at the level start
+        self.current = None
+        self.inputs = np.zeros((0, 0), dtype=bool)
+        self.tick = 0
+        self.batch = None
+        self._level = None
+        self._stamp = None
+
+    def load(self, level_data, floor, player):
+        """Forget the previous level's attempts; level_data None disables ghosts for the level"""
+        self.attempts.clear()
+        self.current = [] if level_data is not None else None
+        self.batch = None
+        self.tick = 0
+        self._level = None if level_data is None else (level_data, floor, player)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        # The attempt under way began unrecorded, so recording starts with the next one
+        self.current = None
+        self.tick = 0
+        if self.batch is not None:
+            self.batch.reset(0)
+
+    def discard(self):
+        """The live attempt no longer follows from the level start (e.g. a checkpoint restore)"""
+        self.current = None
+
+    def restart(self):
+        """The live attempt ended: keep its input and replay every kept attempt from the start"""
+        if not self.enabled or self._level is None:
+            return
+        if self.batch is None:
+            try:
+                self.batch = BatchPlayers(*self._level)
+            except ValueError as e:
+                # Object types without a batched equivalent (e.g. custom ones) can't be replayed
+                print(f"Ghost runs are off for this level: {e}")
+                self.load(None, None, None)
+                return
+        if self.current:
+            self.attempts.append(np.array(self.current, dtype=bool))
+        self.current = []
+        self.tick = 0
+
+        longest = max((len(attempt) for attempt in self.attempts), default=0)
+        self.inputs = np.zeros((len(self.attempts), longest + 1), dtype=bool)
+        for i, attempt in enumerate(self.attempts):
+            self.inputs[i, :len(attempt)] = attempt
+        self.batch.reset(len(self.attempts))
+
+    def update(self, player):
+        """Record the live player's input for this tick and step the ghosts alongside it"""
+        if self.current is not None:
+            self.current.append(player.controller.is_pressed(pygame.K_SPACE))
+        if self.batch is None or not self.batch.count:
+            return
+        # Past the end of its attempt a ghost has already died, so its input no longer matters
+        column = min(self.tick, self.inputs.shape[1] - 1)
+        self.batch.step(self.inputs[:, column])
+        self.tick += 1
+
+    def draw(self, surface, camera_x, player):
+        if not self.enabled or self.batch is None or not self.batch.count:
+            return
+        batch = self.batch
+        if self._stamp is None:
+            self._stamp = pygame.Surface((player.width, player.height))
+            self._stamp.fill(PLAYER_COLOR)
+            self._stamp.set_alpha(GHOST_ALPHA)
+
+        xs = (batch.display_x - camera_x).astype(np.int32)
+        ys = batch.y.astype(np.int32)
+        shown = batch.alive & (xs > -player.width) & (xs < surface.get_width())
+        stamp = self._stamp
+        surface.blits(((stamp, position) for position in zip(xs[shown].tolist(), ys[shown].tolist())),
+                      doreturn=False)
@@ -1,14 +1,21 @@
 import pygame
-from main.controller.keyboard_controls import KeyboardController
-from main.constants import GRAVITY, JUMP_STRENGTH, PLAYER_SPEED, PLAYER_COLOR
+from main.controller.input_system import InputSystem
+from main.objects.collision import PlayerMotion
+from main.objects.game_object import GameObject
+from main.constants import GRAVITY, JUMP_STRENGTH, PLAYER_SPEED, PLAYER_COLOR, JUMP_BUFFER_TICKS, COYOTE_TICKS
 
 
 class CollisionDetection:
     def __init__(self, player):
         self.player = player
+        # Reused every tick so the hot path does not allocate new lists
+        self._contacts = []
+        self._custom = []
     
     def check_floor(self, floor):
-        if self.player.rect.colliderect(floor.rect):
+        # Edge test rather than overlap so a fast fall cannot pass through the floor
+        if (self.player.y + self.player.height > floor.rect.top and
+                self.player.prev_y < floor.rect.bottom):
             self.player.y = floor.y - self.player.height
             self.player.y_vel = 0
             self.player.on_ground = True
@@ -16,15 +23,83 @@ class CollisionDetection:
         return False
     
     def check_objects(self, objects):
-        """Check collision with all game objects using polymorphism"""
+        """Check collision with all game objects, in the order the player reaches them
+        
+        Batched: the tick's motion is read once, objects clear of its bounding box
+        are skipped, and the rest are swept inline (the same maths as
+        collision.sweep), so objects are only called on contact.
+        """
+        player = self.player
+        motion = player.motion
+        x0, y0, dx, dy = motion.x, motion.y, motion.dx, motion.dy
+        width, height = motion.width, motion.height
+        contacts = self._contacts
+        custom = self._custom
+        contacts.clear()
+        custom.clear()
+        
+        # The box the motion sweeps through; objects clear of it need no sweep at all
+        reach_left = x0 + dx if dx < 0 else x0
+        reach_right = (x0 if dx < 0 else x0 + dx) + width
+        reach_top = y0 + dy if dy < 0 else y0
+        reach_bottom = (y0 if dy < 0 else y0 + dy) + height
+        
+        default = GameObject.on_player_collision
         for obj in objects:
-            if obj.on_player_collision(self.player):
+            if type(obj).on_player_collision is not default:
+                custom.append(obj)
+                continue
+            rect = obj.rect
+            if (rect.left >= reach_right or rect.right <= reach_left or
+                    rect.top >= reach_bottom or rect.bottom <= reach_top):
+                if obj.tracks_contact:
+                    obj.on_no_contact()
+                continue
+            if dx:
+                entry = (rect.left - width - x0) / dx
+                leave = (rect.right - x0) / dx
+                if entry > leave:
+                    entry, leave = leave, entry
+                if entry < 0.0:
+                    entry = 0.0
+                if leave > 1.0:
+                    leave = 1.0
+            elif rect.left - width < x0 < rect.right:
+                entry, leave = 0.0, 1.0
+            else:
+                entry = leave = 0.0
+            if entry < leave:
+                if dy:
+                    near = (rect.top - height - y0) / dy
+                    far = (rect.bottom - y0) / dy
+                    if near > far:
+                        near, far = far, near
+                    if near > entry:
+                        entry = near
+                    if far < leave:
+                        leave = far
+                elif not rect.top - height < y0 < rect.bottom:
+                    leave = entry
+            
+            if entry < leave:
+                contacts.append((entry, len(contacts), obj))
+            elif obj.tracks_contact:
+                obj.on_no_contact()
+        
+        if len(contacts) > 1:
+            contacts.sort()
+        for _, _, obj in contacts:
+            if obj.on_player_contact(player):
+                return True
+        # Objects with their own on_player_collision keep the per-object path
+        for obj in custom:
+            if obj.on_player_collision(player):
                 return True
         return False
 
 
 class Player:
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, controller=None):
         self.x = x
         self.display_x = x
         self.y = y
@@ -39,11 +114,19 @@ class Player:
         self.on_ground = False
         self.is_dead = False
         
+        # This tick's jump bit, ticks left on a buffered press, and ticks of coyote time left
+        self.jump_held = False
+        self.jump_buffer = 0
+        self.coyote = 0
+        self.buffer_ticks = JUMP_BUFFER_TICKS
+        self.coyote_ticks = COYOTE_TICKS
+        
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
         self.prev_display_x = x
         self.prev_y = y
         
-        self.controller = KeyboardController()
+        self.controller = controller or InputSystem()
+        self.motion = PlayerMotion()
         self.collision = CollisionDetection(self)
         
         # Store initial state
@@ -62,15 +145,54 @@ class Player:
         self.jump_strength = self.initial_state['jump_strength']
         self.on_ground = False
         self.is_dead = False
+        self.jump_held = False
+        self.jump_buffer = 0
+        self.coyote = 0
+        self.rect.x = self.x
+        self.rect.y = self.y
+    
+    def save_state(self):
+        """Snapshot of everything update() mutates, as a plain tuple"""
+        return (
+            self.display_x, self.y, self.y_vel, self.speed,
+            self.gravity, self.jump_strength, self.on_ground, self.is_dead,
+            self.prev_display_x, self.prev_y, self.jump_held, self.jump_buffer, self.coyote
+        )
+    
+    def restore_state(self, state):
+        (self.display_x, self.y, self.y_vel, self.speed,
+         self.gravity, self.jump_strength, self.on_ground, self.is_dead,
+         self.prev_display_x, self.prev_y, self.jump_held, self.jump_buffer, self.coyote) = state
         self.rect.x = self.x
         self.rect.y = self.y
 
     def draw(self, surface):
         pygame.draw.rect(surface, self.colour, (self.x, self.y, self.width, self.height))
     
+    def read_input(self):
+        """Take this tick's jump bit; a fresh press stays wanted for buffer_ticks more ticks"""
+        held = self.controller.is_pressed(pygame.K_SPACE)
+        if self.jump_buffer:
+            self.jump_buffer -= 1
+        if held and not self.jump_held:
+            self.jump_buffer = self.buffer_ticks
+        self.jump_held = held
+        if not self.wants_jump():
+            self.controller.jump_expired()
+    
+    def wants_jump(self):
+        return self.jump_held or self.jump_buffer > 0
+    
+    def use_jump(self):
+        """Something acted on the jump input; a buffered press is spent"""
+        self.jump_buffer = 0
+        self.controller.jump_used()
+    
     def jump(self):
-        if self.controller.is_pressed(pygame.K_SPACE) and self.on_ground:
+        if self.wants_jump() and (self.on_ground or self.coyote):
             self.y_vel = self.jump_strength
+            self.coyote = 0
+            self.use_jump()
             return True
         return False
     
@@ -93,6 +215,7 @@ class Player:
             return None
         
         self.controller.update()
+        self.read_input()
         self.prev_display_x = self.display_x
         self.prev_y = self.y
         
@@ -101,12 +224,17 @@ class Player:
         
         self.on_ground = False
         self.collision.check_floor(floor)
+        self.motion.update(self)
         
         # Check objects for collision (this also sets on_ground for platforms)
         if self.collision.check_objects(objects):
             return self.die()
         
         # Jump after collision detection so on_ground is properly set
+        if self.on_ground:
+            self.coyote = self.coyote_ticks
         jumped = self.jump()
+        if not self.on_ground and self.coyote:
+            self.coyote -= 1
         
         return jumped
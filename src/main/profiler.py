@@ -0,0 +1,138 @@
+"""
+Frame Profiler
+Per-phase frame timings with rolling percentiles, an optional overlay and trace dumps.
+
+Instrumented code calls begin_frame(), then mark(phase) after each phase and
+end_frame() at the end; each mark charges the time since the previous one to
+that phase. Timings that are not part of the frame (e.g. input latency) go to
+their own series through record(). While disabled every call returns immediately.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+ROLLING_WINDOW = 600
+TRACE_LIMIT = 60 * 60 * 10
+OVERLAY_REFRESH = 15
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    def __init__(self, window=ROLLING_WINDOW, trace_limit=TRACE_LIMIT):
+        self.enabled = False
+        self.window = window
+        self.phases = []
+        self.samples = {}
+        # Named sample series outside the frame phases, so they never count towards frame time
+        self.series = {}
+        self.trace = deque(maxlen=trace_limit)
+        self._frame = {}
+        self._last = 0.0
+        self._frame_start = 0.0
+        self._overlay_lines = []
+        self._frames_since_refresh = OVERLAY_REFRESH
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._frame = {}
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame = {}
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._frame[phase] = self._frame.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def record(self, name, ms):
+        """Add a duration measured elsewhere to its own series (not a frame phase)"""
+        if not self.enabled:
+            return
+        samples = self.series.get(name)
+        if samples is None:
+            samples = self.series[name] = deque(maxlen=self.window)
+        samples.append(ms)
+
+    def skip(self):
+        """Restart the phase clock without charging the gap to any phase"""
+        if self.enabled:
+            self._last = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or not self._frame:
+            return
+        frame = self._frame
+        frame["frame"] = self._last - self._frame_start
+        for phase, seconds in frame.items():
+            samples = self.samples.get(phase)
+            if samples is None:
+                samples = self.samples[phase] = deque(maxlen=self.window)
+                self.phases.append(phase)
+            samples.append(seconds * 1000)
+        self.trace.append(frame)
+
+    def percentiles(self, phase):
+        """(p50, p95, p99) in milliseconds over the rolling window, for a phase or a series"""
+        ordered = sorted(self.samples.get(phase, self.series.get(phase, ())))
+        if not ordered:
+            return tuple(0.0 for _ in PERCENTILES)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(round(p / 100 * last)))] for p in PERCENTILES)
+
+    def report(self, names=None):
+        names = self.phases if names is None else names
+        return {name: dict(zip(("p50", "p95", "p99"), self.percentiles(name))) for name in names}
+
+    def dump(self, path):
+        """Write the recorded frames as JSON (.json) or CSV (anything else), times in ms"""
+        rows = [{phase: round(seconds * 1000, 4) for phase, seconds in frame.items()} for frame in self.trace]
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"phases": self.phases, "frames": rows, "summary": self.report(),
+                           "series": self.report(list(self.series))}, f, indent=4)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=self.phases, restval=0)
+                writer.writeheader()
+                writer.writerows(rows)
+        return len(rows)
+
+    def draw_overlay(self, surface, text_cache):
+        if not self.enabled:
+            return
+        # Percentiles only need refreshing a few times a second; keeps text cache hits high
+        self._frames_since_refresh += 1
+        if self._frames_since_refresh >= OVERLAY_REFRESH:
+            self._frames_since_refresh = 0
+            self._overlay_lines = [f"{'phase':<10}{'p50':>7}{'p95':>7}{'p99':>7}"] + [
+                f"{phase:<10}" + "".join(f"{value:>7.2f}" for value in self.percentiles(phase))
+                for phase in self.phases + list(self.series)
+            ]
+
+        lines = [text_cache.render(line, 20, (255, 255, 255), antialias=False) for line in self._overlay_lines]
+        if not lines:
+            return
+        width = max(line.get_width() for line in lines) + 10
+        height = sum(line.get_height() for line in lines) + 10
+        panel = pygame.Surface((width, height))
+        panel.set_alpha(180)
+        panel.fill((0, 0, 0))
+        x = surface.get_width() - width - 10
+        surface.blit(panel, (x, 10))
+        y = 15
+        for line in lines:
+            surface.blit(line, (x + 5, y))
+            y += line.get_height()
+
+
+# Shared instance used by the game loop
+profiler = FrameProfiler()
@@ -0,0 +1,141 @@
+import time
+from collections import OrderedDict
+
+import pygame
+from main.objects.game_object import GameObject
+from main.objects.spatial_index import SpatialIndex
+from main.screenDir.sprite_atlas import SpriteAtlas, to_pixel
+from main.constants import RENDER_CHUNK_WIDTH, RENDER_CACHE_CHUNKS
+
+# Candidate transparent keys; the first one no static object uses is picked
+_COLOURKEYS = [(255, 0, 255), (1, 2, 3), (0, 255, 1), (254, 1, 254)]
+
+
+def is_static(obj):
+    """Objects using the default rect draw and no per-frame update never change on screen"""
+    return type(obj).draw is GameObject.draw and type(obj).update is GameObject.update
+
+
+class ChunkRenderCache:
+    """Pre-renders static level geometry into fixed-width strips, kept in an LRU cache"""
+    def __init__(self, objects, height, chunk_width=RENDER_CHUNK_WIDTH, max_chunks=RENDER_CACHE_CHUNKS,
+                 static_index=None, dynamic_index=None, atlas=None, defer_sprites=False):
+        self.height = height
+        self.chunk_width = chunk_width
+        self.max_chunks = max_chunks
+
+        # static_index may be any index with query() (e.g. a LevelStore); chunks
+        # only take its static objects. A shared dynamic_index is filtered the same way.
+        static = [obj for obj in objects if is_static(obj)]
+        self.static_index = static_index if static_index is not None else SpatialIndex(static)
+        self.dynamic_index = dynamic_index if dynamic_index is not None else SpatialIndex(
+            obj for obj in objects if not is_static(obj))
+        self._filter_dynamic = dynamic_index is not None
+        # Shared with the display, so sprites outlive the level that first used them.
+        # defer_sprites leaves rendering them to preload_sprites, for a cache built
+        # off the thread that draws with the atlas.
+        self.atlas = atlas if atlas is not None else SpriteAtlas()
+        self._unloaded = SpriteAtlas.distinct(objects)
+        if not defer_sprites:
+            self.preload_sprites()
+
+        used = {tuple(obj.colour[:3]) for obj in static}
+        self.colourkey = next((key for key in _COLOURKEYS if key not in used), _COLOURKEYS[0])
+
+        self.chunks = OrderedDict()
+        self.stats = {
+            "hits": 0, "misses": 0, "evictions": 0,
+            "chunks_blitted": 0, "dynamic_drawn": 0, "draw_ms": 0.0,
+        }
+
+    def preload_sprites(self):
+        """Render the sprites the level's objects need, on the thread that draws"""
+        self.atlas.preload(self._unloaded)
+        self._unloaded = []
+
+    def _render_chunk(self, index):
+        left = index * self.chunk_width
+        chunk = pygame.Surface((self.chunk_width, self.height))
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        chunk.fill(self.colourkey)
+        self.atlas.draw(chunk, [obj for obj in self.static_index.query(left, left + self.chunk_width)
+                                if is_static(obj)], left)
+        chunk.set_colorkey(self.colourkey, pygame.RLEACCEL)
+        return chunk
+
+    def chunk(self, index):
+        """Fetch a chunk surface, rendering it (and evicting the oldest) on a miss"""
+        chunk = self.chunks.get(index)
+        if chunk is not None:
+            self.chunks.move_to_end(index)
+            self.stats["hits"] += 1
+            return chunk
+
+        self.stats["misses"] += 1
+        chunk = self._render_chunk(index)
+        self.chunks[index] = chunk
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+            self.stats["evictions"] += 1
+        return chunk
+
+    def visible_chunks(self, camera_x, screen_width):
+        first = int(camera_x // self.chunk_width)
+        last = int((camera_x + screen_width - 1) // self.chunk_width)
+        return range(first, last + 1)
+
+    def warm(self, camera_x, screen_width):
+        """Render the chunks for a camera position ahead of the first frame"""
+        for index in self.visible_chunks(camera_x, screen_width):
+            self.chunk(index)
+
+    def invalidate(self):
+        self.chunks.clear()
+
+    def invalidate_span(self, x_min, x_max):
+        """Drop only the cached chunks overlapping [x_min, x_max)"""
+        for index in range(int(x_min // self.chunk_width), int((x_max - 1) // self.chunk_width) + 1):
+            self.chunks.pop(index, None)
+
+    def add(self, obj):
+        """Start drawing a new level object, re-rendering only the chunks it covers"""
+        if not is_static(obj):
+            self.dynamic_index.insert(obj)
+            return
+        self.static_index.insert(obj)
+        if tuple(obj.colour[:3]) == self.colourkey:
+            used = {tuple(other.colour[:3]) for column in self.static_index.columns.values() for other in column}
+            self.colourkey = next((key for key in _COLOURKEYS if key not in used), _COLOURKEYS[0])
+            self.invalidate()
+        else:
+            self.invalidate_span(obj.rect.left, obj.rect.right)
+
+    def remove(self, obj):
+        if not is_static(obj):
+            self.dynamic_index.remove(obj)
+            return
+        self.static_index.remove(obj)
+        self.invalidate_span(obj.rect.left, obj.rect.right)
+
+    def reorder(self, positions):
+        self.static_index.reorder(positions)
+        self.dynamic_index.reorder(positions)
+
+    def draw(self, surface, camera_x):
+        start = time.perf_counter()
+        screen_width = surface.get_width()
+
+        # Chunks and dynamic sprites go out together in one blits batch
+        batch = [(self.chunk(index), (to_pixel(index * self.chunk_width - camera_x), 0))
+                 for index in self.visible_chunks(camera_x, screen_width)]
+        blitted = len(batch)
+
+        filter_dynamic = self._filter_dynamic
+        dynamic = [obj for obj in self.dynamic_index.visible(camera_x, screen_width)
+                   if not (filter_dynamic and is_static(obj)) and obj.is_visible(camera_x, screen_width)]
+        drawn = self.atlas.draw(surface, dynamic, camera_x, batch)
+
+        self.stats["chunks_blitted"] = blitted
+        self.stats["dynamic_drawn"] = drawn
+        self.stats["draw_ms"] = (time.perf_counter() - start) * 1000
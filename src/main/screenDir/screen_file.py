@@ -1,4 +1,6 @@
 import pygame
+from main.screenDir.text_cache import TextCache
+from main.screenDir.sprite_atlas import SpriteAtlas
 
 
 class Display:
@@ -7,6 +9,8 @@ class Display:
         self.colour = colour
         self.width = width
         self.height = height
+        self.text_cache = TextCache()
+        self.sprites = SpriteAtlas()
 
     def clear(self):
         self.surface.fill(self.colour)
@@ -0,0 +1,89 @@
+"""
+Sprite Atlas
+One pre-rendered sprite per (object type, size, colour), drawn in Surface.blits batches.
+
+Objects are drawn by blitting their sprite rather than by one pygame.draw call
+each. A sprite comes from the object's render_sprite(), which by default fills
+its rect with its colour, pixel for pixel what GameObject.draw produces. An
+object type registers its own look by overriding render_sprite; the result
+must depend only on the type, size and colour, since sprites are shared by key.
+
+Sprites are converted to the display format once a display exists, so blits
+need no per-pixel conversion. Objects over SPRITE_MAX_PIXELS, such as a
+level-long block, keep drawing themselves rather than hold a huge sprite, as
+do types that override draw().
+"""
+
+import pygame
+from main.objects.game_object import GameObject
+from main.constants import SPRITE_MAX_PIXELS
+
+
+def to_pixel(value):
+    """Round like pygame.Rect does for float coordinates (half away from zero)"""
+    return int(value + 0.5) if value >= 0 else -int(-value + 0.5)
+
+
+class SpriteAtlas:
+    def __init__(self, max_pixels=SPRITE_MAX_PIXELS):
+        self.max_pixels = max_pixels
+        self.sprites = {}
+        self.stats = {"sprites": 0, "self_drawn": 0}
+
+    @staticmethod
+    def key(obj):
+        rect = obj.rect
+        return (type(obj), rect.width, rect.height, obj.colour)
+
+    @staticmethod
+    def distinct(objects):
+        """One object per sprite among objects; touches no surfaces, so any thread may call it"""
+        return list({SpriteAtlas.key(obj): obj for obj in objects}.values())
+
+    def sprite(self, obj):
+        """The shared sprite for obj, rendering it on first use; None if obj draws itself"""
+        key = self.key(obj)
+        sprite = self.sprites.get(key)
+        if sprite is None and key not in self.sprites:
+            sprite = self._render(obj)
+            self.sprites[key] = sprite
+            self.stats["sprites" if sprite is not None else "self_drawn"] += 1
+        return sprite
+
+    def _render(self, obj):
+        if type(obj).draw is not GameObject.draw or obj.rect.width * obj.rect.height > self.max_pixels:
+            return None
+        sprite = obj.render_sprite()
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha() if sprite.get_flags() & pygame.SRCALPHA else sprite.convert()
+        return sprite
+
+    def preload(self, objects):
+        """Render the sprites for objects ahead of the first frame"""
+        for obj in objects:
+            self.sprite(obj)
+
+    def clear(self):
+        self.sprites.clear()
+
+    def draw(self, surface, objects, camera_x, batch=None):
+        """Draw objects in order, as one blits batch between any objects that draw themselves
+
+        batch may hold (surface, position) pairs to go out ahead of the objects.
+        Returns the number of objects drawn.
+        """
+        batch = [] if batch is None else batch
+        drawn = 0
+        for obj in objects:
+            sprite = self.sprite(obj)
+            if sprite is None:
+                if batch:
+                    surface.blits(batch, doreturn=False)
+                    batch = []
+                obj.draw(surface, camera_x)
+            else:
+                batch.append((sprite, (to_pixel(obj.rect.x - camera_x), obj.rect.y)))
+            drawn += 1
+        if batch:
+            surface.blits(batch, doreturn=False)
+        return drawn
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+import pygame
+
+DEFAULT_TEXT_CACHE_SIZE = 128
+
+
+class TextCache:
+    """Shares Font objects and keeps recently rendered text surfaces in an LRU"""
+    def __init__(self, max_entries=DEFAULT_TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "fonts_loaded": 0}
+
+    @property
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def font(self, size, name=None):
+        """Load each (font file, size) once; Font construction reads from disk"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            # The font module is started with the first text drawn rather than at launch
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+            self.stats["fonts_loaded"] += 1
+        return font
+
+    def render(self, text, size, colour, name=None, antialias=True):
+        """Rendered text surface, re-rendered only when the key is not cached"""
+        key = (name, size, text, tuple(colour), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.stats["hits"] += 1
+            return surface
+
+        self.stats["misses"] += 1
+        surface = self.font(size, name).render(text, antialias, colour)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.stats["evictions"] += 1
+        return surface
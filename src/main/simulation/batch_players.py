@@ -0,0 +1,353 @@
+"""
+Batch Player Simulation
+Many players stepped together as NumPy arrays, tick for tick identical to Player.update.
+
+Each agent has its own position, velocities, gravity, speed, on_ground and
+trigger flags; the level geometry is shared. A tick is one vectorized pass:
+every agent's collision candidates are the objects SpatialIndex.near_player
+would return, each candidate is swept along the agent's motion (the maths of
+CollisionDetection.check_objects), and contacts are then resolved in time of
+impact order one rank at a time across all agents. Floating point operations
+run in the same order as the scalar code, so results are equal, not close.
+
+Only object behaviours known here can be batched; anything else raises
+ValueError when the level is loaded.
+"""
+
+import numpy as np
+
+from main.objects.game_object import GameObject, SolidObject, HazardObject, TriggerObject, PortalObject
+from main.objects.object_types import JumpPad, JumpOrb, GravityPortal, SpeedPortal
+from main.objects.object_factory import ObjectFactory
+from main.objects.level_store import LevelStore, PARAM_FIELDS
+from main.objects.collision import LANDING_TOLERANCE
+from main.constants import GRID_SIZE
+
+# What touching an object does
+PASSIVE, SOLID, HAZARD, TRIGGER = range(4)
+# What a trigger or portal does the first tick it is touched
+NO_EFFECT, SET_VELOCITY, ORB_VELOCITY, FLIP_GRAVITY, SET_SPEED = range(5)
+
+_CONTACTS = {
+    GameObject.on_player_contact: PASSIVE,
+    SolidObject.on_player_contact: SOLID,
+    HazardObject.on_player_contact: HAZARD,
+    TriggerObject.on_player_contact: TRIGGER,
+    PortalObject.on_player_contact: TRIGGER,
+    # Orbs only count as touched on the tick they fire; _apply_effects reports which did
+    JumpOrb.on_player_contact: TRIGGER,
+}
+# apply_effect -> (effect, attribute holding its parameter)
+_EFFECTS = {
+    TriggerObject.apply_effect: (NO_EFFECT, None),
+    PortalObject.apply_effect: (NO_EFFECT, None),
+    JumpPad.apply_effect: (SET_VELOCITY, "jump_power"),
+    JumpOrb.apply_effect: (ORB_VELOCITY, "jump_power"),
+    GravityPortal.apply_effect: (FLIP_GRAVITY, None),
+    SpeedPortal.apply_effect: (SET_SPEED, "speed_multiplier"),
+}
+_RESETS = (TriggerObject.on_no_contact, PortalObject.on_no_contact)
+
+
+def classify(obj):
+    """(contact, effect, parameter attribute) for an object's class"""
+    cls = type(obj)
+    contact = _CONTACTS.get(cls.on_player_contact)
+    if contact is None or cls.on_player_collision is not GameObject.on_player_collision:
+        raise ValueError(f"{cls.__name__} has no batched equivalent")
+    if contact == TRIGGER:
+        effect = _EFFECTS.get(cls.apply_effect)
+        if effect is None or cls.on_no_contact not in _RESETS:
+            raise ValueError(f"{cls.__name__} has no batched equivalent")
+        return (contact,) + effect
+    if cls.tracks_contact and cls.on_no_contact is not GameObject.on_no_contact:
+        raise ValueError(f"{cls.__name__} has no batched equivalent")
+    return contact, NO_EFFECT, None
+
+
+class BatchPlayers:
+    """count players on one level; agent i matches a lone Player given the same jump input"""
+    def __init__(self, level_data, floor, template, count=0):
+        """level_data is a level's object dicts or a LevelStore; template is the Player to copy"""
+        store = level_data if isinstance(level_data, LevelStore) else LevelStore.from_level_data(level_data)
+
+        self.left = store.x.astype(np.int64) * GRID_SIZE
+        self.top = store.y.astype(np.int64) * GRID_SIZE
+        self.right = self.left + store.width.astype(np.int64) * GRID_SIZE
+        self.bottom = self.top + store.height.astype(np.int64) * GRID_SIZE
+        self.first_col = self.left // GRID_SIZE
+        self.last_col = self.right // GRID_SIZE
+
+        # Behaviour per type, read off one freshly built object of each
+        contacts, effects, defaults, param_rows = [], [], [], []
+        for name in store.type_names:
+            prototype = ObjectFactory.create({"object": name})
+            contact, effect, attribute = classify(prototype)
+            contacts.append(contact)
+            effects.append(effect)
+            defaults.append(float(getattr(prototype, attribute)) if attribute else 0.0)
+            # Types whose parameter is stored per object take it from the param column
+            param_rows.append(attribute is not None and PARAM_FIELDS.get(name) == attribute)
+        kind = store.kind
+        self.contact = np.array(contacts, dtype=np.int8)[kind]
+        self.effect = np.array(effects, dtype=np.int8)[kind]
+        self.power = np.array(defaults, dtype=np.float64)[kind]
+        own_param = np.array(param_rows, dtype=bool)[kind] & ~np.isnan(store.param)
+        self.power[own_param] = store.param[own_param]
+
+        # Rows sorted by first column, so the candidate window is two binary searches
+        self._by_col = np.argsort(self.first_col, kind="stable")
+        self._sorted_first = self.first_col[self._by_col]
+        self._max_span = int((self.last_col - self.first_col).max()) if len(kind) else 0
+
+        # Triggers and portals remember contact per agent
+        tracked = np.flatnonzero(self.contact == TRIGGER)
+        self.trigger_slot = np.full(len(kind), -1, dtype=np.int64)
+        self.trigger_slot[tracked] = np.arange(len(tracked))
+
+        self.floor_top = floor.rect.top
+        self.floor_bottom = floor.rect.bottom
+        self.floor_y = floor.y
+        self.width = template.width
+        self.height = template.height
+        self.buffer_ticks = template.buffer_ticks
+        self.coyote_ticks = template.coyote_ticks
+        self.initial_state = dict(template.initial_state)
+        self.reset(count)
+
+    def reset(self, count=None):
+        """Put every agent (count of them, if given) back at the level start"""
+        if count is not None:
+            self.count = count
+        n = self.count
+        self.display_x = np.empty(n, dtype=np.float64)
+        self.y = np.empty(n, dtype=np.float64)
+        self.y_vel = np.empty(n, dtype=np.float64)
+        self.speed = np.empty(n, dtype=np.float64)
+        self.gravity = np.empty(n, dtype=np.float64)
+        self.jump_strength = np.empty(n, dtype=np.float64)
+        self.on_ground = np.empty(n, dtype=bool)
+        self.is_dead = np.empty(n, dtype=bool)
+        self.prev_display_x = np.empty(n, dtype=np.float64)
+        self.prev_y = np.empty(n, dtype=np.float64)
+        self.jump_held = np.empty(n, dtype=bool)
+        self.jump_buffer = np.empty(n, dtype=np.int64)
+        self.coyote = np.empty(n, dtype=np.int64)
+        self.triggered = np.empty((n, int(np.count_nonzero(self.trigger_slot >= 0))), dtype=bool)
+        self.restart(slice(None))
+
+    def restart(self, agents):
+        """Put some agents (an index, mask or slice) back at the level start"""
+        initial = self.initial_state
+        self.display_x[agents] = initial['display_x']
+        self.y[agents] = initial['y']
+        self.y_vel[agents] = initial['y_vel']
+        self.speed[agents] = initial['speed']
+        self.gravity[agents] = initial['gravity']
+        self.jump_strength[agents] = initial['jump_strength']
+        self.on_ground[agents] = False
+        self.is_dead[agents] = False
+        self.prev_display_x[agents] = initial['display_x']
+        self.prev_y[agents] = initial['y']
+        self.jump_held[agents] = False
+        self.jump_buffer[agents] = 0
+        self.coyote[agents] = 0
+        self.triggered[agents] = False
+
+    def save_state(self, agent):
+        """Agent's state in the layout of Player.save_state"""
+        return (
+            float(self.display_x[agent]), float(self.y[agent]), float(self.y_vel[agent]),
+            float(self.speed[agent]), float(self.gravity[agent]), float(self.jump_strength[agent]),
+            bool(self.on_ground[agent]), bool(self.is_dead[agent]),
+            float(self.prev_display_x[agent]), float(self.prev_y[agent]),
+            bool(self.jump_held[agent]), int(self.jump_buffer[agent]), int(self.coyote[agent])
+        )
+
+    def step(self, jump):
+        """Advance every live agent one tick holding jump (a bool per agent); returns who died"""
+        died_now = np.zeros(self.count, dtype=bool)
+        live = np.flatnonzero(~self.is_dead)
+        if not len(live):
+            return died_now
+        pressed = np.asarray(jump, dtype=bool)[live]
+        width = self.width
+        height = self.height
+
+        x = self.display_x[live]
+        y = self.y[live]
+        y_vel = self.y_vel[live]
+        speed = self.speed[live]
+        gravity = self.gravity[live]
+        jump_strength = self.jump_strength[live]
+        triggered = self.triggered[live]
+        coyote = self.coyote[live]
+
+        # Player.read_input: a fresh press is buffered for buffer_ticks more ticks
+        jump_buffer = np.maximum(self.jump_buffer[live] - 1, 0)
+        jump_buffer[pressed & ~self.jump_held[live]] = self.buffer_ticks
+
+        # Candidate columns, taken before the move as GameState does
+        q_first = (x - GRID_SIZE) // GRID_SIZE
+        q_last = (x + speed + width + GRID_SIZE) // GRID_SIZE
+
+        prev_x = x
+        prev_y = y
+        y_vel = y_vel + gravity
+        y = y + y_vel
+        x = x + speed
+
+        on_ground = (y + height > self.floor_top) & (prev_y < self.floor_bottom)
+        y = np.where(on_ground, self.floor_y - height, y)
+        y_vel = np.where(on_ground, 0.0, y_vel)
+        dx = x - prev_x
+        dy = y - prev_y
+
+        died = np.zeros(len(live), dtype=bool)
+        rows = self._candidates(q_first.min(), q_last.max())
+        if len(rows):
+            near = ((self.first_col[rows] <= q_last[:, None]) &
+                    (self.last_col[rows] >= q_first[:, None]))
+            contact, entry = self._sweep(rows, prev_x, prev_y, dx, dy)
+            contact &= near
+
+            # Tracked objects the agent was near but not touching forget the contact
+            tracked = np.flatnonzero(self.trigger_slot[rows] >= 0)
+            if len(tracked):
+                slots = self.trigger_slot[rows[tracked]]
+                triggered[:, slots] &= (contact | ~near)[:, tracked]
+
+            counts = np.count_nonzero(contact, axis=1)
+            # Stable sort keeps load order between equal entry times, like the scalar sort
+            order = np.argsort(np.where(contact, entry, np.inf), axis=1, kind="stable")
+            for rank in range(int(counts.max())):
+                agents = np.flatnonzero((counts > rank) & ~died)
+                if not len(agents):
+                    break
+                obj = rows[order[agents, rank]]
+                kind = self.contact[obj]
+
+                solid = kind == SOLID
+                if solid.any():
+                    a = agents[solid]
+                    o = obj[solid]
+                    land = self._bottom_on_arrival(o, prev_x[a], prev_y[a], dx[a], dy[a]) <= \
+                        self.top[o] + LANDING_TOLERANCE
+                    landed = a[land]
+                    y[landed] = self.top[o[land]] - height
+                    y_vel[landed] = 0.0
+                    on_ground[landed] = True
+                    died[a[~land]] = True
+
+                died[agents[kind == HAZARD]] = True
+
+                trigger = kind == TRIGGER
+                if trigger.any():
+                    a = agents[trigger]
+                    o = obj[trigger]
+                    slots = self.trigger_slot[o]
+                    fresh = ~triggered[a, slots]
+                    a, o, slots = a[fresh], o[fresh], slots[fresh]
+                    fired = self._apply_effects(a, o, pressed, jump_buffer, y_vel, gravity, jump_strength, speed)
+                    triggered[a[fired], slots[fired]] = True
+
+        speed[died] = 0
+        # Player.update: coyote time refills on the ground and runs down in the air
+        alive = ~died
+        coyote[on_ground & alive] = self.coyote_ticks
+        jumped = (pressed | (jump_buffer > 0)) & (on_ground | (coyote > 0)) & alive
+        y_vel[jumped] = jump_strength[jumped]
+        jump_buffer[jumped] = 0
+        coyote[jumped] = 0
+        airborne = ~on_ground & (coyote > 0) & alive
+        coyote[airborne] -= 1
+
+        self.display_x[live] = x
+        self.y[live] = y
+        self.y_vel[live] = y_vel
+        self.speed[live] = speed
+        self.gravity[live] = gravity
+        self.jump_strength[live] = jump_strength
+        self.on_ground[live] = on_ground
+        self.is_dead[live] = died
+        self.prev_display_x[live] = prev_x
+        self.prev_y[live] = prev_y
+        self.jump_held[live] = pressed
+        self.jump_buffer[live] = jump_buffer
+        self.coyote[live] = coyote
+        self.triggered[live] = triggered
+        died_now[live] = died
+        return died_now
+
+    def _candidates(self, first, last):
+        """Rows whose columns overlap [first, last], in load order"""
+        lo = np.searchsorted(self._sorted_first, first - self._max_span, side="left")
+        hi = np.searchsorted(self._sorted_first, last, side="right")
+        rows = np.sort(self._by_col[lo:hi])
+        return rows[self.last_col[rows] >= first]
+
+    def _sweep(self, rows, x0, y0, dx, dy):
+        """(contact, entry time) per agent and candidate, as check_objects computes them"""
+        width = self.width
+        height = self.height
+        x0 = x0[:, None]
+        y0 = y0[:, None]
+        dx = dx[:, None]
+        dy = dy[:, None]
+        left = self.left[rows] - width
+        right = self.right[rows]
+        top = self.top[rows] - height
+        bottom = self.bottom[rows]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            near = (left - x0) / dx
+            far = (right - x0) / dx
+            moving = dx != 0
+            entry = np.where(moving, np.maximum(np.minimum(near, far), 0.0), 0.0)
+            leave = np.where(moving, np.minimum(np.maximum(near, far), 1.0),
+                             np.where((left < x0) & (x0 < right), 1.0, 0.0))
+
+            near = (top - y0) / dy
+            far = (bottom - y0) / dy
+            moving = dy != 0
+            entry = np.where(moving, np.maximum(entry, np.minimum(near, far)), entry)
+            leave = np.where(moving, np.minimum(leave, np.maximum(near, far)),
+                             np.where((top < y0) & (y0 < bottom), leave, entry))
+        return entry < leave, entry
+
+    def _bottom_on_arrival(self, obj, x0, y0, dx, dy):
+        """collision.bottom_on_arrival for each agent against its own object"""
+        left = self.left[obj] - self.width
+        right = self.right[obj]
+        t = np.zeros(len(obj))
+        ahead = (dx > 0) & (x0 + self.width <= self.left[obj])
+        behind = ~ahead & (dx < 0) & (x0 >= right)
+        t[ahead] = (left[ahead] - x0[ahead]) / dx[ahead]
+        t[behind] = (right[behind] - x0[behind]) / dx[behind]
+        return y0 + dy * t + self.height
+
+    def _apply_effects(self, agents, obj, pressed, jump_buffer, y_vel, gravity, jump_strength, speed):
+        """Trigger and portal effects for agents touching obj untriggered; returns which fired"""
+        effect = self.effect[obj]
+        power = self.power[obj]
+
+        pad = effect == SET_VELOCITY
+        y_vel[agents[pad]] = power[pad]
+
+        # Orbs wait, still untriggered, until jump is wanted (held or buffered)
+        orb_touched = effect == ORB_VELOCITY
+        orb = orb_touched & (pressed[agents] | (jump_buffer[agents] > 0))
+        y_vel[agents[orb]] = power[orb]
+        jump_buffer[agents[orb]] = 0
+
+        flip = agents[effect == FLIP_GRAVITY]
+        gravity[flip] *= -1
+        jump_strength[flip] *= -1
+
+        fast = effect == SET_SPEED
+        speed[agents[fast]] = self.initial_state['speed'] * power[fast]
+        return ~orb_touched | orb
+
+    @property
+    def alive(self):
+        return ~self.is_dead
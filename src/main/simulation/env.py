@@ -0,0 +1,342 @@
+"""
+Reinforcement Learning Environment
+Gym-style reset/step API over the headless game, plus a pool of environments
+stepped across worker processes through shared memory.
+
+The action is 0 (release) or 1 (hold jump). The observation is a uint8 grid
+raster of the level around the player: one cell per OBSERVATION_CELL pixels,
+VIEW_BEHIND columns behind the player's column and VIEW_AHEAD ahead, the full
+screen height, with each cell holding the code of what occupies it (see
+EMPTY..PLAYER). The level's raster is painted once from GameState.objects when
+the level loads, so an observation is an array slice. Reward is the distance
+run this tick in grid columns, with DEATH_REWARD on death and
+COMPLETION_REWARD for reaching the level end.
+
+GeoEnv is one environment on a HeadlessSimulation. BatchEnv steps many at
+once with BatchPlayers and gives exactly the same observations and rewards;
+EnvPool splits a BatchEnv's worth of environments across processes. Nothing
+here opens a window: environments run on GameState with no display. The API
+follows Gymnasium's (reset -> (obs, info), step -> (obs, reward, terminated,
+truncated, info)) without depending on it.
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from main.simulation.headless import HeadlessSimulation
+from main.simulation.batch_players import BatchPlayers
+from main.objects.game_object import SolidObject, HazardObject, TriggerObject, PortalObject
+from main.constants import GRID_SIZE, SCREEN_HEIGHT, FPS
+
+# Cell codes
+EMPTY, SOLID, HAZARD, TRIGGER, PORTAL, PLAYER = range(6)
+
+OBSERVATION_CELL = GRID_SIZE // 2
+VIEW_BEHIND = 4
+VIEW_AHEAD = 28
+DEATH_REWARD = -1.0
+COMPLETION_REWARD = 10.0
+DEFAULT_MAX_STEPS = FPS * 60 * 5
+
+_CODES = ((SolidObject, SOLID), (HazardObject, HAZARD), (TriggerObject, TRIGGER), (PortalObject, PORTAL))
+
+
+def cell_code(obj):
+    for cls, code in _CODES:
+        if isinstance(obj, cls):
+            return code
+    return EMPTY
+
+
+def paint_level(game_state, cell, pad):
+    """The loaded level as cell codes, with pad empty columns on each side"""
+    rows = SCREEN_HEIGHT // cell
+    columns = int(-(-game_state.level_end // cell)) + 1
+    raster = np.zeros((rows, columns + 2 * pad), dtype=np.uint8)
+
+    floor = game_state.floor.rect
+    raster[max(0, floor.top // cell):, :] = SOLID
+    objects = game_state.objects
+    if len(objects) != len(game_state.spatial_index):
+        # A LevelStore only builds its stateful objects up front
+        objects = game_state.spatial_index.query(0, game_state.level_end)
+    # Load order, so later objects paint over earlier ones as they draw over them
+    for obj in objects:
+        code = cell_code(obj)
+        if code == EMPTY:
+            continue
+        rect = obj.rect
+        top = max(0, rect.top // cell)
+        bottom = min(rows, -(-rect.bottom // cell))
+        left = max(0, pad + rect.left // cell)
+        if top < bottom:
+            raster[top:bottom, left:pad + -(-rect.right // cell)] = code
+    return raster
+
+
+class GeoEnv:
+    """One level as a Gym-style environment; actions are 0 (no jump) or 1 (jump)"""
+    action_count = 2
+    observation_dtype = np.uint8
+
+    def __init__(self, level_data, max_steps=DEFAULT_MAX_STEPS, cell=OBSERVATION_CELL,
+                 view_behind=VIEW_BEHIND, view_ahead=VIEW_AHEAD):
+        self.sim = HeadlessSimulation(level_data)
+        self.max_steps = max_steps
+        self.cell = cell
+        self.view_behind = view_behind
+        self.view_ahead = view_ahead
+        self.rows = SCREEN_HEIGHT // cell
+        self.observation_shape = (self.rows, view_behind + view_ahead)
+        self.raster = paint_level(self.sim.game_state, cell, view_behind + view_ahead)
+        self._last_x = 0
+
+    def observe(self, out=None):
+        """Raster around the player with the player's box marked; writes into out if given"""
+        player = self.sim.player
+        cell = self.cell
+        column = int(player.display_x // cell)
+        if out is None:
+            out = np.empty(self.observation_shape, dtype=np.uint8)
+        window = self.raster[:, self.view_ahead + column:self.view_ahead + column + out.shape[1]]
+        out[:, :window.shape[1]] = window
+        if window.shape[1] < out.shape[1]:
+            out[:, window.shape[1]:] = EMPTY
+
+        top = max(0, int(player.y // cell))
+        bottom = min(self.rows, int(-(-(player.y + player.height) // cell)))
+        right = self.view_behind + int(-(-(player.display_x + player.width) // cell)) - column
+        if top < bottom:
+            out[top:bottom, self.view_behind:right] = PLAYER
+        return out
+
+    def _info(self):
+        return {"tick": self.sim.tick, "distance": self.sim.player.display_x,
+                "completed": self.sim.completed}
+
+    def reset(self, seed=None, out=None):
+        """Restart the level; the game is deterministic, so seed is accepted and ignored"""
+        self.sim.reset()
+        self._last_x = self.sim.player.display_x
+        return self.observe(out), self._info()
+
+    def step(self, action, out=None):
+        sim = self.sim
+        sim.step(bool(action))
+        player = sim.player
+        reward = (player.display_x - self._last_x) / GRID_SIZE
+        self._last_x = player.display_x
+
+        completed = sim.completed
+        terminated = player.is_dead or completed
+        if player.is_dead:
+            reward += DEATH_REWARD
+        elif completed:
+            reward += COMPLETION_REWARD
+        truncated = not terminated and sim.tick >= self.max_steps
+        return self.observe(out), reward, terminated, truncated, self._info()
+
+
+class BatchEnv:
+    """count GeoEnvs in one BatchPlayers pass; finished environments restart by themselves
+
+    step() gives what GeoEnv.step would for each environment, except that an
+    environment whose episode ended comes back with the first observation of
+    its next episode.
+    """
+    action_count = 2
+    observation_dtype = np.uint8
+
+    def __init__(self, level_data, count, max_steps=DEFAULT_MAX_STEPS, cell=OBSERVATION_CELL,
+                 view_behind=VIEW_BEHIND, view_ahead=VIEW_AHEAD):
+        probe = HeadlessSimulation(level_data)
+        game_state = probe.game_state
+        self.count = count
+        self.players = BatchPlayers(level_data, game_state.floor, game_state.player, count)
+        self.level_end = game_state.level_end
+        self.max_steps = max_steps
+        self.cell = cell
+        self.view_behind = view_behind
+        self.rows = SCREEN_HEIGHT // cell
+        self.observation_shape = (self.rows, view_behind + view_ahead)
+
+        # One extra empty column past the end stands in for anything beyond the raster
+        raster = paint_level(game_state, cell, view_behind + view_ahead)
+        self._columns = np.ascontiguousarray(np.concatenate(
+            (raster, np.zeros((self.rows, 1), dtype=np.uint8)), axis=1).T)
+        self._window = view_ahead + np.arange(self.observation_shape[1])
+        self._rows = np.arange(self.rows)[None, :, None]
+        self._view = np.arange(self.observation_shape[1])[None, None, :]
+        self.ticks = np.zeros(count, dtype=np.int64)
+
+    def observe(self, out=None):
+        """Every environment's observation, as GeoEnv.observe, into out (count, rows, columns)"""
+        players = self.players
+        cell = self.cell
+        if out is None:
+            out = np.empty((self.count,) + self.observation_shape, dtype=np.uint8)
+        column = (players.display_x // cell).astype(np.int64)
+        index = np.minimum(column[:, None] + self._window, len(self._columns) - 1)
+        out[:] = self._columns[index].transpose(0, 2, 1)
+
+        top = np.maximum(0, players.y // cell)[:, None, None]
+        bottom = np.minimum(self.rows, -(-(players.y + players.height) // cell))[:, None, None]
+        right = (self.view_behind - column + (-(-(players.display_x + players.width) // cell)))[:, None, None]
+        box = ((self._rows >= top) & (self._rows < bottom) &
+               (self._view >= self.view_behind) & (self._view < right))
+        out[box] = PLAYER
+        return out
+
+    def reset(self, out=None):
+        self.players.reset()
+        self.ticks[:] = 0
+        return self.observe(out)
+
+    def step(self, actions, out=None, rewards=None, terminated=None, truncated=None):
+        """Step every environment; results go into the given arrays (new ones if omitted)"""
+        players = self.players
+        last_x = players.display_x.copy()
+        died = players.step(np.asarray(actions, dtype=bool))
+        self.ticks += 1
+
+        if rewards is None:
+            rewards = np.empty(self.count, dtype=np.float64)
+        rewards[:] = (players.display_x - last_x) / GRID_SIZE
+        completed = ~died & (players.display_x >= self.level_end)
+        rewards[died] += DEATH_REWARD
+        rewards[completed] += COMPLETION_REWARD
+        done = died | completed
+        timed_out = ~done & (self.ticks >= self.max_steps)
+        if terminated is None:
+            terminated = np.empty(self.count, dtype=bool)
+        if truncated is None:
+            truncated = np.empty(self.count, dtype=bool)
+        terminated[:] = done
+        truncated[:] = timed_out
+
+        finished = done | timed_out
+        if finished.any():
+            players.restart(finished)
+            self.ticks[finished] = 0
+        return self.observe(out), rewards, terminated, truncated
+
+
+class _Buffers:
+    """Pool arrays laid out in one shared memory block"""
+    def __init__(self, count, obs_shape, name=None):
+        fields = [
+            ("obs", np.uint8, (count,) + tuple(obs_shape)),
+            ("actions", np.uint8, (count,)),
+            ("rewards", np.float64, (count,)),
+            ("terminated", np.bool_, (count,)),
+            ("truncated", np.bool_, (count,)),
+        ]
+        size = sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for _, dtype, shape in fields)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        offset = 0
+        for field, dtype, shape in fields:
+            array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        for field in ("obs", "actions", "rewards", "terminated", "truncated"):
+            setattr(self, field, None)
+        self.shm.close()
+
+
+def _serve(conn, level_data, env_kwargs, count, obs_shape, shm_name, first, last):
+    """Worker loop: owns pool slots first..last-1 as one BatchEnv and steps them on each command"""
+    buffers = _Buffers(count, obs_shape, shm_name)
+    env = BatchEnv(level_data, last - first, **env_kwargs)
+    slots = slice(first, last)
+    try:
+        while True:
+            command = conn.recv()
+            if command == "step":
+                env.step(buffers.actions[slots], buffers.obs[slots], buffers.rewards[slots],
+                         buffers.terminated[slots], buffers.truncated[slots])
+            elif command == "reset":
+                env.reset(buffers.obs[slots])
+            else:
+                break
+            conn.send(None)
+    finally:
+        buffers.close()
+        conn.close()
+
+
+class EnvPool:
+    """count environments stepped together; with workers > 0 they are split across processes
+
+    Each worker steps its share of the environments as one BatchEnv. Observations,
+    actions, rewards and done flags live in shared memory, so a step sends one
+    short command per worker. Finished environments restart by themselves: the
+    observation returned for them is the first of the next episode.
+    """
+    def __init__(self, level_data, count, workers=0, **env_kwargs):
+        self.count = count
+        workers = min(workers, count)
+        # In process the whole pool is this one BatchEnv; otherwise it only gives the shapes
+        self.env = BatchEnv(level_data, 0 if workers else count, **env_kwargs)
+        self.observation_shape = self.env.observation_shape
+        self.action_count = self.env.action_count
+        self.buffers = _Buffers(count, self.observation_shape)
+        self.workers = []
+
+        bounds = np.linspace(0, count, workers + 1).astype(int)
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            parent, child = mp.Pipe()
+            process = mp.Process(
+                target=_serve, daemon=True,
+                args=(child, level_data, env_kwargs, count, self.observation_shape,
+                      self.buffers.shm.name, int(first), int(last)))
+            process.start()
+            child.close()
+            self.workers.append((process, parent))
+
+    def _broadcast(self, command):
+        for _, conn in self.workers:
+            conn.send(command)
+        for _, conn in self.workers:
+            conn.recv()
+
+    def reset(self):
+        """Observations of every environment at its level start (a view into shared memory)"""
+        if self.workers:
+            self._broadcast("reset")
+        else:
+            self.env.reset(self.buffers.obs)
+        return self.buffers.obs
+
+    def step(self, actions):
+        """Step every environment; returns (obs, rewards, terminated, truncated) views"""
+        buffers = self.buffers
+        buffers.actions[:] = actions
+        if self.workers:
+            self._broadcast("step")
+        else:
+            self.env.step(buffers.actions, buffers.obs, buffers.rewards, buffers.terminated, buffers.truncated)
+        return buffers.obs, buffers.rewards, buffers.terminated, buffers.truncated
+
+    def close(self):
+        for process, conn in self.workers:
+            conn.send("close")
+        for process, conn in self.workers:
+            process.join()
+            conn.close()
+        self.workers = []
+        self.buffers.close()
+        self.buffers.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,116 @@
+"""
+Headless Simulation
+Steps a level at a fixed tick with scripted jump input and no rendering.
+
+Usage (from the src directory):
+    python -m main.simulation.headless <level_file> [level] [--jumps 12,40,41]
+"""
+
+import sys
+import json
+import time
+from collections import namedtuple
+
+from main.game_state import GameState
+from main.controller.scripted_controls import ScriptedController
+from main.level_pack import LevelPack, PACK_EXTENSION
+
+DEFAULT_MAX_TICKS = 60 * 60 * 10
+
+SimulationResult = namedtuple("SimulationResult", ["completed", "died", "ticks", "distance"])
+
+
+class HeadlessSimulation:
+    """Runs GameState.update without a display, one fixed tick per step"""
+    def __init__(self, level_data):
+        self.level_data = level_data
+        self.controller = ScriptedController()
+        self.game_state = GameState(None, self.controller)
+        # Particles are purely cosmetic, so skip them when nothing is drawn
+        self.game_state.effects = False
+        self.tick = 0
+        self.game_state.load_level_data(self.level_data)
+    
+    @classmethod
+    def from_file(cls, path, level=0):
+        if path.endswith(PACK_EXTENSION):
+            with LevelPack(path) as pack:
+                return cls(pack.level(level))
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data[level])
+    
+    @property
+    def player(self):
+        return self.game_state.player
+    
+    @property
+    def completed(self):
+        return not self.player.is_dead and self.player.display_x >= self.game_state.level_end
+    
+    def reset(self):
+        self.game_state.reset_level()
+        self.controller.set_jump(False)
+        self.tick = 0
+    
+    def save_state(self):
+        return self.tick, self.game_state.save_state()
+    
+    def restore_state(self, state):
+        self.tick, game_state = state
+        self.game_state.restore_state(game_state)
+    
+    def step(self, jump=False):
+        """Advance one tick holding (or not holding) jump; returns True once the run is over"""
+        self.controller.set_jump(jump)
+        self.game_state.update()
+        self.tick += 1
+        return self.player.is_dead or self.completed
+    
+    def run(self, jump_ticks=(), max_ticks=DEFAULT_MAX_TICKS):
+        """Play the level from the start, holding jump on every tick in jump_ticks"""
+        jump_ticks = set(jump_ticks)
+        self.reset()
+        while self.tick < max_ticks:
+            if self.step(self.tick in jump_ticks):
+                break
+        return SimulationResult(
+            completed=self.completed,
+            died=self.player.is_dead,
+            ticks=self.tick,
+            distance=self.player.display_x,
+        )
+
+
+def parse_jumps(text):
+    return [int(tick) for tick in text.split(",") if tick.strip()]
+
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage: python -m main.simulation.headless <level_file> [level] [--jumps 12,40,41]")
+        return 1
+    
+    args = argv[1:]
+    jumps = []
+    if "--jumps" in args:
+        i = args.index("--jumps")
+        jumps = parse_jumps(args[i + 1])
+        del args[i:i + 2]
+    
+    path = args[0]
+    level = int(args[1]) if len(args) > 1 else 0
+    
+    sim = HeadlessSimulation.from_file(path, level)
+    start = time.perf_counter()
+    result = sim.run(jumps)
+    elapsed = time.perf_counter() - start
+    
+    status = "COMPLETED" if result.completed else ("DIED" if result.died else "TIMEOUT")
+    print(f"[{status}] level {level} of {path}: {result.ticks} ticks, distance {result.distance}")
+    print(f"Simulated {result.ticks / max(elapsed, 1e-9):.0f} ticks/sec")
+    return 0 if result.completed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
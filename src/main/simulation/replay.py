@@ -0,0 +1,199 @@
+"""
+Input Recording and Replay
+Records per-tick jump input as run lengths and replays it deterministically.
+
+A recording stores the level it was made on, the particle seed, the jump
+input as alternating released/held run lengths, and a chained state hash:
+after every tick the hash absorbs the full game state, and its value is
+saved every HASH_INTERVAL ticks. A replay recomputes the chain, so any
+divergence on any tick is caught at the next saved checkpoint.
+
+Usage (from the src directory):
+    python -m main.simulation.replay <replay.json> [--level-file path]
+"""
+
+import sys
+import json
+import time
+import hashlib
+
+import pygame
+from main.simulation.headless import HeadlessSimulation
+from main.level_pack import read_levels, level_hash
+from main.constants import FPS
+
+# 2: player state gained jump buffering and coyote time, so version 1 hashes no longer match
+# 3: particles hash their colour and size rather than a stamp slot number
+RECORDING_VERSION = 3
+HASH_INTERVAL = 60
+
+
+class StateHasher:
+    """Running hash over the game state of every tick"""
+    def __init__(self):
+        self.digest = b""
+
+    def update(self, game_state):
+        h = hashlib.blake2b(self.digest, digest_size=16)
+        h.update(repr(game_state.save_state()).encode("utf-8"))
+        h.update(game_state.particle_system.state_bytes())
+        self.digest = h.digest()
+
+    def hexdigest(self):
+        return self.digest.hex()
+
+
+class InputRecording:
+    """Jump bits for each tick, run-length encoded"""
+    def __init__(self, level_file=None, level=0, level_hash=None, seed=0):
+        self.level_file = level_file
+        self.level = level
+        self.level_hash = level_hash
+        self.seed = seed
+        # Alternating run lengths, starting with a released run (possibly 0)
+        self.runs = [0]
+        self.ticks = 0
+        self.hashes = {}
+
+    def append(self, pressed):
+        held = len(self.runs) % 2 == 0
+        if bool(pressed) != held:
+            self.runs.append(0)
+        self.runs[-1] += 1
+        self.ticks += 1
+
+    def bits(self):
+        pressed = False
+        for length in self.runs:
+            for _ in range(length):
+                yield pressed
+            pressed = not pressed
+
+    def to_dict(self):
+        return {
+            "version": RECORDING_VERSION,
+            "level_file": self.level_file,
+            "level": self.level,
+            "level_hash": self.level_hash,
+            "seed": self.seed,
+            "ticks": self.ticks,
+            "runs": self.runs,
+            "hash_interval": HASH_INTERVAL,
+            "hashes": {str(tick): digest for tick, digest in self.hashes.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version {data.get('version')!r}")
+        recording = cls(data["level_file"], data["level"], data["level_hash"], data["seed"])
+        recording.runs = list(data["runs"])
+        recording.ticks = data["ticks"]
+        recording.hashes = {int(tick): digest for tick, digest in data["hashes"].items()}
+        return recording
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+class ReplayRecorder:
+    """Records a live GameState tick by tick; call record_tick() after each update()"""
+    def __init__(self, game_state, level_file, level, seed, content_hash=None):
+        self.game_state = game_state
+        if content_hash is None:
+            content_hash = level_hash(game_state.level_data)
+        self.recording = InputRecording(level_file, level, content_hash, seed)
+        self.hasher = StateHasher()
+        game_state.particle_system.clear()
+        game_state.particle_system.reseed(seed)
+
+    def record_tick(self):
+        self.recording.append(self.game_state.player.controller.is_pressed(pygame.K_SPACE))
+        self.hasher.update(self.game_state)
+        if self.recording.ticks % HASH_INTERVAL == 0:
+            self.recording.hashes[self.recording.ticks] = self.hasher.hexdigest()
+
+    def finish(self):
+        """The recording, with a hash for the final tick"""
+        self.recording.hashes[self.recording.ticks] = self.hasher.hexdigest()
+        return self.recording
+
+
+class ReplayResult:
+    def __init__(self, ticks, elapsed, mismatch_tick=None):
+        self.ticks = ticks
+        self.elapsed = elapsed
+        # First saved checkpoint whose hash differed, or None if bit-exact
+        self.mismatch_tick = mismatch_tick
+
+    @property
+    def deterministic(self):
+        return self.mismatch_tick is None
+
+    @property
+    def speedup(self):
+        """How many times faster than real time the replay ran"""
+        return self.ticks / FPS / max(self.elapsed, 1e-9)
+
+
+def play_replay(recording, level_data, stop_on_mismatch=True):
+    """Replay a recording headlessly and check it against the recorded hashes"""
+    sim = HeadlessSimulation(level_data)
+    game_state = sim.game_state
+    # The recording was made with particles on, and they are part of the hashed state
+    game_state.effects = True
+    game_state.particle_system.clear()
+    game_state.particle_system.reseed(recording.seed)
+
+    hasher = StateHasher()
+    mismatch = None
+    tick = 0
+    start = time.perf_counter()
+    for pressed in recording.bits():
+        sim.controller.set_jump(pressed)
+        game_state.update()
+        hasher.update(game_state)
+        tick += 1
+        expected = recording.hashes.get(tick)
+        if expected is not None and expected != hasher.hexdigest():
+            mismatch = tick
+            if stop_on_mismatch:
+                break
+    return ReplayResult(tick, time.perf_counter() - start, mismatch)
+
+
+def main(argv):
+    args = argv[1:]
+    level_file = None
+    if "--level-file" in args:
+        i = args.index("--level-file")
+        level_file = args[i + 1]
+        del args[i:i + 2]
+    if not args:
+        print("Usage: python -m main.simulation.replay <replay.json> [--level-file path]")
+        return 1
+
+    recording = InputRecording.load(args[0])
+    levels = read_levels(level_file or recording.level_file)
+    if recording.level >= len(levels):
+        print(f"Level {recording.level} not found in {level_file or recording.level_file}")
+        return 1
+    level_data = levels[recording.level]
+    if level_hash(level_data) != recording.level_hash:
+        print("Warning: level data differs from the recorded level")
+
+    result = play_replay(recording, level_data)
+    status = "[OK]" if result.deterministic else f"[FAIL] diverged by tick {result.mismatch_tick}"
+    print(f"{status} replayed {result.ticks}/{recording.ticks} ticks "
+          f"in {result.elapsed:.3f}s ({result.speedup:.0f}x real time)")
+    return 0 if result.deterministic else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
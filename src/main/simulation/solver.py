@@ -0,0 +1,349 @@
+"""
+Level Solver
+Searches jump timings to prove each level can be completed.
+
+The search is a breadth-first sweep over ticks. Every live state branches on
+jump / no jump, identical states are merged (keeping the one with fewer
+presses), and the frontier is capped at a beam width. Levels, and branches
+of a single level, are spread across a process pool.
+
+Each explored state costs one restore and one or two simulated ticks, around
+30-50us, so a search costs about ticks x frontier size. On open ground the
+frontier is one state per tick of a jump arc (about 50), so a 5000-tick level
+takes several seconds on one core whatever the beam. The beam bites where
+branches multiply, around orbs and portals: the default of 200 gives the same
+verdicts as 2000 on the shipped and generated levels in a fraction of the
+time, but it can drop a branch a level needs, so rerun a [FAIL] with a wider
+--beam before trusting it.
+
+Usage (from the src directory):
+    python -m main.simulation.solver <level_file> [level_file ...] [--workers N] [--beam N] [--json]
+"""
+
+import os
+import sys
+import argparse
+import json
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from main.simulation.headless import HeadlessSimulation, DEFAULT_MAX_TICKS
+from main.objects.spatial_index import SpatialIndex
+from main.level_pack import read_levels
+
+DEFAULT_BEAM_WIDTH = 200
+WINDOW_SEARCH = 10
+
+SolveResult = namedtuple("SolveResult", ["completed", "ticks", "jumps", "explored"])
+LevelReport = namedtuple("LevelReport", ["path", "level", "completed", "ticks", "jumps", "windows", "explored"])
+
+
+class _Node:
+    __slots__ = ("state", "presses", "jumps")
+    
+    def __init__(self, state, presses, jumps):
+        self.state = state
+        self.presses = presses
+        # Jump ticks as a linked list (tick, parent) so branches share history
+        self.jumps = jumps
+
+
+def _unwind(jumps):
+    ticks = []
+    while jumps is not None:
+        ticks.append(jumps[0])
+        jumps = jumps[1]
+    return ticks[::-1]
+
+
+def _link(ticks):
+    jumps = None
+    for tick in ticks:
+        jumps = (tick, jumps)
+    return jumps
+
+
+class LevelSolver:
+    """Beam-limited BFS over per-tick jump decisions for one level"""
+    def __init__(self, level_data, beam_width=DEFAULT_BEAM_WIDTH, max_ticks=DEFAULT_MAX_TICKS):
+        self.sim = HeadlessSimulation(level_data)
+        self.beam_width = beam_width
+        self.max_ticks = max_ticks
+        # Triggers and orbs, the only things a press in the air can act on
+        self.stateful_index = SpatialIndex(self.sim.game_state.stateful_objects)
+        # Furthest player x any explored branch has reached
+        self.furthest = 0
+    
+    @staticmethod
+    def _state_key(state):
+        (display_x, y, y_vel, speed, gravity, _, on_ground, _,
+         _, _, jump_held, jump_buffer, coyote) = state[1][0]
+        # prev_* are overwritten at the start of each update, so they are left out.
+        # Floats are rounded so paths that reach the same state by different sums merge.
+        return (display_x, round(y, 6), round(y_vel, 6), speed, gravity, on_ground,
+                jump_held, jump_buffer, coyote, state[1][1])
+    
+    @staticmethod
+    def _outcome(state):
+        """The tick's result apart from the jump input bookkeeping (held, buffer, coyote)"""
+        player_state, object_states = state[1][:2]
+        return player_state[:-3], object_states
+    
+    def _expand(self, frontier):
+        """Advance every node one tick; returns (next_frontier, completed_nodes)"""
+        sim = self.sim
+        next_frontier = {}
+        completed = []
+        for node in frontier:
+            sim.restore_state(node.state)
+            coyote = sim.player.coyote
+            sim.step(False)
+            if sim.player.is_dead:
+                # Jump is applied after collisions, so it cannot save this tick
+                continue
+            # One snapshot per child serves the trigger check, the merge key and the node itself
+            state = sim.save_state()
+            # Holding jump matters on the ground, in coyote time or when a trigger fires
+            jump_matters = sim.player.on_ground or coyote or state[1][1] != node.state[1][1]
+            # In the air a press can still fire an orb, which only reacts to a wanted jump,
+            # so compare the outcome with and without it (ignoring the input fields themselves)
+            released = None
+            if not jump_matters and self.stateful_index.near_player(sim.player):
+                released = self._outcome(state)
+            self._add_child(node, False, state, next_frontier, completed)
+            if jump_matters or released is not None:
+                sim.restore_state(node.state)
+                sim.step(True)
+                if not sim.player.is_dead:
+                    state = sim.save_state()
+                    if jump_matters or self._outcome(state) != released:
+                        self._add_child(node, True, state, next_frontier, completed)
+        
+        nodes = list(next_frontier.values())
+        if len(nodes) > self.beam_width:
+            nodes.sort(key=lambda n: n.presses)
+            nodes = nodes[:self.beam_width]
+        return nodes, completed
+    
+    def _add_child(self, node, jump, state, next_frontier, completed):
+        """Keep state, the simulation's current state, as a child of node"""
+        presses = node.presses + jump
+        jumps = (node.state[0], node.jumps) if jump else node.jumps
+        child = _Node(state, presses, jumps)
+        self.furthest = max(self.furthest, self.sim.player.display_x)
+        if self.sim.completed:
+            completed.append(child)
+            return
+        key = self._state_key(state)
+        best = next_frontier.get(key)
+        if best is None or presses < best.presses:
+            next_frontier[key] = child
+    
+    def root(self):
+        self.sim.reset()
+        return _Node(self.sim.save_state(), 0, None)
+    
+    def split(self, count):
+        """Expand from the start until there are at least count branches to hand out"""
+        frontier = [self.root()]
+        while 0 < len(frontier) < count:
+            frontier, completed = self._expand(frontier)
+            if completed:
+                return [min(completed, key=lambda n: n.presses)]
+        return frontier
+    
+    def search(self, frontier=None):
+        """Run the search to the first tick at which any branch completes"""
+        if frontier is None:
+            frontier = [self.root()]
+        explored = 0
+        while frontier:
+            done = [n for n in frontier if self._is_complete(n)]
+            if done:
+                return self._result(min(done, key=lambda n: n.presses), explored)
+            if frontier[0].state[0] >= self.max_ticks:
+                break
+            explored += len(frontier)
+            frontier, completed = self._expand(frontier)
+            if completed:
+                return self._result(min(completed, key=lambda n: n.presses), explored)
+        return SolveResult(False, 0, [], explored)
+    
+    def _is_complete(self, node):
+        self.sim.restore_state(node.state)
+        return self.sim.completed
+    
+    def _result(self, node, explored):
+        return SolveResult(True, node.state[0], _unwind(node.jumps), explored)
+    
+    def play(self, jumps, held_from=None, max_hold=WINDOW_SEARCH * 3, reference=None, resume_at=0, rejoin_after=0):
+        """Replay tapped jump ticks, plus one press held from held_from until it takes effect
+
+        reference, the snapshots of a completing run with the same jumps before
+        resume_at and after rejoin_after, lets the replay start from its state at
+        resume_at, and finish early once it is back in the reference's state.
+        """
+        sim = self.sim
+        jumps = set(jumps)
+        if reference is None:
+            sim.reset()
+        else:
+            sim.restore_state(reference[resume_at])
+        holding = False
+        while sim.tick < self.max_ticks:
+            if sim.tick == held_from:
+                holding = True
+                hold_until = sim.tick + max_hold
+            if holding and sim.tick < hold_until:
+                before = sim.save_state()
+                sim.step(False)
+                released = sim.save_state()
+                sim.restore_state(before)
+                sim.step(True)
+                # The press is used up on the first tick where it changes the outcome
+                if sim.save_state()[1] != released[1]:
+                    holding = False
+            else:
+                sim.step(sim.tick in jumps)
+            if sim.player.is_dead or sim.completed:
+                break
+            if (reference is not None and sim.tick > rejoin_after and sim.tick < len(reference)
+                    and (not holding or sim.tick >= hold_until) and sim.save_state() == reference[sim.tick]):
+                # From here on the inputs and state are the reference's, which completes
+                return True
+        return sim.completed
+    
+    def timing_windows(self, jumps, search=WINDOW_SEARCH):
+        """For each jump, the ticks a player can start holding it with the rest unchanged"""
+        # Every probe matches the solution up to the earlier of its press and the
+        # jump it moves, and after the later of them once its state catches up
+        snapshots = self._snapshots(jumps)
+        windows = []
+        for i, tick in enumerate(jumps):
+            others = jumps[:i] + jumps[i + 1:]
+            lo = hi = tick
+            for direction in (-1, 1):
+                for offset in range(1, search + 1):
+                    start = tick + direction * offset
+                    if start < 0 or start in others:
+                        break
+                    if not self.play(others, start, reference=snapshots,
+                                     resume_at=min(start, tick), rejoin_after=max(start, tick)):
+                        break
+                    if direction < 0:
+                        lo = start
+                    else:
+                        hi = start
+            windows.append((tick, lo, hi))
+        return windows
+    
+    def _snapshots(self, jumps):
+        """The state before every tick of a run tapping jumps"""
+        sim = self.sim
+        jumps = set(jumps)
+        sim.reset()
+        snapshots = [sim.save_state()]
+        while sim.tick < self.max_ticks and not sim.step(sim.tick in jumps):
+            snapshots.append(sim.save_state())
+        return snapshots
+
+
+def _search_task(level_data, seeds, beam_width, max_ticks):
+    solver = LevelSolver(level_data, beam_width, max_ticks)
+    frontier = None
+    if seeds is not None:
+        frontier = [_Node(state, presses, _link(jumps)) for state, presses, jumps in seeds]
+    return solver.search(frontier)
+
+
+def _window_task(level_data, jumps, max_ticks):
+    return LevelSolver(level_data, max_ticks=max_ticks).timing_windows(jumps)
+
+
+def _merge(results):
+    wins = [r for r in results if r.completed]
+    explored = sum(r.explored for r in results)
+    if not wins:
+        return SolveResult(False, 0, [], explored)
+    best = min(wins, key=lambda r: (r.ticks, len(r.jumps)))
+    return best._replace(explored=explored)
+
+
+def verify_levels(paths, workers=None, beam_width=DEFAULT_BEAM_WIDTH, max_ticks=DEFAULT_MAX_TICKS):
+    """Solve every level in every file, fanning out across a process pool"""
+    workers = workers or os.cpu_count() or 1
+    levels = []
+    for path in paths:
+        for index, level_data in enumerate(read_levels(path)):
+            levels.append((path, index, level_data))
+    
+    # Hand each level enough branches to keep every worker busy
+    branches = max(1, workers // max(1, len(levels)))
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        searches = []
+        for path, index, level_data in levels:
+            if branches > 1:
+                nodes = LevelSolver(level_data, beam_width, max_ticks).split(branches)
+                groups = [nodes[i::branches] for i in range(min(branches, len(nodes)))] or [[]]
+                futures = [
+                    pool.submit(_search_task, level_data,
+                                [(n.state, n.presses, _unwind(n.jumps)) for n in group],
+                                beam_width, max_ticks)
+                    for group in groups
+                ]
+            else:
+                futures = [pool.submit(_search_task, level_data, None, beam_width, max_ticks)]
+            searches.append(futures)
+        
+        solved = [_merge([f.result() for f in futures]) for futures in searches]
+        
+        window_futures = [
+            pool.submit(_window_task, level_data, result.jumps, max_ticks) if result.completed else None
+            for (_, _, level_data), result in zip(levels, solved)
+        ]
+        
+        reports = []
+        for (path, index, _), result, future in zip(levels, solved, window_futures):
+            windows = future.result() if future is not None else []
+            reports.append(LevelReport(path, index, result.completed, result.ticks,
+                                       result.jumps, windows, result.explored))
+    return reports
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m main.simulation.solver",
+                                     description="Check that every level can be completed.")
+    parser.add_argument("level_files", nargs="+", metavar="level_file")
+    parser.add_argument("--workers", type=int, metavar="N")
+    parser.add_argument("--beam", type=int, metavar="N", default=DEFAULT_BEAM_WIDTH)
+    parser.add_argument("--max-ticks", type=int, metavar="N", default=DEFAULT_MAX_TICKS)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv[1:])
+    
+    start = time.perf_counter()
+    reports = verify_levels(args.level_files, args.workers, args.beam, args.max_ticks)
+    elapsed = time.perf_counter() - start
+    
+    if args.json:
+        print(json.dumps([r._asdict() for r in reports], indent=4))
+    else:
+        for r in reports:
+            status = "[OK]" if r.completed else "[FAIL]"
+            print(f"{status} {r.path} level {r.level}")
+            if r.completed:
+                print(f"    {r.ticks} ticks, {len(r.jumps)} jumps at ticks {r.jumps}")
+                if r.windows:
+                    tick, lo, hi = min(r.windows, key=lambda w: w[2] - w[1])
+                    print(f"    tightest window: jump at {tick} works from {lo} to {hi} ({hi - lo + 1} ticks)")
+            else:
+                print(f"    no completing input found ({r.explored} states explored)")
+        solved = sum(r.completed for r in reports)
+        print(f"\n{solved}/{len(reports)} levels beatable in {elapsed:.1f}s")
+    
+    return 0 if all(r.completed for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,116 @@
+"""
+Startup
+Brings up only the pygame subsystems the game uses, and times the way to the first menu frame.
+
+pygame.init() starts every subsystem pygame was built with, audio and
+joysticks included. The game needs the display, which also delivers events and
+key state, and fonts, which TextCache starts with the first text it renders.
+
+The startup timer starts when this module is first imported, which app.py
+does before anything else, and App marks each phase up to the first menu
+frame and the level index read behind it. The report runs that path once,
+lists the slowest imports from python -X importtime and fails when the first
+frame is over budget.
+
+Usage (from the src directory):
+    python -m main.startup [--budget MS] [--imports N]
+"""
+
+import os
+import sys
+import time
+
+from main.constants import STARTUP_BUDGET_MS
+
+FIRST_FRAME = "first frame"
+
+
+class StartupTimer:
+    """Named startup phases, each charged the time since the previous mark"""
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._last = self.start
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def elapsed(self, phase):
+        """ms from the start to the end of phase"""
+        total = 0.0
+        for name, ms in self.phases:
+            total += ms
+            if name == phase:
+                return total
+        return None
+
+
+startup = StartupTimer()
+
+
+def init_subsystems():
+    """Start the display (and with it events and input); fonts start on first use"""
+    import pygame
+    pygame.display.init()
+
+
+def import_times(limit):
+    """(package, ms) for the packages that take longest to import with app, from a fresh interpreter"""
+    import subprocess
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                            capture_output=True, text=True, env=env)
+    packages = {}
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us) / 1000
+    return sorted(packages.items(), key=lambda item: -item[1])[:limit]
+
+
+def main(argv):
+    # Imported here since app imports this module before anything else
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m main.startup",
+                                     description="Time startup to the first menu frame.")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, metavar="MS")
+    parser.add_argument("--imports", type=int, metavar="N", default=10, help="how many packages to list")
+    args = parser.parse_args(argv[1:])
+    budget = args.budget
+
+    import app
+    import pygame
+    game = app.App()
+    game.start()
+    game.main.preloader.shutdown()
+    pygame.quit()
+
+    # app imported its own copy of this module, and that is the one it marked
+    timer = app.startup
+    print("=" * 40)
+    print("Startup")
+    print("=" * 40)
+    for phase, ms in timer.phases:
+        print(f"{phase:<20} {ms:>9.1f} ms")
+    first_frame = timer.elapsed(FIRST_FRAME)
+    print(f"{'to first frame':<20} {first_frame:>9.1f} ms (budget {budget:.0f} ms)")
+
+    print("\nSlowest imports (self time by package, fresh interpreter)")
+    for package, ms in import_times(args.imports):
+        print(f"{package:<20} {ms:>9.1f} ms")
+
+    if first_frame > budget:
+        print(f"\nFirst menu frame took {first_frame:.0f} ms, over the {budget:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,33 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import app
+from main.constants import PLAYING
+
+
+@pytest.fixture
+def game():
+    game = app.App()
+    yield game
+    game.main.preloader.shutdown()
+    pygame.quit()
+
+
+def press(game, key):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=""))
+    game.handle_events()
+
+
+def test_enter_endless_mode_from_menu(game):
+    press(game, pygame.K_e)
+    assert game.state == PLAYING
+    assert game.main.game_state.endless is not None
+    assert game.main.watcher.path is None
+    # Play a few frames, including the hot reload poll
+    for _ in range(120):
+        game.handle_events()
+    assert game.main.game_state.player.display_x > 0
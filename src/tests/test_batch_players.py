@@ -0,0 +1,40 @@
+import os
+import json
+
+import numpy as np
+import pytest
+
+from main.simulation.headless import HeadlessSimulation
+from main.simulation.batch_players import BatchPlayers
+
+MAIN_DIR = os.path.join(os.path.dirname(__file__), "..", "main")
+AGENTS = 12
+TICKS = 1200
+
+
+def shipped_levels():
+    for name in ("objects.json", "demo_level.json"):
+        with open(os.path.join(MAIN_DIR, name)) as f:
+            for i, level_data in enumerate(json.load(f)):
+                yield pytest.param(level_data, id=f"{name}:{i}")
+
+
+@pytest.mark.parametrize("level_data", list(shipped_levels()))
+def test_batch_matches_players(level_data):
+    sims = [HeadlessSimulation(level_data) for _ in range(AGENTS)]
+    for sim in sims:
+        sim.reset()
+    batch = BatchPlayers(level_data, sims[0].game_state.floor, sims[0].player, AGENTS)
+    rng = np.random.default_rng(1)
+    # Every agent presses at its own rate, from almost never to most ticks
+    inputs = rng.random((TICKS, AGENTS)) < np.linspace(0.01, 0.5, AGENTS)
+
+    for tick in range(TICKS):
+        batch.step(inputs[tick])
+        for agent, sim in enumerate(sims):
+            if not sim.player.is_dead:
+                sim.step(bool(inputs[tick, agent]))
+            # Positions, velocities, death flags and the rest of the player state
+            assert batch.save_state(agent) == sim.player.save_state(), (tick, agent)
+        if batch.is_dead.all():
+            break
@@ -0,0 +1,21 @@
+import pytest
+
+from main.simulation import solver
+from main.benchmarks import suite, synthetic
+from main import level_validator, level_generator, startup
+
+
+@pytest.mark.parametrize("main, argv", [
+    (solver.main, ["main/objects.json", "--beam"]),
+    (solver.main, ["main/objects.json", "--beam", "wide"]),
+    (level_validator.main, ["main/objects.json", "--workers"]),
+    (suite.main, ["compare", "--threshold", "high"]),
+    (synthetic.main, ["lots", "out.json"]),
+    (level_generator.main, ["--chunks"]),
+    (startup.main, ["--budget", "soon"]),
+])
+def test_bad_options_are_usage_errors(main, argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["prog"] + argv)
+    assert exit_info.value.code == 2
+    assert "error:" in capsys.readouterr().err
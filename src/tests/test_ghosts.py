@@ -0,0 +1,54 @@
+from main.game_state import GameState
+from main.controller.scripted_controls import ScriptedController
+from main.objects.game_object import TriggerObject
+from main.objects.object_factory import ObjectFactory
+
+
+class Coin(TriggerObject):
+    """A custom object type (as in the tutorial) that BatchPlayers has no equivalent for"""
+    __slots__ = ()
+
+    def apply_effect(self, player):
+        pass
+
+
+def play_until_restart(game_state):
+    """Tick until the player has died and the level restarted"""
+    died = False
+    for _ in range(1000):
+        game_state.update()
+        died = died or game_state.player.is_dead
+        if died and not game_state.player.is_dead:
+            return
+    raise AssertionError("the player never died and restarted")
+
+
+def test_ghosts_turn_off_for_unsupported_objects(monkeypatch):
+    monkeypatch.setitem(ObjectFactory.OBJECT_MAP, "Coin", Coin)
+    game_state = GameState(None, ScriptedController())
+    game_state.load_level_data([
+        {"object": "Coin", "x": 4, "y": 9},
+        {"object": "Spike", "x": 10, "y": 10},
+        {"object": "Block", "x": 30, "y": 0},
+    ])
+    game_state.ghosts.toggle()
+
+    play_until_restart(game_state)
+    assert game_state.ghosts.batch is None
+    # Later attempts carry on without ghosts
+    play_until_restart(game_state)
+    assert game_state.ghosts.batch is None
+
+
+def test_ghosts_replay_supported_objects():
+    game_state = GameState(None, ScriptedController())
+    game_state.load_level_data([
+        {"object": "Spike", "x": 10, "y": 10},
+        {"object": "Block", "x": 30, "y": 0},
+    ])
+    game_state.ghosts.toggle()
+
+    play_until_restart(game_state)
+    play_until_restart(game_state)
+    assert game_state.ghosts.batch is not None
+    assert game_state.ghosts.batch.count == 1
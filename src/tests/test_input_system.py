@@ -0,0 +1,36 @@
+import pygame
+
+from main.game_state import GameState
+from main.constants import JUMP_BUFFER_TICKS
+
+
+def tap(inputs):
+    inputs.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    inputs.handle_event(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE))
+
+
+def test_only_presses_that_jump_are_timed():
+    game_state = GameState(None)
+    game_state.load_level_data([])
+    player = game_state.player
+    inputs = player.controller
+    while not player.on_ground:
+        game_state.update()
+
+    tap(inputs)
+    game_state.update()
+    assert len(inputs.latency) == 1
+
+    # A tap in the air whose buffer runs out before landing
+    for _ in range(5):
+        game_state.update()
+    tap(inputs)
+    for _ in range(JUMP_BUFFER_TICKS + 2):
+        game_state.update()
+    assert not player.on_ground
+    assert inputs._press_time is None
+
+    while not player.on_ground:
+        game_state.update()
+    game_state.update()
+    assert len(inputs.latency) == 1
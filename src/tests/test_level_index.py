@@ -0,0 +1,34 @@
+import json
+
+from main.level_index import LevelIndex
+
+LEVEL = [{"object": "Block", "x": 0, "y": 10, "width": 5, "height": 1}]
+
+
+def write(directory, name, levels):
+    (directory / name).write_text(json.dumps(levels))
+
+
+def test_malformed_files_are_skipped(tmp_path):
+    write(tmp_path, "good.json", [LEVEL])
+    write(tmp_path, "not_objects.json", [[1, 2, 3]])
+    write(tmp_path, "bad_field.json", [[{"object": "Block", "x": "far"}]])
+    (tmp_path / "broken.json").write_text("[[{")
+
+    entries = LevelIndex(str(tmp_path)).load()
+    assert [entry.name for entry in entries] == ["Good 1"]
+    assert entries[0].length == 5
+
+
+def test_malformed_files_stay_skipped_until_changed(tmp_path):
+    write(tmp_path, "bad.json", [["Block"]])
+    assert LevelIndex(str(tmp_path)).load() == []
+
+    write(tmp_path, "bad.json", [LEVEL, LEVEL])
+    assert len(LevelIndex(str(tmp_path)).load()) == 2
+
+
+def test_levels_with_partial_cells_are_skipped(tmp_path):
+    write(tmp_path, "good.json", [LEVEL])
+    write(tmp_path, "fractional.json", [LEVEL, [{"object": "Block", "x": 0.5, "y": 10}]])
+    assert [entry.name for entry in LevelIndex(str(tmp_path)).load()] == ["Good 1"]
@@ -0,0 +1,51 @@
+import os
+import json
+
+import pytest
+
+from main.level_pack import LevelPack, compile_json_pack, compile_levels, HEADER, PACK_EXTENSION
+
+MAIN_DIR = os.path.join(os.path.dirname(__file__), "..", "main")
+
+
+def with_defaults(obj_data):
+    return {"object": "Block", "x": 0, "y": 0, "width": 1, "height": 1, **obj_data}
+
+
+@pytest.mark.parametrize("name", ["objects.json", "demo_level.json"])
+def test_pack_round_trips_shipped_levels(tmp_path, name):
+    source = os.path.join(MAIN_DIR, name)
+    output = str(tmp_path / ("levels" + PACK_EXTENSION))
+    compile_json_pack(source, output)
+    with open(source) as f:
+        levels = json.load(f)
+
+    with LevelPack(output) as pack:
+        assert len(pack) == len(levels)
+        for i, level_data in enumerate(levels):
+            assert pack.object_count(i) == len(level_data)
+            assert pack.level(i) == [with_defaults(obj_data) for obj_data in level_data]
+            store = pack.store(i)
+            assert len(store) == len(level_data)
+
+
+@pytest.mark.parametrize("contents", [
+    b"",
+    b"GEOP",
+    b"JSON" + compile_levels([[{"x": 1}]])[4:],
+    HEADER.pack(b"GEOP", 99, 0, 0),
+], ids=["empty", "short header", "bad magic", "bad version"])
+def test_bad_headers_are_rejected(tmp_path, contents):
+    path = tmp_path / ("bad" + PACK_EXTENSION)
+    path.write_bytes(contents)
+    with pytest.raises(ValueError, match="not a version"):
+        LevelPack(str(path))
+
+
+@pytest.mark.parametrize("keep", [HEADER.size, HEADER.size + 3, -1])
+def test_truncated_packs_are_rejected(tmp_path, keep):
+    data = compile_levels([[{"object": "Spike", "x": 3, "y": 9}], [{"x": 0, "y": 10, "width": 40}]])
+    path = tmp_path / ("cut" + PACK_EXTENSION)
+    path.write_bytes(data[:keep])
+    with pytest.raises(ValueError, match="truncated"):
+        LevelPack(str(path))
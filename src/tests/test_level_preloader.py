@@ -0,0 +1,42 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from main.game_state import GameState
+from main.level_index import LevelIndex
+from main.level_preloader import LevelPreloader
+from main.screenDir.screen_file import Display
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE
+
+MAIN_DIR = os.path.join(os.path.dirname(__file__), "..", "main")
+
+
+@pytest.fixture
+def display():
+    pygame.display.init()
+    yield Display(SCREEN_WIDTH, SCREEN_HEIGHT, WHITE)
+    pygame.display.quit()
+
+
+def test_worker_leaves_drawing_to_install(display):
+    game_state = GameState(display)
+    preloader = LevelPreloader(game_state)
+    entry = LevelIndex(MAIN_DIR).load()[0]
+    sprites = dict(display.sprites.sprites)
+    try:
+        job = preloader.take(entry)
+        prepared = job.result()
+    finally:
+        preloader.shutdown()
+
+    # The worker built the level but rendered nothing into the shared atlas
+    assert display.sprites.sprites == sprites
+    assert not prepared.render_cache.chunks
+
+    game_state.install_level(prepared, job.level)
+    assert len(display.sprites.sprites) > len(sprites)
+    assert prepared.render_cache.chunks
+    game_state.draw()
@@ -0,0 +1,25 @@
+import pytest
+
+from main.objects.level_store import LevelStore
+from main.level_pack import compile_levels
+
+LEVEL = [
+    {"object": "Block", "x": 0, "y": 10, "width": 40},
+    {"object": "Spike", "x": 12.0, "y": 9},
+    {"object": "Block", "x": 20, "y": 8, "width": 2, "height": 1},
+]
+
+
+def test_whole_float_cells_are_kept():
+    store = LevelStore.from_level_data(LEVEL)
+    assert list(store)[1] == {"object": "Spike", "x": 12, "y": 9, "width": 1, "height": 1}
+
+
+@pytest.mark.parametrize("key, value", [("x", 20.5), ("y", "8"), ("width", True), ("height", None)])
+def test_partial_cells_name_the_object(key, value):
+    level = [dict(obj_data) for obj_data in LEVEL]
+    level[2][key] = value
+    with pytest.raises(ValueError, match=f"object 2: {key}="):
+        LevelStore.from_level_data(level)
+    with pytest.raises(ValueError, match=f"level 1, object 2: {key}="):
+        compile_levels([LEVEL, level])
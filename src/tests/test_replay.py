@@ -0,0 +1,66 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from main.game_state import GameState
+from main.screenDir.screen_file import Display
+from main.controller.scripted_controls import ScriptedController
+from main.simulation.replay import ReplayRecorder, InputRecording, play_replay
+from main.level_pack import read_levels
+from main.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE
+
+MAIN_DIR = os.path.join(os.path.dirname(__file__), "..", "main")
+LEVEL_FILE = os.path.join(MAIN_DIR, "objects.json")
+TICKS = 900
+
+
+@pytest.fixture
+def display():
+    pygame.display.init()
+    yield Display(SCREEN_WIDTH, SCREEN_HEIGHT, WHITE)
+    pygame.display.quit()
+
+
+def record_live(display, level_data, jump_every, seed=1234):
+    """Record a run the way the game does: a displayed GameState with effects on"""
+    controller = ScriptedController()
+    game_state = GameState(display, controller)
+    game_state.load_level_data(level_data)
+    recorder = ReplayRecorder(game_state, None, 0, seed)
+    for tick in range(TICKS):
+        controller.set_jump(tick % jump_every < 3)
+        game_state.update()
+        game_state.draw()
+        recorder.record_tick()
+    return recorder.finish()
+
+
+def test_live_recording_verifies_headless(display, tmp_path):
+    level_data = read_levels(LEVEL_FILE)[0]
+    recording = record_live(display, level_data, jump_every=23)
+    path = str(tmp_path / "replay.json")
+    recording.save(path)
+
+    result = play_replay(InputRecording.load(path), level_data)
+    assert result.ticks == TICKS
+    assert result.deterministic
+
+
+@pytest.mark.parametrize("level_file", ["objects.json", "demo_level.json"])
+@pytest.mark.parametrize("jump_every", [7, 31])
+def test_replays_are_deterministic_on_shipped_levels(display, level_file, jump_every):
+    for level_data in read_levels(os.path.join(MAIN_DIR, level_file)):
+        recording = record_live(display, level_data, jump_every)
+        result = play_replay(recording, level_data, stop_on_mismatch=False)
+        assert result.mismatch_tick is None
+
+
+def test_replay_hash_covers_particles(display):
+    level_data = read_levels(LEVEL_FILE)[0]
+    recording = record_live(display, level_data, jump_every=23)
+    # Same inputs, but the death bursts come out of a different RNG
+    recording.seed += 1
+    assert not play_replay(recording, level_data).deterministic
@@ -0,0 +1,31 @@
+import json
+
+from main.simulation.headless import HeadlessSimulation
+from main.simulation.solver import LevelSolver
+from main.level_validator import validate_file
+
+# A spike run too long to clear from the floor; only the orb above it gets the player over
+ORB_GAP = [{"object": "Spike", "x": x, "y": 10} for x in range(10, 18)] + [
+    {"object": "JumpOrb", "x": 12, "y": 7},
+    {"object": "Block", "x": 25, "y": 0},
+]
+
+
+def test_orb_gap_needs_the_orb():
+    sim = HeadlessSimulation(ORB_GAP)
+    assert not sim.run([65]).completed
+    assert sim.run([65, 101]).completed
+
+
+def test_solver_jumps_from_orb_in_the_air():
+    result = LevelSolver(ORB_GAP).search()
+    assert result.completed
+    assert HeadlessSimulation(ORB_GAP).run(result.jumps).completed
+
+
+def test_validator_reaches_through_orb_gap(tmp_path):
+    path = tmp_path / "orb_gap.json"
+    path.write_text(json.dumps([ORB_GAP]))
+    report = validate_file(str(path), reach=True)
+    assert report.levels == 1
+    assert report.issues == []
@@ -0,0 +1,36 @@
+from main.objects.object_types import Block
+from main.objects.spatial_index import SpatialIndex
+from main.constants import GRID_SIZE
+
+
+class MovingPlatform(Block):
+    """Slides right every update, like the tutorial's moving platform"""
+    __slots__ = ()
+
+    def update(self):
+        self.rect.x += GRID_SIZE
+
+
+def test_query_finds_objects_by_column():
+    near, far = Block(2, 10), Block(40, 10)
+    index = SpatialIndex([near, far])
+    assert index.query(0, 5 * GRID_SIZE) == [near]
+    assert index.query(38 * GRID_SIZE, 42 * GRID_SIZE) == [far]
+
+
+def test_moving_objects_are_found_where_they_move_to():
+    block, platform = Block(2, 10), MovingPlatform(3, 8)
+    index = SpatialIndex([block, platform])
+    for _ in range(30):
+        platform.update()
+    assert index.query(32 * GRID_SIZE, 34 * GRID_SIZE) == [platform]
+    assert index.query(0, 5 * GRID_SIZE) == [block, platform]
+
+
+def test_remove_moved_object():
+    platform = MovingPlatform(3, 8)
+    index = SpatialIndex([platform])
+    platform.update()
+    index.remove(platform)
+    assert len(index) == 0
+    assert index.query(0, 10 * GRID_SIZE) == []
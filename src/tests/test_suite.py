@@ -0,0 +1,9 @@
+from main.benchmarks.suite import compare
+
+
+def test_compare_needs_relative_and_absolute_slowdown():
+    baseline = {"tick": 0.010, "draw": 0.400, "load": 6.0}
+    results = {"tick": 0.014, "draw": 0.600, "load": 6.1}
+    # tick is 40% slower but only 4us, load is 0.1 ms slower but under 25%
+    assert compare(results, baseline, threshold=0.25, min_delta=0.005) == ["draw"]
+    assert compare(results, baseline, threshold=0.25, min_delta=0.0) == ["tick", "draw"]